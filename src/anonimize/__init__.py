@@ -33,56 +33,56 @@ Modules:
     - detectors: PII detection utilities
 """
 
+import importlib
+
 # Simple API - Import these for quick usage
 from anonimize.__version__ import __version__, __version_info__
 from anonimize.core import Anonymizer
 from anonimize.simple import anonymize, anonymize_data, detect_pii, preview
 
-# Export connectors if available
-try:
-    from anonimize.connectors import (
-        ConnectionConfig,
-        MongoDBConnector,
-        MySQLConnector,
-        PostgreSQLConnector,
-        SQLiteConnector,
-        create_connector,
-    )
-except ImportError:
-    PostgreSQLConnector = None  # type: ignore
-    MySQLConnector = None  # type: ignore
-    SQLiteConnector = None  # type: ignore
-    MongoDBConnector = None  # type: ignore
-    ConnectionConfig = None  # type: ignore
-    create_connector = None  # type: ignore
-
-# Export formats if available
-try:
-    from anonimize.formats import (
-        AvroHandler,
-        ExcelHandler,
-        FormatConfig,
-        ParquetHandler,
-        get_handler,
-    )
-except ImportError:
-    ParquetHandler = None  # type: ignore
-    ExcelHandler = None  # type: ignore
-    AvroHandler = None  # type: ignore
-    FormatConfig = None  # type: ignore
-    get_handler = None  # type: ignore
-
-# Export streaming if available
-try:
-    from anonimize.streaming import (
-        StreamConfig,
-        StreamingProcessor,
-        process_large_file,
-    )
-except ImportError:
-    StreamingProcessor = None  # type: ignore
-    StreamConfig = None  # type: ignore
-    process_large_file = None  # type: ignore
+# Connectors, formats and streaming are imported on first access so that
+# light entry points (e.g. ``anonimize --version``) do not load pandas or
+# pyarrow. Each resolves to None when its optional dependencies are missing.
+_OPTIONAL_EXPORTS = {
+    # Connectors
+    "PostgreSQLConnector": "anonimize.connectors",
+    "MySQLConnector": "anonimize.connectors",
+    "SQLiteConnector": "anonimize.connectors",
+    "MongoDBConnector": "anonimize.connectors",
+    "ConnectionConfig": "anonimize.connectors",
+    "create_connector": "anonimize.connectors",
+    # Formats
+    "ParquetHandler": "anonimize.formats",
+    "ExcelHandler": "anonimize.formats",
+    "AvroHandler": "anonimize.formats",
+    "FormatConfig": "anonimize.formats",
+    "get_handler": "anonimize.formats",
+    # Streaming
+    "StreamingProcessor": "anonimize.streaming",
+    "StreamConfig": "anonimize.streaming",
+    "process_large_file": "anonimize.streaming",
+}
+
+
+def __getattr__(name: str):
+    """Import optional exports on first access."""
+    module_name = _OPTIONAL_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        value = getattr(importlib.import_module(module_name), name)
+    except ImportError:
+        value = None
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List eager and lazily imported exports."""
+    return sorted(set(globals()) | set(_OPTIONAL_EXPORTS))
+
 
 __all__ = [
     # Simple API - Start here!
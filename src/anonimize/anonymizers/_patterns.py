@@ -0,0 +1,20 @@
+"""Compiled regular expressions shared by the anonymizers.
+
+Keeping a single compiled object per pattern means the specialized and
+simple anonymizers validate against exactly the same rules.
+"""
+
+import re
+
+# Email validation regex (simplified but covers most cases)
+EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+# SSN: area 001-899 excluding 666, group 01-99, serial 0001-9999,
+# with optional dashes between the groups
+_SSN_BODY = r"(?!000|666|9\d{2})\d{3}-?(?!00)\d{2}-?(?!0000)\d{4}"
+
+# Whole-value SSN match, for validation
+SSN_PATTERN = re.compile(rf"^{_SSN_BODY}$")
+
+# Word-bounded SSN match, for finding SSNs inside free text
+SSN_SEARCH_PATTERN = re.compile(rf"\b{_SSN_BODY}\b")
@@ -5,6 +5,7 @@ This module provides anonymization functionality for CSV files.
 
 import csv
 import logging
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
@@ -329,10 +330,7 @@ class CSVAnonymizer(BaseAnonymizer):
             reader = csv.DictReader(f, delimiter=self.delimiter)
 
             results = []
-            for i, row in enumerate(reader):
-                if i >= num_rows:
-                    break
-
+            for row in islice(reader, num_rows):
                 row_config = {k: v for k, v in config.items() if k in row}
                 if row_config:
                     row = self._core_anonymizer.anonymize(row, row_config)
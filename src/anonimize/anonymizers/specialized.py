@@ -10,11 +10,26 @@ import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from faker import Faker
+except ImportError:
+    Faker = None
+
+from anonimize.anonymizers._patterns import EMAIL_REGEX, SSN_PATTERN
+from anonimize.utils import LRUCache
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _salt_prefix(salt: str) -> bytes:
+    """Return the encoded ``salt:`` prefix fed to the hash strategy."""
+    return f"{salt}:".encode()
+
+
 class AnonymizationStrategy(Enum):
     """Available anonymization strategies."""
 
@@ -53,6 +68,19 @@ class BaseSpecializedAnonymizer(ABC):
     # Type identifier for this anonymizer
     PII_TYPE: str = ""
 
+    # Upper bound on memoized deterministic values per instance
+    DETERMINISTIC_CACHE_SIZE: int = 65536
+
+    # Strategy -> handler method name, resolved once per call or batch
+    _STRATEGY_HANDLERS: Dict[AnonymizationStrategy, str] = {
+        AnonymizationStrategy.REPLACE: "_do_replace",
+        AnonymizationStrategy.HASH: "_do_hash",
+        AnonymizationStrategy.MASK: "_do_mask",
+        AnonymizationStrategy.REMOVE: "_do_remove",
+        AnonymizationStrategy.PRESERVE_FORMAT: "_do_preserve_format",
+        AnonymizationStrategy.DETERMINISTIC: "_do_deterministic",
+    }
+
     def __init__(self, seed: Optional[int] = None):
         """Initialize the anonymizer.
 
@@ -62,19 +90,24 @@ class BaseSpecializedAnonymizer(ABC):
         self.seed = seed
         self._faker = None
         self._init_faker()
-        self._deterministic_cache: Dict[str, str] = {}
+        self._deterministic_faker = None
+        self._deterministic_cache = LRUCache(self.DETERMINISTIC_CACHE_SIZE)
 
     def _init_faker(self) -> None:
         """Initialize Faker instance for fake data generation."""
-        try:
-            from faker import Faker
-
-            self._faker = Faker()
-            if self.seed is not None:
-                Faker.seed(self.seed)
-        except ImportError:
+        if Faker is None:
             logger.warning("Faker not installed. Using fallback generation.")
             self._faker = None
+            return
+
+        self._faker = Faker()
+        if self.seed is not None:
+            self._reseed(self.seed)
+
+    def _reseed(self, seed: int) -> None:
+        """Reseed the current Faker instance without rebuilding its providers."""
+        if self._faker is not None:
+            self._faker.seed_instance(seed)
 
     @abstractmethod
     def validate(self, value: str) -> bool:
@@ -126,21 +159,7 @@ class BaseSpecializedAnonymizer(ABC):
             )
 
         is_valid = self.validate(value)
-
-        if strategy == AnonymizationStrategy.REPLACE:
-            result = self._do_replace(value, **kwargs)
-        elif strategy == AnonymizationStrategy.HASH:
-            result = self._do_hash(value, **kwargs)
-        elif strategy == AnonymizationStrategy.MASK:
-            result = self._do_mask(value, **kwargs)
-        elif strategy == AnonymizationStrategy.REMOVE:
-            result = ""
-        elif strategy == AnonymizationStrategy.PRESERVE_FORMAT:
-            result = self._do_preserve_format(value, **kwargs)
-        elif strategy == AnonymizationStrategy.DETERMINISTIC:
-            result = self._do_deterministic(value, **kwargs)
-        else:
-            result = value
+        result = self._resolve_strategy(strategy)(value, **kwargs)
 
         return AnonymizationResult(
             value=result,
@@ -152,6 +171,51 @@ class BaseSpecializedAnonymizer(ABC):
             },
         )
 
+    def anonymize_batch(
+        self,
+        values: Iterable[str],
+        strategy: AnonymizationStrategy,
+        **kwargs,
+    ) -> List[str]:
+        """Anonymize many values with one strategy.
+
+        The strategy handler is looked up once for the whole batch and no
+        per-value AnonymizationResult is built, which makes this the
+        preferred entry point for column-wide workloads.
+
+        Args:
+            values: Values to anonymize
+            strategy: Anonymization strategy to apply to every value
+            **kwargs: Strategy-specific options
+
+        Returns:
+            Anonymized values in input order; empty or non-string values
+            are passed through as in anonymize()
+        """
+        handler = self._resolve_strategy(strategy)
+        results = []
+        for value in values:
+            if value and isinstance(value, str):
+                results.append(handler(value, **kwargs))
+            else:
+                results.append(value if value else "")
+        return results
+
+    def _resolve_strategy(self, strategy: AnonymizationStrategy) -> Callable[..., str]:
+        """Return the bound handler implementing a strategy."""
+        name = self._STRATEGY_HANDLERS.get(strategy)
+        if name is None:
+            return self._do_identity
+        return getattr(self, name)
+
+    def _do_identity(self, value: str, **kwargs) -> str:
+        """Return the value unchanged."""
+        return value
+
+    def _do_remove(self, value: str, **kwargs) -> str:
+        """Remove the value."""
+        return ""
+
     def _do_replace(self, value: str, preserve_domain: bool = False, **kwargs) -> str:
         """Replace with fake value."""
         return self._generate_fake(value, preserve_domain=preserve_domain)
@@ -161,8 +225,9 @@ class BaseSpecializedAnonymizer(ABC):
     ) -> str:
         """Hash the value."""
         hasher = hashlib.new(algorithm)
-        salted = f"{salt}:{value}" if salt else value
-        hasher.update(salted.encode("utf-8"))
+        if salt:
+            hasher.update(_salt_prefix(salt))
+        hasher.update(value.encode("utf-8"))
         return hasher.hexdigest()
 
     def _do_mask(
@@ -190,19 +255,27 @@ class BaseSpecializedAnonymizer(ABC):
 
     def _do_deterministic(self, value: str, **kwargs) -> str:
         """Generate deterministic fake value (same input = same output)."""
-        if value in self._deterministic_cache:
-            return self._deterministic_cache[value]
+        cached = self._deterministic_cache.get(value)
+        if cached is not None:
+            return cached
 
         # Use hash to seed the fake generation for determinism
         hash_int = int(hashlib.sha256(value.encode()).hexdigest(), 16)
-        old_seed = self.seed
-        self.seed = hash_int % (2**32)
-        self._init_faker()
 
-        fake = self._generate_fake(value, preserve_domain=False)
-
-        self.seed = old_seed
-        self._init_faker()
+        if self._faker is None:
+            fake = self._generate_fake(value, preserve_domain=False)
+        else:
+            # Reseed a dedicated Faker so the main instance keeps its stream
+            if self._deterministic_faker is None:
+                self._deterministic_faker = Faker()
+
+            faker = self._faker
+            self._faker = self._deterministic_faker
+            try:
+                self._reseed(hash_int & 0xFFFFFFFF)
+                fake = self._generate_fake(value, preserve_domain=False)
+            finally:
+                self._faker = faker
 
         self._deterministic_cache[value] = fake
         return fake
@@ -255,19 +328,21 @@ class EmailAnonymizer(BaseSpecializedAnonymizer):
     PII_TYPE = "email"
 
     # Email validation regex (simplified but covers most cases)
-    EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+    EMAIL_REGEX = EMAIL_REGEX
 
     # Regex to detect consecutive dots which are invalid
     CONSECUTIVE_DOTS_REGEX = re.compile(r"\.\.+")
 
     # Common disposable email domains
-    DISPOSABLE_DOMAINS = {
-        "tempmail.com",
-        "throwaway.com",
-        "mailinator.com",
-        "guerrillamail.com",
-        "yopmail.com",
-    }
+    DISPOSABLE_DOMAINS = frozenset(
+        {
+            "tempmail.com",
+            "throwaway.com",
+            "mailinator.com",
+            "guerrillamail.com",
+            "yopmail.com",
+        }
+    )
 
     def validate(self, value: str) -> bool:
         """Validate email format."""
@@ -278,16 +353,17 @@ class EmailAnonymizer(BaseSpecializedAnonymizer):
         if not bool(self.EMAIL_REGEX.match(stripped)):
             return False
         # Reject emails with consecutive dots in local part
-        if "@" in stripped:
-            local = stripped.split("@")[0]
-            if self.CONSECUTIVE_DOTS_REGEX.search(local):
-                return False
+        local = stripped.partition("@")[0]
+        if self.CONSECUTIVE_DOTS_REGEX.search(local):
+            return False
         return True
 
     def _generate_fake(self, original: str, preserve_domain: bool = False) -> str:
         """Generate fake email."""
         if preserve_domain:
-            domain = original.split("@")[1] if "@" in original else "example.com"
+            _, sep, domain = original.partition("@")
+            if not sep:
+                domain = "example.com"
         else:
             if self._faker:
                 domain = self._faker.free_email_domain()
@@ -338,9 +414,10 @@ class EmailAnonymizer(BaseSpecializedAnonymizer):
     ) -> str:
         """Replace email with fake."""
         if preserve_tld and not preserve_domain:
-            parts = value.split("@")
-            if len(parts) == 2:
-                tld = parts[1].split(".")[-1] if "." in parts[1] else "com"
+            _, sep, domain = value.partition("@")
+            if sep and "@" not in domain:
+                dot = domain.rfind(".")
+                tld = domain[dot + 1 :] if dot >= 0 else "com"
                 if self._faker:
                     local = self._faker.user_name()
                     domain = f"{self._faker.domain_word()}.{tld}"
@@ -357,10 +434,10 @@ class EmailAnonymizer(BaseSpecializedAnonymizer):
         self, value: str, mask_char: str = "*", preserve_domain: bool = True, **kwargs
     ) -> str:
         """Mask email, preserving the domain part."""
-        if "@" not in value:
+        local, sep, domain = value.rpartition("@")
+        if not sep:
             return mask_char * len(value)
 
-        local, domain = value.rsplit("@", 1)
         masked_local = mask_char * len(local)
         return f"{masked_local}@{domain}"
 
@@ -373,10 +450,10 @@ class EmailAnonymizer(BaseSpecializedAnonymizer):
         Returns:
             True if disposable domain
         """
-        if "@" not in email:
+        _, sep, domain = email.partition("@")
+        if not sep:
             return False
-        domain = email.split("@")[1].lower()
-        return domain in self.DISPOSABLE_DOMAINS
+        return domain.lower() in self.DISPOSABLE_DOMAINS
 
 
 class PhoneAnonymizer(BaseSpecializedAnonymizer):
@@ -423,6 +500,25 @@ class PhoneAnonymizer(BaseSpecializedAnonymizer):
         "32": "BE",
     }
 
+    # Fake local-number layouts by country code ("#" is a random digit),
+    # stored as (digit count, str.format template)
+    _FAKE_LAYOUTS = {
+        cc: (layout.count("#"), layout.replace("#", "{}"))
+        for cc, layout in {"1": "(###) ###-####", "44": "20 #### ####"}.items()
+    }
+    _DEFAULT_FAKE_LAYOUT = (10, "{}" * 10)
+
+    # Longest-first so "+44..." never matches a shorter code first
+    _CC_ORDERED: Tuple[str, ...] = tuple(sorted(COUNTRY_CODES, key=len, reverse=True))
+    _COUNTRY_CODE_REGEX = re.compile("|".join(_CC_ORDERED))
+
+    def __init_subclass__(cls, **kwargs):
+        """Rebuild the country code lookup when a subclass overrides it."""
+        super().__init_subclass__(**kwargs)
+        if "COUNTRY_CODES" in cls.__dict__:
+            cls._CC_ORDERED = tuple(sorted(cls.COUNTRY_CODES, key=len, reverse=True))
+            cls._COUNTRY_CODE_REGEX = re.compile("|".join(cls._CC_ORDERED))
+
     def validate(self, value: str) -> bool:
         """Validate phone number format."""
         cleaned = re.sub(r"[\s.-]", "", value)
@@ -444,9 +540,9 @@ class PhoneAnonymizer(BaseSpecializedAnonymizer):
 
         if cleaned.startswith("+"):
             # Look for country code
-            for code in sorted(self.COUNTRY_CODES.keys(), key=len, reverse=True):
-                if cleaned[1:].startswith(code):
-                    return (code, cleaned[1 + len(code) :])
+            match = self._COUNTRY_CODE_REGEX.match(cleaned, 1)
+            if match:
+                return (match.group(), cleaned[match.end() :])
             return ("", cleaned[1:])
         elif cleaned.startswith("1") and len(cleaned) == 11:
             return ("1", cleaned[1:])
@@ -463,17 +559,15 @@ class PhoneAnonymizer(BaseSpecializedAnonymizer):
             cc = "1"  # Default to US
 
         if self._faker:
-            # Generate appropriate format based on country
-            if cc == "1":
-                fake = self._faker.numerify(text="(###) ###-####")
-            elif cc == "44":
-                fake = self._faker.numerify(text="20 #### ####")
-            else:
-                fake = self._faker.numerify(text="##########")
+            # Generate appropriate format based on country, drawing all
+            # digits from Faker's RNG at once
+            count, template = self._FAKE_LAYOUTS.get(cc, self._DEFAULT_FAKE_LAYOUT)
+            digits = f"{self._faker.random.randrange(10**count):0{count}d}"
+            fake = template.format(*digits)
         else:
             import random
 
-            fake = "".join(str(random.randint(0, 9)) for _ in range(10))
+            fake = f"{random.randrange(10**10):010d}"
             fake = f"({fake[:3]}) {fake[3:6]}-{fake[6:]}"
 
         return f"+{cc} {fake}" if cc else fake
@@ -537,15 +631,13 @@ class PhoneAnonymizer(BaseSpecializedAnonymizer):
         """Mask all digits in the value."""
         result = []
         digits_seen = 0
+        # Keep last 4 digits visible
+        threshold = sum(char.isdigit() for char in value) - 4
 
         for char in value:
             if char.isdigit():
                 digits_seen += 1
-                # Keep last 4 digits visible
-                if digits_seen <= len([c for c in value if c.isdigit()]) - 4:
-                    result.append(mask_char)
-                else:
-                    result.append(char)
+                result.append(mask_char if digits_seen <= threshold else char)
             else:
                 result.append(char)
 
@@ -570,30 +662,54 @@ class SSNAnonymizer(BaseSpecializedAnonymizer):
 
     # SSN validation pattern
     # Groups: 001-899 (first), 01-99 (second), 0001-9999 (third)
-    SSN_PATTERN = re.compile(
-        r"^(?!000|666|9\d{2})([0-8]\d{2}|7[0-2]0)-?(?!00)(\d{2})-?(?!0000)(\d{4})$"
-    )
+    SSN_PATTERN = SSN_PATTERN
 
     # Invalid SSNs (test numbers, etc.)
     INVALID_SSNS = {"078-05-1120", "219-09-9999", "457-55-5462"}
 
+    # Deletes ASCII non-digits; input with other characters falls back to
+    # the regex in _do_mask
+    _NON_DIGITS = str.maketrans(
+        "", "", "".join(chr(c) for c in range(128) if not chr(c).isdigit())
+    )
+
+    # Same list as 9-digit integers so validation skips re-formatting
+    _INVALID_SSN_NUMBERS = frozenset(int(ssn.replace("-", "")) for ssn in INVALID_SSNS)
+
     def validate(self, value: str) -> bool:
         """Validate SSN format.
 
         Checks for valid SSN format excluding invalid/test numbers.
         """
-        cleaned = value.replace("-", "").replace(" ", "")
+        stripped = value.strip()
 
-        if len(cleaned) != 9 or not cleaned.isdigit():
+        # Fast paths for the two canonical layouts; the regex only handles
+        # partially dashed input such as 123-456789
+        if len(stripped) == 11 and stripped[3] == "-" and stripped[6] == "-":
+            cleaned = stripped[:3] + stripped[4:6] + stripped[7:]
+        elif len(stripped) == 9:
+            cleaned = stripped
+        else:
+            if not self.SSN_PATTERN.match(stripped):
+                return False
+            cleaned = stripped.replace("-", "")
+
+        if not (cleaned.isascii() and cleaned.isdigit()):
             return False
 
         # Check against invalid list
-        formatted = f"{cleaned[:3]}-{cleaned[3:5]}-{cleaned[5:]}"
-        if formatted in self.INVALID_SSNS:
+        number = int(cleaned)
+        if number in self._INVALID_SSN_NUMBERS:
             return False
 
-        # Validate with regex
-        return bool(self.SSN_PATTERN.match(value.strip()))
+        area = number // 1000000
+        return (
+            area != 0
+            and area != 666
+            and area < 900
+            and number // 10000 % 100 != 0
+            and number % 10000 != 0
+        )
 
     def _generate_fake(self, original: str, **kwargs) -> str:
         """Generate a valid but fake SSN.
@@ -606,20 +722,14 @@ class SSNAnonymizer(BaseSpecializedAnonymizer):
             # Use Faker's SSN generator
             fake = self._faker.ssn()
         else:
-            # Generate valid SSN
-            # Area number: 001-899, excluding 666, 900-999
-            while True:
-                area = random.randint(1, 899)
-                if area != 666:
-                    break
-
-            # Group number: 01-99
-            group = random.randint(1, 99)
-
-            # Serial number: 0001-9999
-            serial = random.randint(1, 9999)
+            # Generate valid SSN from a single draw over the valid space:
+            # area 001-899 excluding 666 (898 values), group 01-99,
+            # serial 0001-9999
+            rest, serial = divmod(random.randrange(898 * 99 * 9999), 9999)
+            area, group = divmod(rest, 99)
+            area += 1 if area < 665 else 2
 
-            fake = f"{area:03d}-{group:02d}-{serial:04d}"
+            fake = f"{area:03d}-{group + 1:02d}-{serial + 1:04d}"
 
         return fake
 
@@ -641,7 +751,9 @@ class SSNAnonymizer(BaseSpecializedAnonymizer):
 
     def _do_mask(self, value: str, mask_char: str = "*", **kwargs) -> str:
         """Mask SSN, showing only last 4 digits."""
-        digits = re.sub(r"\D", "", value)
+        digits = value.translate(self._NON_DIGITS)
+        if not digits.isascii():
+            digits = re.sub(r"\D", "", value)
         if len(digits) == 9:
             return f"{mask_char*3}-{mask_char*2}-{digits[5:]}"
         return mask_char * len(value)
@@ -652,8 +764,10 @@ class SSNAnonymizer(BaseSpecializedAnonymizer):
         """Hash SSN securely."""
         # SSNs require strong hashing
         hasher = hashlib.new(algorithm)
-        salted = f"{salt}:ssn:{value}" if salt else f"ssn:{value}"
-        hasher.update(salted.encode("utf-8"))
+        if salt:
+            hasher.update(_salt_prefix(salt))
+        hasher.update(b"ssn:")
+        hasher.update(value.encode("utf-8"))
         return hasher.hexdigest()
 
 
@@ -1,8 +1,12 @@
 """SSN (Social Security Number) anonymizer."""
 
 import hashlib
+import random
 import re
 
+from anonimize.anonymizers._patterns import SSN_SEARCH_PATTERN
+from anonimize.utils import LRUCache
+
 
 class SSNAnonymizer:
     """Anonymizer for US Social Security Numbers.
@@ -15,11 +19,11 @@ class SSNAnonymizer:
     - invalid: Replace with invalid SSN (000-XX-XXXX)
     """
 
-    SSN_PATTERN = re.compile(r"\b(?!000|666|9\d{2})\d{3}-?(?!00)\d{2}-?(?!0000)\d{4}\b")
+    SSN_PATTERN = SSN_SEARCH_PATTERN
 
     def __init__(self, phoney=None):
         self._phoney = phoney
-        self._cache = {}
+        self._cache = LRUCache()
 
     def anonymize(self, ssn: str, strategy: str = "mask") -> str:
         """Anonymize an SSN."""
@@ -47,21 +51,22 @@ class SSNAnonymizer:
 
     def _replace(self, original: str, normalized: str) -> str:
         """Replace with valid fake SSN."""
-        if original in self._cache:
-            return self._cache[original]
-
-        # Generate valid SSN (avoid 000, 666, 900-999 prefixes)
-        import random
-
-        random.seed(int(hashlib.md5(normalized.encode()).hexdigest(), 16))
-
-        area = random.choice(
-            [str(i).zfill(3) for i in range(1, 900) if i not in [0, 666]]
-        )
-        group = str(random.randint(1, 99)).zfill(2)
-        serial = str(random.randint(1, 9999)).zfill(4)
-
-        fake = f"{area}-{group}-{serial}"
+        cached = self._cache.get(original)
+        if cached is not None:
+            return cached
+
+        # Generate valid SSN (avoid 000, 666, 900-999 prefixes), seeded from
+        # the input so the global random state is left untouched
+        seed = hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+        rng = random.Random(int.from_bytes(seed, "little"))
+
+        area = rng.randint(1, 898)
+        if area >= 666:
+            area += 1
+        group = rng.randint(1, 99)
+        serial = rng.randint(1, 9999)
+
+        fake = f"{area:03d}-{group:02d}-{serial:04d}"
         self._cache[original] = fake
         return fake
 
@@ -79,8 +84,9 @@ class SSNAnonymizer:
 
     def _invalid(self, original: str, normalized: str) -> str:
         """Replace with invalid SSN pattern."""
-        if original in self._cache:
-            return self._cache[original]
+        cached = self._cache.get(original)
+        if cached is not None:
+            return cached
 
         # Use 000 prefix (invalid)
         fake = f"000-{normalized[3:5]}-{normalized[5:]}"
@@ -94,19 +100,15 @@ class SSNAnonymizer:
     def is_valid(self, ssn: str) -> bool:
         """Check if SSN format is valid."""
         normalized = self._normalize(ssn)
-        if len(normalized) != 9:
+        if not normalized:
             return False
 
-        area = int(normalized[:3])
-        group = int(normalized[3:5])
-        serial = int(normalized[5:])
-
         # Check invalid ranges
-        if area in [0, 666] or area >= 900:
-            return False
-        if group == 0:
-            return False
-        if serial == 0:
-            return False
-
-        return True
+        area = int(normalized[:3])
+        return (
+            area != 0
+            and area != 666
+            and area < 900
+            and normalized[3:5] != "00"
+            and normalized[5:] != "0000"
+        )
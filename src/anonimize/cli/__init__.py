@@ -25,26 +25,98 @@ Examples:
 import argparse
 import json
 import sys
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from anonimize import __version__, anonymize, anonymize_data, detect_pii, preview
-from anonimize.cli.wizard import run_wizard
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+from anonimize.__version__ import __version__
 
-def print_error(message: str):
-    """Print an error message."""
-    print(f"✗ {message}", file=sys.stderr)
+# Sample file written by `anonimize config --generate`
+_CONFIG_TEMPLATE = b"""# Anonimize Configuration File
+# This is a sample configuration for anonimize
+
+# Global settings
+global:
+  locale: "en_US"           # Locale for fake data generation
+  seed: 42                  # Random seed for reproducibility
+  preserve_relationships: true  # Keep same fake value for same real value
+
+# Column-specific settings
+# Each column can have its own strategy and options
+columns:
+  email:
+    strategy: "mask"        # Options: replace, mask, hash, remove
+    type: "email"
+
+  name:
+    strategy: "replace"
+    type: "name"
+
+  ssn:
+    strategy: "hash"
+    type: "ssn"
+    options:
+      algorithm: "sha256"
+
+  phone:
+    strategy: "mask"
+    type: "phone"
+    options:
+      preserve_last: 4
+      mask_char: "*"
+
+# Detection settings
+detection:
+  confidence_threshold: 0.7
+  check_field_names: true
+"""
+
+# Subcommand names, including aliases
+COMMANDS = frozenset({"anonymize", "anon", "detect", "preview", "config"})
+
+
+# Status line prefixes, written straight to the text streams
+_ERR = "✗ "
+_OK = "✓ "
+_INFO = "ℹ "
+
+
+def _dump_json(data: Any) -> str:
+    """Serialize data as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
 
 
-def print_success(message: str):
-    """Print a success message."""
-    print(f"✓ {message}")
+def _split_columns(value: str) -> List[str]:
+    """Parse a comma-separated column list, ignoring blank entries."""
+    return [column.strip() for column in value.split(",") if column.strip()]
 
 
-def print_info(message: str):
-    """Print an info message."""
-    print(f"ℹ {message}")
+def _pii_rows(detected: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """Normalize detect_pii output into (column, type, confidence) rows.
+
+    Detection results map columns either to a plain type name or to a dict
+    with ``type`` and ``confidence`` keys.
+    """
+    rows = []
+    for col, info in detected.items():
+        if isinstance(info, dict):
+            pii_type = info.get("type", "unknown")
+            confidence = info.get("confidence", "auto")
+        else:
+            pii_type, confidence = info, "auto"
+        conf_str = (
+            f"{confidence:.0%}" if isinstance(confidence, float) else str(confidence)
+        )
+        rows.append((col, pii_type, conf_str))
+    return rows
 
 
 def cmd_detect(args) -> int:
@@ -52,44 +124,39 @@ def cmd_detect(args) -> int:
     file_path = Path(args.file)
 
     if not file_path.exists():
-        print_error(f"File not found: {file_path}")
-        print_info("Hint: Check the path and ensure the file exists.")
+        sys.stderr.write(f"{_ERR}File not found: {file_path}\n")
+        sys.stdout.write(f"{_INFO}Hint: Check the path and ensure the file exists.\n")
         return 1
 
+    from anonimize import detect_pii
+
     try:
         detected = detect_pii(file_path)
 
         if args.format == "json":
-            print(json.dumps(detected, indent=2))
+            sys.stdout.write(_dump_json(detected) + "\n")
         else:
             if not detected:
-                print_info("No PII detected in this file")
+                sys.stdout.write(f"{_INFO}No PII detected in this file\n")
                 return 0
 
-            print(f"\nDetected PII in {file_path.name}:\n")
-            print(f"  {'Column':<20} {'Type':<15} {'Confidence'}")
-            print(f"  {'-'*20} {'-'*15} {'-'*10}")
+            # Build the whole table and write it in one call
+            lines = [
+                f"\nDetected PII in {file_path.name}:\n",
+                f"  {'Column':<20} {'Type':<15} {'Confidence'}",
+                f"  {'-'*20} {'-'*15} {'-'*10}",
+            ]
 
-            for col, info in detected.items():
-                pii_type = (
-                    info.get("type", "unknown") if isinstance(info, dict) else info
-                )
-                confidence = (
-                    info.get("confidence", "auto") if isinstance(info, dict) else "auto"
-                )
-                conf_str = (
-                    f"{confidence:.0%}"
-                    if isinstance(confidence, float)
-                    else str(confidence)
-                )
-                print(f"  {col:<20} {pii_type:<15} {conf_str}")
+            for col, pii_type, conf_str in _pii_rows(detected):
+                lines.append(f"  {col:<20} {pii_type:<15} {conf_str}")
 
-            print(f"\n  Total: {len(detected)} PII field(s) detected")
+            lines.append(f"\n  Total: {len(detected)} PII field(s) detected\n")
+            sys.stdout.write("\n".join(lines))
 
         return 0
 
     except Exception as e:
-        print_error(f"Detection failed: {e}")
+        sys.stderr.write(f"{_ERR}Detection failed: {e}\n")
         return 1
 
 
@@ -98,112 +165,77 @@ def cmd_preview_cmd(args) -> int:
     file_path = Path(args.file)
 
     if not file_path.exists():
-        print_error(f"File not found: {file_path}")
+        sys.stderr.write(f"{_ERR}File not found: {file_path}\n")
         return 1
 
+    from anonimize import preview
+
     try:
         preview_data = preview(
             file_path, num_rows=args.num_rows, strategy=args.strategy
         )
 
         if not preview_data:
-            print_info("No data to preview")
+            sys.stdout.write(f"{_INFO}No data to preview\n")
             return 0
 
-        print(
-            f"\nPreview ({args.strategy} strategy, first {len(preview_data)} rows):\n"
-        )
-
         # Get headers from first row
-        headers = list(preview_data[0].keys())
-
-        # Print table
-        col_widths = {h: max(len(h), 15) for h in headers}
-        for row in preview_data:
-            for h in headers:
-                col_widths[h] = max(col_widths[h], len(str(row.get(h, ""))) + 2)
-
-        header_row = " | ".join(
-            h.ljust(col_widths[h]) for h in headers[:6]
-        )  # Limit cols
-        print(f"  {header_row}")
-        print(f"  {'-' * len(header_row)}")
-
-        for row in preview_data:
-            values = [
-                str(row.get(h, ""))[: col_widths[h] - 2].ljust(col_widths[h])
-                for h in headers[:6]
-            ]
-            print(f"  {' | '.join(values)}")
-
-        print()
+        headers = list(preview_data[0].keys())[:6]  # Limit cols
+
+        # Stringify each cell once, then size each column with a C-level
+        # max over its cell lengths
+        rows = [[str(row.get(h, "")) for h in headers] for row in preview_data]
+        col_widths = [
+            max(len(h), 15, max(map(len, column)) + 2)
+            for h, column in zip(headers, zip(*rows))
+        ]
+
+        # Build the table and write it in one call
+        header_row = " | ".join(h.ljust(w) for h, w in zip(headers, col_widths))
+        lines = [
+            f"\nPreview ({args.strategy} strategy, first {len(preview_data)} rows):\n",
+            f"  {header_row}",
+            f"  {'-' * len(header_row)}",
+        ]
+        for cells in rows:
+            values = [cell[: w - 2].ljust(w) for cell, w in zip(cells, col_widths)]
+            lines.append(f"  {' | '.join(values)}")
+
+        sys.stdout.write("\n".join(lines) + "\n\n")
         return 0
 
     except Exception as e:
-        print_error(f"Preview failed: {e}")
+        sys.stderr.write(f"{_ERR}Preview failed: {e}\n")
         return 1
 
 
 def cmd_config(args) -> int:
     """Handle the config command."""
     if args.generate:
-        config_content = """# Anonimize Configuration File
-# This is a sample configuration for anonimize
-
-# Global settings
-global:
-  locale: "en_US"           # Locale for fake data generation
-  seed: 42                  # Random seed for reproducibility
-  preserve_relationships: true  # Keep same fake value for same real value
-
-# Column-specific settings
-# Each column can have its own strategy and options
-columns:
-  email:
-    strategy: "mask"        # Options: replace, mask, hash, remove
-    type: "email"
-    
-  name:
-    strategy: "replace"
-    type: "name"
-    
-  ssn:
-    strategy: "hash"
-    type: "ssn"
-    options:
-      algorithm: "sha256"
-      
-  phone:
-    strategy: "mask"
-    type: "phone"
-    options:
-      preserve_last: 4
-      mask_char: "*"
-
-# Detection settings
-detection:
-  confidence_threshold: 0.7
-  check_field_names: true
-"""
         output_path = Path(args.output)
 
-        if output_path.exists():
-            print_error(f"File already exists: {output_path}")
+        if output_path.exists() and not args.force:
+            # Never block on a prompt when run non-interactively (e.g. CI)
+            if not sys.stdin.isatty():
+                sys.stderr.write(
+                    f"{_ERR}File already exists, use --force: {output_path}\n"
+                )
+                return 1
+            sys.stderr.write(f"{_ERR}File already exists: {output_path}\n")
             if input("Overwrite? [y/N]: ").lower() not in ("y", "yes"):
                 return 1
 
-        with open(output_path, "w") as f:
-            f.write(config_content)
+        output_path.write_bytes(_CONFIG_TEMPLATE)
 
-        print_success(f"Generated config file: {output_path}")
-        print_info(
-            "Edit this file and use with: anonimize data.csv --config "
-            + str(output_path)
+        sys.stdout.write(
+            f"{_OK}Generated config file: {output_path}\n"
+            f"{_INFO}Edit this file and use with: "
+            f"anonimize data.csv --config {output_path}\n"
         )
         return 0
 
     else:
-        print_info("Use --generate to create a sample config file")
+        sys.stdout.write(f"{_INFO}Use --generate to create a sample config file\n")
         return 0
 
 
@@ -212,15 +244,14 @@ def cmd_anonymize(args) -> int:
     file_path = Path(args.file)
 
     if not file_path.exists():
-        print_error(f"File not found: {file_path}")
-        print_info("Hint: Check the path and ensure the file exists.")
-        print_info("      Run `anonimize --wizard` for guided setup.")
+        sys.stderr.write(f"{_ERR}File not found: {file_path}\n")
+        sys.stdout.write(
+            f"{_INFO}Hint: Check the path and ensure the file exists.\n"
+            f"{_INFO}      Run `anonimize --wizard` for guided setup.\n"
+        )
         return 1
 
-    # Parse columns if specified
-    columns = None
-    if args.columns:
-        columns = [c.strip() for c in args.columns.split(",")]
+    from anonimize import anonymize
 
     try:
         result = anonymize(
@@ -229,66 +260,74 @@ def cmd_anonymize(args) -> int:
             strategy=args.strategy,
             dry_run=args.dry_run,
             progress=not args.no_progress,
-            columns=columns,
+            columns=args.columns,
             locale=args.locale,
             seed=args.seed,
         )
 
+        # Collect the report and write it in one call
         if args.dry_run:
-            print("\n🔍 DRY RUN - No changes made\n")
+            lines = ["\n🔍 DRY RUN - No changes made\n"]
 
             if isinstance(result, dict):
                 if "would_anonymize" in result:
                     cols = result["would_anonymize"]
                     if cols:
-                        print(
+                        lines.append(
                             f"Would anonymize {len(cols)} column(s): {', '.join(cols)}"
                         )
                     else:
-                        print("No columns would be anonymized")
+                        lines.append("No columns would be anonymized")
 
                 if "detected_pii" in result:
-                    print("\nDetected PII:")
-                    for col, info in result["detected_pii"].items():
-                        pii_type = (
-                            info.get("type", "unknown")
-                            if isinstance(info, dict)
-                            else info
-                        )
-                        print(f"  - {col}: {pii_type}")
+                    lines.append("\nDetected PII:")
+                    for col, pii_type, _ in _pii_rows(result["detected_pii"]):
+                        lines.append(f"  - {col}: {pii_type}")
 
                 if "preview" in result and result["preview"]:
-                    print("\nPreview:")
+                    lines.append("\nPreview:")
                     for row in result["preview"][:3]:
-                        print(f"  {row}")
+                        lines.append(f"  {row}")
 
-            print("\nTo apply changes, run without --dry-run")
+            lines.append("\nTo apply changes, run without --dry-run")
         else:
-            print()
-            print_success("Anonymization complete!")
-            print()
-            print(f"  Input:  {file_path}")
-            print(f"  Output: {result}")
+            lines = [
+                "",
+                "✓ Anonymization complete!",
+                "",
+                f"  Input:  {file_path}",
+                f"  Output: {result}",
+            ]
 
             if isinstance(result, str):
-                output_path = Path(result)
-                if output_path.exists():
-                    size = output_path.stat().st_size
-                    print(f"  Size:   {size:,} bytes")
+                try:
+                    size = Path(result).stat().st_size
+                except OSError:
+                    pass
+                else:
+                    lines.append(f"  Size:   {size:,} bytes")
 
+        sys.stdout.write("\n".join(lines) + "\n")
         return 0
 
     except Exception as e:
-        print_error(f"Anonymization failed: {e}")
-        print_info("Common solutions:")
-        print("  - Check that the input file isn't open in another program")
-        print("  - Ensure you have write permissions for the output directory")
-        print("  - Verify the file format matches the extension")
+        sys.stderr.write(f"{_ERR}Anonymization failed: {e}\n")
+        sys.stdout.write(
+            f"{_INFO}Common solutions:\n"
+            "  - Check that the input file isn't open in another program\n"
+            "  - Ensure you have write permissions for the output directory\n"
+            "  - Verify the file format matches the extension\n"
+        )
         return 1
 
 
+@lru_cache(maxsize=1)
 def create_parser() -> argparse.ArgumentParser:
-    """Create the argument parser."""
+    """Create the argument parser.
+
+    The parser is built once and shared by later calls, so callers must not
+    modify the returned object.
+    """
     parser = argparse.ArgumentParser(
         prog="anonimize",
         description="""
@@ -345,6 +384,7 @@ Report issues: https://github.com/rar-file/anonimize/issues
     anonymize_parser.add_argument(
         "-c",
         "--columns",
+        type=_split_columns,
         help="Comma-separated list of columns to anonymize (default: auto-detect)",
     )
     anonymize_parser.add_argument(
@@ -355,6 +395,7 @@ Report issues: https://github.com/rar-file/anonimize/issues
     anonymize_parser.add_argument(
         "--seed", type=int, help="Random seed for reproducible results"
     )
+    anonymize_parser.set_defaults(func=cmd_anonymize)
 
     # Detect command
     detect_parser = subparsers.add_parser(
@@ -364,6 +405,7 @@ Report issues: https://github.com/rar-file/anonimize/issues
     detect_parser.add_argument(
         "--format", choices=["table", "json"], default="table", help="Output format"
     )
+    detect_parser.set_defaults(func=cmd_detect)
 
     # Preview command
     preview_parser = subparsers.add_parser(
@@ -384,6 +426,7 @@ Report issues: https://github.com/rar-file/anonimize/issues
         default="replace",
         help="Strategy to preview",
     )
+    preview_parser.set_defaults(func=cmd_preview_cmd)
 
     # Config command
     config_parser = subparsers.add_parser("config", help="Configuration file utilities")
@@ -396,6 +439,13 @@ Report issues: https://github.com/rar-file/anonimize/issues
         default="anonimize.yaml",
         help="Output config file name (default: anonimize.yaml)",
     )
+    config_parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Overwrite the output file if it already exists",
+    )
+    config_parser.set_defaults(func=cmd_config)
 
     # Wizard flag (top level)
     parser.add_argument(
@@ -405,76 +455,51 @@ Report issues: https://github.com/rar-file/anonimize/issues
     return parser
 
 
-def main():
-    """Main entry point."""
+@contextmanager
+def _batched_stdout() -> Iterator[None]:
+    """Turn off stdout line buffering so output is flushed once at the end.
+
+    stderr is left alone so errors still appear immediately.
+    """
+    line_buffered = getattr(sys.stdout, "line_buffering", False) and hasattr(
+        sys.stdout, "reconfigure"
+    )
+    if line_buffered:
+        sys.stdout.reconfigure(line_buffering=False)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        if line_buffered:
+            sys.stdout.reconfigure(line_buffering=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point.
+
+    Args:
+        argv: Command line arguments, defaults to ``sys.argv[1:]``.
+    """
     parser = create_parser()
-    args = parser.parse_args()
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # `anonimize FILE ...` is shorthand for `anonimize anonymize FILE ...`
+    if argv and argv[0] not in COMMANDS and not argv[0].startswith("-"):
+        argv = ["anonymize", *argv]
+
+    args = parser.parse_args(argv)
 
     # Launch wizard if requested
     if args.wizard:
+        from anonimize.cli.wizard import run_wizard
+
         return run_wizard()
 
     # Handle subcommands
-    if args.command in ("anonymize", "anon"):
-        return cmd_anonymize(args)
-
-    elif args.command == "detect":
-        return cmd_detect(args)
-
-    elif args.command == "preview":
-        return cmd_preview_cmd(args)
-
-    elif args.command == "config":
-        return cmd_config(args)
-
-    # No command specified - check if a file path was given directly
-    if len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
-        # Treat first argument as a file path
-        file_path = Path(sys.argv[1])
-        if file_path.exists():
-            # Create a mock args object for anonymize
-            class MockArgs:
-                pass
-
-            mock_args = MockArgs()
-            mock_args.file = str(file_path)
-            mock_args.output = None
-            mock_args.strategy = "replace"
-            mock_args.dry_run = False
-            mock_args.no_progress = False
-            mock_args.columns = None
-            mock_args.locale = "en_US"
-            mock_args.seed = None
-
-            # Parse remaining args
-            i = 2
-            while i < len(sys.argv):
-                arg = sys.argv[i]
-                if arg in ("-o", "--output") and i + 1 < len(sys.argv):
-                    mock_args.output = sys.argv[i + 1]
-                    i += 2
-                elif arg in ("-s", "--strategy") and i + 1 < len(sys.argv):
-                    mock_args.strategy = sys.argv[i + 1]
-                    i += 2
-                elif arg == "--dry-run":
-                    mock_args.dry_run = True
-                    i += 1
-                elif arg == "--no-progress":
-                    mock_args.no_progress = True
-                    i += 1
-                elif arg in ("-c", "--columns") and i + 1 < len(sys.argv):
-                    mock_args.columns = sys.argv[i + 1]
-                    i += 2
-                elif arg == "--locale" and i + 1 < len(sys.argv):
-                    mock_args.locale = sys.argv[i + 1]
-                    i += 2
-                elif arg == "--seed" and i + 1 < len(sys.argv):
-                    mock_args.seed = int(sys.argv[i + 1])
-                    i += 2
-                else:
-                    i += 1
-
-            return cmd_anonymize(mock_args)
+    if args.command:
+        with _batched_stdout():
+            return args.func(args)
 
     # No valid command or file, show help
     parser.print_help()
@@ -10,20 +10,41 @@ Usage:
     anonimize --wizard        # Alternative entry point
 """
 
+import importlib.util
+import os
+import stat
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-# Try to import questionary for nice prompts
-try:
-    import questionary
-    from questionary import Choice
-
-    HAS_QUESTIONARY = True
-except ImportError:
-    HAS_QUESTIONARY = False
+from typing import Any, Dict, List, Optional, Tuple
 
 from anonimize import __version__, anonymize, detect_pii, preview
+from anonimize.cli import _pii_rows
+
+# Use questionary for nice prompts when installed. Importing it pulls in
+# prompt_toolkit, so that is deferred until the first prompt.
+HAS_QUESTIONARY = importlib.util.find_spec("questionary") is not None
+
+# Scan results keyed by (path, st_mtime_ns, st_size), plus strategy and
+# columns for previews, so re-entering a step for an unchanged file skips
+# the rescan
+_DETECT_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+_PREVIEW_CACHE: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+
+# Strategy menu labels and the strategy each one selects
+_STRATEGY_MAP = {
+    "Replace with fake data (realistic, consistent)": "replace",
+    "Mask (show last 4 chars only: j***@example.com)": "mask",
+    "Hash (one-way, irreversible)": "hash",
+    "Remove (delete the data entirely)": "remove",
+}
+
+# Expected file extension for each file source in step 1
+_SOURCE_EXTENSIONS = {
+    "CSV file": "csv",
+    "JSON file": "json",
+    "JSON Lines file (.jsonl)": "jsonl",
+}
 
 
 # ANSI colors for terminal output
@@ -37,6 +58,18 @@ class Colors:
     RESET = "\033[0m"
 
 
+# Plain output when piped or redirected
+if not (sys.stdout and sys.stdout.isatty()):
+    for _name in ("GREEN", "BLUE", "YELLOW", "RED", "CYAN", "BOLD", "RESET"):
+        setattr(Colors, _name, "")
+
+# Status line prefixes
+_SUCCESS = f"{Colors.GREEN}✓{Colors.RESET} "
+_INFO = f"{Colors.BLUE}ℹ{Colors.RESET} "
+_WARNING = f"{Colors.YELLOW}⚠{Colors.RESET} "
+_ERROR = f"{Colors.RED}✗{Colors.RESET} "
+
+
 def print_header():
     """Print the welcome header."""
     print(f"""
@@ -56,28 +89,42 @@ questions and I'll handle the rest!
 
 def print_success(message: str):
     """Print a success message."""
-    print(f"{Colors.GREEN}✓{Colors.RESET} {message}")
+    sys.stdout.write(_SUCCESS + message + "\n")
 
 
 def print_info(message: str):
     """Print an info message."""
-    print(f"{Colors.BLUE}ℹ{Colors.RESET} {message}")
+    sys.stdout.write(_INFO + message + "\n")
 
 
 def print_warning(message: str):
     """Print a warning message."""
-    print(f"{Colors.YELLOW}⚠{Colors.RESET} {message}")
+    sys.stdout.write(_WARNING + message + "\n")
 
 
 def print_error(message: str):
     """Print an error message."""
-    print(f"{Colors.RED}✗{Colors.RESET} {message}")
+    sys.stdout.write(_ERROR + message + "\n")
+
+
+def _file_key(path: Path) -> Tuple[str, int, int]:
+    """Build a cache key that changes whenever the file is modified."""
+    st = path.stat()
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=1)
+def _get_questionary():
+    """Import questionary on first use."""
+    import questionary
+
+    return questionary
 
 
 def ask_text(message: str, default: str = "") -> str:
     """Ask for text input."""
     if HAS_QUESTIONARY:
-        return questionary.text(message, default=default).ask() or default
+        return _get_questionary().text(message, default=default).ask() or default
     else:
         print(f"\n{message}")
         if default:
@@ -89,12 +136,15 @@ def ask_text(message: str, default: str = "") -> str:
 def ask_select(message: str, choices: List[str], default: Optional[str] = None) -> str:
     """Ask user to select from choices."""
     if HAS_QUESTIONARY:
-        return questionary.select(message, choices=choices, default=default).ask()
+        return (
+            _get_questionary().select(message, choices=choices, default=default).ask()
+        )
     else:
         print(f"\n{message}")
         for i, choice in enumerate(choices, 1):
             marker = "*" if choice == default else " "
             print(f"  {marker}{i}. {choice}")
+        choice_set = frozenset(choices)
         while True:
             try:
                 result = input("> ").strip()
@@ -102,7 +152,7 @@ def ask_select(message: str, choices: List[str], default: Optional[str] = None)
                     idx = int(result) - 1
                     if 0 <= idx < len(choices):
                         return choices[idx]
-                elif result in choices:
+                elif result in choice_set:
                     return result
                 elif not result and default:
                     return default
@@ -114,7 +164,7 @@ def ask_select(message: str, choices: List[str], default: Optional[str] = None)
 def ask_confirm(message: str, default: bool = True) -> bool:
     """Ask yes/no question."""
     if HAS_QUESTIONARY:
-        return questionary.confirm(message, default=default).ask()
+        return _get_questionary().confirm(message, default=default).ask()
     else:
         default_str = "Y/n" if default else "y/N"
         print(f"\n{message} [{default_str}]")
@@ -127,7 +177,7 @@ def ask_confirm(message: str, default: bool = True) -> bool:
 def ask_checkbox(message: str, choices: List[str]) -> List[str]:
     """Ask user to select multiple options."""
     if HAS_QUESTIONARY:
-        return questionary.checkbox(message, choices=choices).ask() or []
+        return _get_questionary().checkbox(message, choices=choices).ask() or []
     else:
         print(f"\n{message}")
         print("  (Enter numbers separated by commas, or 'all')")
@@ -181,26 +231,35 @@ def step_select_source() -> Optional[Path]:
         return None
 
     # Get file path
+    prompt = f"Enter the path to your {source_type.split(' ', 1)[0]} file:"
+    expected_ext = _SOURCE_EXTENSIONS[source_type]
     while True:
-        file_path = ask_text(f"Enter the path to your {source_type.split()[0]} file:")
+        file_path = ask_text(prompt)
 
         if not file_path:
             print_error("Please enter a file path")
             continue
 
-        path = Path(file_path).expanduser().resolve()
+        path = Path(file_path).expanduser()
 
-        if not path.exists():
-            print_error(f"File not found: {path}")
+        # lstat doubles as the existence check; only symlinks and ".." need
+        # the full (strict) resolve walk
+        try:
+            if stat.S_ISLNK(os.lstat(path).st_mode) or ".." in path.parts:
+                path = path.resolve(strict=True)
+            else:
+                path = path.absolute()
+        except OSError:
+            print_error(f"File not found: {path.absolute()}")
             print_info("Make sure the path is correct and the file exists")
             if not ask_confirm("Try again?"):
                 return None
             continue
 
         # Verify file type
-        expected_ext = source_type.split()[0].lower()
-        if path.suffix.lower().lstrip(".") != expected_ext:
-            print_warning(f"File extension is {path.suffix}, expected .{expected_ext}")
+        ext = os.path.splitext(path)[1]
+        if ext[1:].lower() != expected_ext:
+            print_warning(f"File extension is {ext}, expected .{expected_ext}")
             if not ask_confirm("Continue anyway?"):
                 continue
 
@@ -216,7 +275,10 @@ def step_detect_pii(file_path: Path) -> Dict[str, Any]:
     print_info("Scanning for sensitive information...")
 
     try:
-        detected = detect_pii(file_path)
+        key = _file_key(file_path)
+        detected = _DETECT_CACHE.get(key)
+        if detected is None:
+            detected = _DETECT_CACHE[key] = detect_pii(file_path)
 
         if not detected:
             print_warning("No PII automatically detected")
@@ -227,24 +289,19 @@ def step_detect_pii(file_path: Path) -> Dict[str, Any]:
             return {}
 
         print_success(f"Found {len(detected)} potential PII fields:")
-        print()
-
-        # Display detected fields in a table
-        print(f"  {'Column':<20} {'Type':<15} {'Confidence'}")
-        print(f"  {'-'*20} {'-'*15} {'-'*10}")
-        for col, info in detected.items():
-            pii_type = info.get("type", "unknown") if isinstance(info, dict) else info
-            confidence = (
-                info.get("confidence", "auto") if isinstance(info, dict) else "auto"
-            )
-            conf_str = (
-                f"{confidence:.0%}"
-                if isinstance(confidence, float)
-                else str(confidence)
-            )
-            print(f"  {col:<20} {pii_type:<15} {conf_str}")
 
-        print()
+        # Display detected fields in a table, written in one go
+        lines = [
+            "",
+            f"  {'Column':<20} {'Type':<15} {'Confidence'}",
+            f"  {'-'*20} {'-'*15} {'-'*10}",
+        ]
+        lines.extend(
+            f"  {col:<20} {pii_type:<15} {conf_str}"
+            for col, pii_type, conf_str in _pii_rows(detected)
+        )
+        lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
         return detected
 
     except Exception as e:
@@ -288,25 +345,14 @@ def step_select_strategy() -> str:
     print_info("How should we anonymize the data?")
     print()
 
+    # Plain labels work with both questionary and the input() fallback
     strategy = ask_select(
         "Select strategy:",
-        choices=[
-            Choice("Replace with fake data (realistic, consistent)", value="replace"),
-            Choice("Mask (show last 4 chars only: j***@example.com)", value="mask"),
-            Choice("Hash (one-way, irreversible)", value="hash"),
-            Choice("Remove (delete the data entirely)", value="remove"),
-        ],
-        default="replace",
+        choices=list(_STRATEGY_MAP),
+        default="Replace with fake data (realistic, consistent)",
     )
 
-    strategy_map = {
-        "Replace with fake data (realistic, consistent)": "replace",
-        "Mask (show last 4 chars only: j***@example.com)": "mask",
-        "Hash (one-way, irreversible)": "hash",
-        "Remove (delete the data entirely)": "remove",
-    }
-
-    result = strategy_map.get(strategy, strategy)
+    result = _STRATEGY_MAP.get(strategy, strategy)
     print_success(f"Using strategy: {result}")
     return result
 
@@ -325,18 +371,28 @@ def step_preview(file_path: Path, selected_columns: List[str], strategy: str):
     print()
 
     try:
-        preview_data = preview(file_path, num_rows=3, strategy=strategy)
+        key = (*_file_key(file_path), strategy, tuple(selected_columns))
+        preview_data = _PREVIEW_CACHE.get(key)
+        if preview_data is None:
+            preview_data = _PREVIEW_CACHE[key] = preview(
+                file_path,
+                num_rows=3,
+                strategy=strategy,
+                columns=selected_columns or None,
+            )
 
+        lines = []
         if preview_data:
             # Show preview in a simple format
-            headers = list(preview_data[0].keys())
-            print(f"  {' | '.join(headers[:4])}")  # Limit to first 4 columns
-            print(f"  {'-' * 60}")
-            for row in preview_data[:3]:
-                values = [str(row.get(h, ""))[:15] for h in headers[:4]]
-                print(f"  {' | '.join(values)}")
-
-        print()
+            headers = list(preview_data[0].keys())[:4]  # Limit to first 4 columns
+            lines.append(f"  {' | '.join(headers)}")
+            lines.append(f"  {'-' * 60}")
+            lines.extend(
+                f"  {' | '.join(str(row.get(h, ''))[:15] for h in headers)}"
+                for row in preview_data[:3]
+            )
+        lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
 
         if ask_confirm("Look good? Proceed with anonymization?", default=True):
             return True
@@ -349,25 +405,27 @@ def step_preview(file_path: Path, selected_columns: List[str], strategy: str):
         return ask_confirm("Continue without preview?")
 
 
-def step_execute(
-    file_path: Path, selected_columns: List[str], strategy: str
-) -> Optional[Path]:
-    """Step 6: Execute anonymization."""
-    print(f"\n{Colors.BOLD}Step 6: Running anonymization{Colors.RESET}")
+def step_select_output(file_path: Path) -> Path:
+    """Step 6: Choose where to save the result."""
+    print(f"\n{Colors.BOLD}Step 6: Choose output location{Colors.RESET}")
     print("-" * 40)
 
     # Generate output path
     default_output = file_path.with_suffix(f".anonymized{file_path.suffix}")
 
-    custom_output = ask_confirm(
-        f"Save to default location ({default_output.name})?", default=True
-    )
+    if ask_confirm(f"Save to default location ({default_output.name})?", default=True):
+        return default_output
+
+    custom_path = ask_text("Enter output file path:", default=str(default_output))
+    return Path(custom_path)
 
-    if custom_output:
-        output_path = default_output
-    else:
-        custom_path = ask_text("Enter output file path:", default=str(default_output))
-        output_path = Path(custom_path)
+
+def step_execute(
+    file_path: Path, selected_columns: List[str], strategy: str, output_path: Path
+) -> Optional[Path]:
+    """Step 7: Execute anonymization."""
+    print(f"\n{Colors.BOLD}Step 7: Running anonymization{Colors.RESET}")
+    print("-" * 40)
 
     print_info("Anonymizing... this may take a moment for large files")
     print()
@@ -381,17 +439,28 @@ def step_execute(
             progress=True,
         )
 
+        # The next run is most likely a different file
+        _DETECT_CACHE.clear()
+        _PREVIEW_CACHE.clear()
+
         print()
         print_success("Anonymization complete! 🎉")
         print()
         print(f"  Input:  {file_path}")
         print(f"  Output: {result}")
 
-        if isinstance(result, str):
-            output_size = Path(result).stat().st_size
+        if not isinstance(result, str):
+            return None
+
+        # The size is informational, so a failed stat doesn't fail the run
+        try:
+            output_size = os.stat(result).st_size
+        except OSError:
+            pass
+        else:
             print(f"  Size:   {output_size:,} bytes")
 
-        return Path(result) if isinstance(result, str) else None
+        return Path(result)
 
     except Exception as e:
         print_error(f"Anonymization failed: {e}")
@@ -470,11 +539,16 @@ def run_wizard():
                 # Allow changing settings
                 strategy = step_select_strategy()
 
-            # Step 6: Execute
-            output_path = step_execute(file_path, selected_columns, strategy)
+            # Step 6: Output location, the last question before the long run
+            output_path = step_select_output(file_path)
+
+            # Step 7: Execute
+            result_path = step_execute(
+                file_path, selected_columns, strategy, output_path
+            )
 
             # Next actions
-            next_action = step_next_actions(output_path)
+            next_action = step_next_actions(result_path)
 
             if next_action == "exit":
                 break
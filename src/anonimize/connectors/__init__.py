@@ -1,5 +1,8 @@
 """Database connectors for various database systems."""
 
+import importlib
+import sys
+
 from anonimize.connectors.base import (
     BaseConnector,
     ColumnInfo,
@@ -25,30 +28,59 @@ __all__ = [
     "Transaction",
     # Concrete implementations
     "SQLiteConnector",
+    "PostgreSQLConnector",
+    "MySQLConnector",
+    "MongoDBConnector",
     "create_connector",
 ]
 
-# Optional connectors (require additional dependencies)
-try:
-    from anonimize.connectors.postgres import PostgreSQLConnector
+# Optional connectors (require additional dependencies) are imported on
+# first access, so e.g. pymongo only loads once MongoDBConnector is used.
+# Each resolves to None when its driver is missing.
+_OPTIONAL_CONNECTORS = {
+    "PostgreSQLConnector": "anonimize.connectors.postgres",
+    "MySQLConnector": "anonimize.connectors.mysql",
+    "MongoDBConnector": "anonimize.connectors.mongodb",
+}
+
+
+def __getattr__(name: str):
+    """Import optional connectors on first access."""
+    module_name = _OPTIONAL_CONNECTORS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        value = getattr(importlib.import_module(module_name), name)
+    except ImportError:
+        value = None
 
-    __all__.append("PostgreSQLConnector")
-except ImportError:
-    PostgreSQLConnector = None  # type: ignore
+    globals()[name] = value
+    return value
 
-try:
-    from anonimize.connectors.mysql import MySQLConnector
 
-    __all__.append("MySQLConnector")
-except ImportError:
-    MySQLConnector = None  # type: ignore
+def __dir__():
+    """List eager and lazily imported exports."""
+    return sorted(set(globals()) | set(_OPTIONAL_CONNECTORS))
 
-try:
-    from anonimize.connectors.mongodb import MongoDBConnector
 
-    __all__.append("MongoDBConnector")
-except ImportError:
-    MongoDBConnector = None  # type: ignore
+# Connection string scheme -> connector class name
+_SCHEMES = {
+    "postgresql": "PostgreSQLConnector",
+    "postgres": "PostgreSQLConnector",
+    "mysql": "MySQLConnector",
+    "mariadb": "MySQLConnector",
+    "mongodb": "MongoDBConnector",
+    "mongodb+srv": "MongoDBConnector",
+    "sqlite": "SQLiteConnector",
+}
+
+# Optional connector -> (database, driver package, install extra)
+_DRIVERS = {
+    "PostgreSQLConnector": ("PostgreSQL", "psycopg2-binary", "postgresql"),
+    "MySQLConnector": ("MySQL", "pymysql", "mysql"),
+    "MongoDBConnector": ("MongoDB", "pymongo", "mongodb"),
+}
 
 
 def create_connector(connection_string: str, **kwargs):
@@ -65,34 +97,18 @@ def create_connector(connection_string: str, **kwargs):
         ValueError: If connection string is not recognized
         ImportError: If required driver is not installed
     """
-    if connection_string.startswith(("postgresql://", "postgres://")):
-        if PostgreSQLConnector is None:
-            raise ImportError(
-                "PostgreSQL connector requires psycopg2-binary. "
-                'Install with: pip install "anonimize[postgresql]"'
-            )
-        return PostgreSQLConnector(connection_string, **kwargs)
-
-    elif connection_string.startswith(("mysql://", "mariadb://")):
-        if MySQLConnector is None:
-            raise ImportError(
-                "MySQL connector requires pymysql. "
-                'Install with: pip install "anonimize[mysql]"'
-            )
-        return MySQLConnector(connection_string, **kwargs)
-
-    elif connection_string.startswith(("mongodb://", "mongodb+srv://")):
-        if MongoDBConnector is None:
-            raise ImportError(
-                "MongoDB connector requires pymongo. "
-                'Install with: pip install "anonimize[mongodb]"'
-            )
-        return MongoDBConnector(connection_string, **kwargs)
-
-    elif connection_string.startswith("sqlite:///"):
-        return SQLiteConnector(connection_string, **kwargs)
-
-    else:
+    scheme, sep, _ = connection_string.partition("://")
+    name = _SCHEMES.get(scheme) if sep else None
+    if name is None:
         raise ValueError(
             f"Unsupported connection string format: {connection_string[:20]}..."
         )
+
+    connector_cls = getattr(sys.modules[__name__], name)
+    if connector_cls is None:
+        database, driver, extra = _DRIVERS[name]
+        raise ImportError(
+            f"{database} connector requires {driver}. "
+            f'Install with: pip install "anonimize[{extra}]"'
+        )
+    return connector_cls(connection_string, **kwargs)
@@ -1,14 +1,33 @@
 """Database connector base class and implementations."""
 
+import functools
+import inspect
 import logging
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Iterator, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 logger = logging.getLogger(__name__)
 
+# Drop the per-instance __dict__ where dataclasses support it (3.10+)
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class ConnectionConfig:
     """Configuration for database connections."""
 
@@ -23,10 +42,12 @@ class ConnectionConfig:
     pool_timeout: int = 30
     max_overflow: int = 10
     pool_recycle: int = 3600
+    min_pool_size: Optional[int] = None
+    max_connecting: int = 2
     extra: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ColumnInfo:
     """Information about a database column."""
 
@@ -39,7 +60,7 @@ class ColumnInfo:
     is_unique: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TableInfo:
     """Information about a database table."""
 
@@ -51,7 +72,7 @@ class TableInfo:
     size_bytes: Optional[int] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class QueryResult:
     """Result of a database query."""
 
@@ -61,59 +82,150 @@ class QueryResult:
     affected_rows: int = 0
     execution_time_ms: float = 0.0
 
+    def column(self, name: str) -> List[Any]:
+        """Get all values of one column, in row order.
+
+        Handy for per-column transforms such as ``map(fake, result.column(c))``.
+        Rows missing the column yield None.
+        """
+        return [row.get(name) for row in self.rows]
+
 
 class ConnectionPool:
-    """Simple connection pool implementation."""
+    """Simple thread-safe connection pool implementation."""
 
     def __init__(self, factory: Callable, config: ConnectionConfig):
         self._factory = factory
         self._config = config
-        self._pool: List[Any] = []
-        self._in_use: set = set()
+        self._pool: Deque[Any] = deque()
+        # id -> connection, for connections checked out by callers
+        self._in_use: Dict[int, Any] = {}
         self._max_size = config.pool_size
         self._max_overflow = config.max_overflow
         self._overflow = 0
         self._total_created = 0
+        # Slots held while the factory runs outside the lock
+        self._reserved = 0
+        self._available = threading.Condition()
+
+    def _can_acquire(self) -> bool:
+        """Whether a connection is idle or a new one may be created."""
+        return bool(self._pool) or (
+            len(self._in_use) + self._reserved < self._max_size + self._max_overflow
+        )
 
     def acquire(self, timeout: float = 30.0) -> Any:
-        """Acquire a connection from the pool."""
-        if self._pool:
-            conn = self._pool.pop()
-            self._in_use.add(id(conn))
-            return conn
+        """Acquire a connection from the pool.
 
-        if len(self._in_use) < self._max_size + self._max_overflow:
+        Waits up to ``timeout`` seconds for a connection to be released when
+        the pool and its overflow are exhausted.
+        """
+        with self._available:
+            if not self._available.wait_for(self._can_acquire, timeout):
+                raise RuntimeError("Connection pool exhausted")
+            if self._pool:
+                conn = self._pool.pop()
+                self._in_use[id(conn)] = conn
+                return conn
+            self._reserved += 1
+
+        try:
             conn = self._factory()
+        except BaseException:
+            with self._available:
+                self._reserved -= 1
+                self._available.notify()
+            raise
+
+        with self._available:
+            self._reserved -= 1
             self._total_created += 1
-            self._in_use.add(id(conn))
+            self._in_use[id(conn)] = conn
             if len(self._in_use) > self._max_size:
                 self._overflow += 1
-            return conn
-
-        raise RuntimeError("Connection pool exhausted")
+        return conn
 
     def release(self, connection: Any) -> None:
         """Release a connection back to the pool."""
         conn_id = id(connection)
-        if conn_id in self._in_use:
-            self._in_use.remove(conn_id)
-            self._pool.append(connection)
+        with self._available:
+            # Ignore connections not checked out, so a double release can't
+            # hand the same connection to two callers
+            if conn_id in self._in_use:
+                del self._in_use[conn_id]
+                self._pool.append(connection)
+                self._available.notify()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get pool statistics."""
-        return {
-            "pool_size": self._max_size,
-            "available": len(self._pool),
-            "in_use": len(self._in_use),
-            "overflow": self._overflow,
-            "total_created": self._total_created,
-        }
+        with self._available:
+            return {
+                "pool_size": self._max_size,
+                "available": len(self._pool),
+                "in_use": len(self._in_use),
+                "overflow": self._overflow,
+                "total_created": self._total_created,
+            }
+
+    def close_all(self, disconnect: Optional[Callable[[Any], None]] = None) -> None:
+        """Close all connections in the pool.
+
+        Idle and checked-out connections are passed to ``disconnect``; without
+        it they are only dropped, and close when garbage collected.
+        """
+        with self._available:
+            connections = [*self._pool, *self._in_use.values()]
+            self._pool.clear()
+            self._in_use.clear()
+            self._overflow = 0
+            self._available.notify_all()
 
-    def close_all(self) -> None:
-        """Close all connections in the pool."""
-        self._pool.clear()
-        self._in_use.clear()
-        self._overflow = 0
+        if disconnect is not None:
+            for connection in connections:
+                try:
+                    disconnect(connection)
+                except Exception as e:
+                    logger.debug("Error closing pooled connection: %s", e)
+
+
+@functools.lru_cache(maxsize=256)
+def row_caster(columns: Tuple[str, ...]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """Build a function turning a row tuple into a dict keyed by ``columns``.
+
+    The function is cached per column tuple, so a result set's rows share
+    one; each row is converted with ``dict(zip(columns, row))``.
+    """
+
+    def cast(row: Sequence[Any]) -> Dict[str, Any]:
+        return dict(zip(columns, row))
+
+    return cast
+
+
+def cached_schema(method: Callable) -> Callable:
+    """Cache a catalog lookup's result for the connector's SCHEMA_CACHE_TTL.
+
+    Results are keyed by method name and arguments, with defaults filled in,
+    so ``get_columns("t")`` and ``get_columns("t", schema=None)`` share an
+    entry. Each call returns a fresh copy of the cached list.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self: "BaseConnector", *args: Any, **kwargs: Any) -> Any:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, *list(bound.arguments.values())[1:])
+
+        cached = self._cached_schema(key)
+        if cached is not None:
+            return list(cached)
+
+        result = method(self, *args, **kwargs)
+        self._schema_cache[key] = (time.monotonic(), result)
+        return list(result)
+
+    return wrapper
 
 
 class BaseConnector(ABC):
@@ -121,10 +233,21 @@ class BaseConnector(ABC):
 
     DB_TYPE: str = ""
 
+    # Seconds @cached_schema lookups reuse what they read
+    SCHEMA_CACHE_TTL = 300.0
+
+    # Statements _statement() keeps before evicting the least recently used
+    STATEMENT_CACHE_SIZE = 512
+
     def __init__(self, config: ConnectionConfig):
         self.config = config
         self._pool: Optional[ConnectionPool] = None
         self._closed = False
+        # Generated SQL text, keyed by operation, table and column shape
+        self._stmt_cache: OrderedDict[tuple, str] = OrderedDict()
+        self._stmt_lock = threading.Lock()
+        # (method, *arguments) -> (monotonic time read, result)
+        self._schema_cache: Dict[tuple, Tuple[float, Any]] = {}
 
     @abstractmethod
     def connect(self):
@@ -198,13 +321,60 @@ class BaseConnector(ABC):
     def update_rows(
         self,
         table_name: str,
-        updates: List[Dict[str, Any]],
+        updates: List[Tuple[Dict[str, Any], Dict[str, Any]]],
         schema: Optional[str] = None,
         batch_size: int = 1000,
     ) -> int:
-        """Update rows in a table."""
+        """Update rows in a table.
+
+        ``updates`` holds (where_conditions, set_values) pairs. Implementations
+        should send them with _update_batches() and executemany() rather than
+        one statement per row.
+        """
         pass
 
+    def _statement(self, key: tuple, build: Callable[[], str]) -> str:
+        """Get the SQL cached under ``key``, building it on first use.
+
+        The key must capture everything the text depends on, in placeholder
+        order, e.g. ``("update", schema, table, set_columns, where_columns)``.
+        At most STATEMENT_CACHE_SIZE statements are kept.
+        """
+        with self._stmt_lock:
+            sql = self._stmt_cache.get(key)
+            if sql is not None:
+                self._stmt_cache.move_to_end(key)
+                return sql
+        sql = build()
+        with self._stmt_lock:
+            self._stmt_cache[key] = sql
+            if len(self._stmt_cache) > self.STATEMENT_CACHE_SIZE:
+                self._stmt_cache.popitem(last=False)
+        return sql
+
+    @staticmethod
+    def _update_batches(
+        updates: List[Tuple[Dict[str, Any], Dict[str, Any]]], batch_size: int
+    ) -> Iterator[Tuple[Tuple[str, ...], Tuple[str, ...], List[tuple]]]:
+        """Group updates into executemany-ready batches.
+
+        Consecutive updates touching the same columns share one statement,
+        so each batch is (set_columns, where_columns, params) where every
+        params tuple holds the set values followed by the where values.
+        Batches never exceed ``batch_size`` and keep the input order.
+        """
+        shape: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+        params: List[tuple] = []
+        for where_conditions, set_values in updates:
+            row_shape = (tuple(set_values), tuple(where_conditions))
+            if row_shape != shape or len(params) >= batch_size:
+                if params:
+                    yield shape[0], shape[1], params
+                shape, params = row_shape, []
+            params.append((*set_values.values(), *where_conditions.values()))
+        if params:
+            yield shape[0], shape[1], params
+
     @abstractmethod
     def test_connection(self) -> bool:
         """Test if connection is working."""
@@ -225,6 +395,22 @@ class BaseConnector(ABC):
         """Rollback a transaction."""
         pass
 
+    def _cached_schema(self, key: tuple) -> Optional[Any]:
+        """Return the unexpired @cached_schema result under ``key``, if any."""
+        cached = self._schema_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.SCHEMA_CACHE_TTL:
+            return cached[1]
+        return None
+
+    def invalidate_cache(self) -> None:
+        """Forget cached catalog lookups, e.g. after DDL changes the schema.
+
+        Cached SQL goes too, since it may embed column types.
+        """
+        self._schema_cache.clear()
+        with self._stmt_lock:
+            self._stmt_cache.clear()
+
     def get_pool_stats(self) -> Dict[str, Any]:
         """Get connection pool statistics."""
         if self._pool is None:
@@ -4,14 +4,29 @@ This module provides a MongoDB connector with support for
 document scanning and batch operations.
 """
 
+import importlib.util
 import logging
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, DefaultDict, Dict, Iterator, List, Optional, Set, Tuple
 
 try:
-    from pymongo import ASCENDING, DESCENDING, MongoClient
+    from pymongo import (
+        ASCENDING,
+        DESCENDING,
+        DeleteOne,
+        IndexModel,
+        InsertOne,
+        MongoClient,
+        UpdateMany,
+        UpdateOne,
+    )
     from pymongo.collection import Collection
+    from pymongo.command_cursor import CommandCursor
     from pymongo.database import Database
     from pymongo.errors import ConnectionFailure, PyMongoError
+    from pymongo.read_preferences import SecondaryPreferred
 
     PYMONGO_AVAILABLE = True
 except ImportError:
@@ -19,10 +34,17 @@ except ImportError:
     MongoClient = None
     ASCENDING = None
     DESCENDING = None
+    DeleteOne = None
+    IndexModel = None
+    InsertOne = None
+    UpdateMany = None
+    UpdateOne = None
     Collection = None
+    CommandCursor = None
     Database = None
     PyMongoError = None
     ConnectionFailure = None
+    SecondaryPreferred = None
 
 from anonimize.connectors.base import (
     BaseConnector,
@@ -34,6 +56,13 @@ from anonimize.connectors.base import (
 
 logger = logging.getLogger(__name__)
 
+# Wire compressors in order of preference; zlib needs no extra package.
+_COMPRESSORS = ",".join(
+    name
+    for name, module in (("zstd", "zstandard"), ("snappy", "snappy"), ("zlib", None))
+    if module is None or importlib.util.find_spec(module) is not None
+)
+
 
 class MongoDBConnector(BaseConnector):
     """MongoDB database connector.
@@ -44,6 +73,10 @@ class MongoDBConnector(BaseConnector):
     - Cursor-based iteration for large collections
     - Projection support for efficient scanning
 
+    Scans and schema inspection read from a secondary when one is available,
+    leaving the primary to the write path. Those reads may lag the primary by
+    the replication delay; writes always go to the primary.
+
     Example:
         >>> config = ConnectionConfig(
         ...     host="localhost",
@@ -84,6 +117,7 @@ class MongoDBConnector(BaseConnector):
 
         self._client_options = client_options
         self._client: Optional[MongoClient] = None
+        self._collection_cache: Dict[Tuple[str, str, Optional[str]], Collection] = {}
 
     def _build_connection_uri(self) -> str:
         """Build MongoDB connection URI."""
@@ -103,12 +137,22 @@ class MongoDBConnector(BaseConnector):
         """Create a MongoDB client connection."""
         uri = self._build_connection_uri()
 
+        min_pool_size = self.config.min_pool_size
+        if min_pool_size is None:
+            # Keep warm connections for worker threads, never above the max
+            min_pool_size = min(
+                self.config.pool_size, max(10, self.config.pool_size // 20)
+            )
+
         options = {
             "maxPoolSize": self.config.pool_size,
-            "minPoolSize": 1,
+            "minPoolSize": min_pool_size,
+            "maxConnecting": self.config.max_connecting,
             "maxIdleTimeMS": self.config.pool_recycle * 1000,
             "waitQueueTimeoutMS": self.config.pool_timeout * 1000,
             "serverSelectionTimeoutMS": self.config.connect_timeout * 1000,
+            "compressors": _COMPRESSORS,
+            "retryWrites": True,
             **self._client_options,
         }
 
@@ -126,6 +170,18 @@ class MongoDBConnector(BaseConnector):
             self._client = self.connect()
             logger.info("Initialized MongoDB client")
 
+    def _get_client(self, connection: Optional[MongoClient] = None) -> MongoClient:
+        """Get the client to use: ``connection`` if given, else the shared one.
+
+        MongoClient pools connections itself, so every operation reuses one
+        client instead of paying for discovery and handshakes each call.
+        """
+        if connection is not None:
+            return connection
+        if self._client is None:
+            self.initialize_pool()
+        return self._client
+
     def _get_database(
         self, client: MongoClient, database_name: Optional[str] = None
     ) -> Database:
@@ -140,10 +196,35 @@ class MongoDBConnector(BaseConnector):
         client: MongoClient,
         collection_name: str,
         database_name: Optional[str] = None,
+        read_preference: Optional[Any] = None,
     ) -> Collection:
-        """Get a collection from the client."""
+        """Get a collection from the client.
+
+        Handles on the shared client are cached. Read preferences aren't
+        hashable, so their repr (mode, tags and staleness) is used as key.
+        """
+        key = (
+            database_name or self.config.database,
+            collection_name,
+            None if read_preference is None else repr(read_preference),
+        )
+        cacheable = client is self._client
+        if cacheable:
+            collection = self._collection_cache.get(key)
+            if collection is not None:
+                return collection
+
         db = self._get_database(client, database_name)
-        return db[collection_name]
+        if read_preference is None:
+            collection = db[collection_name]
+        else:
+            collection = db.get_collection(
+                collection_name, read_preference=read_preference
+            )
+
+        if cacheable:
+            self._collection_cache[key] = collection
+        return collection
 
     def execute(
         self,
@@ -157,42 +238,105 @@ class MongoDBConnector(BaseConnector):
         and 'parameters' should contain:
             - pipeline: The aggregation pipeline
             - database: Optional database name
+            - batch_size: Optional cursor batch size
+            - schema_only: Only return the columns, via get_pipeline_schema()
+
+        The whole result is loaded into memory; use execute_cursor() for
+        large pipelines.
         """
         import time
 
         start_time = time.time()
-        should_close = False
 
-        if connection is None:
-            if self._client:
-                connection = self._client
-            else:
-                connection = self.connect()
-                should_close = True
+        if parameters and parameters.get("schema_only"):
+            columns = self.get_pipeline_schema(
+                query,
+                parameters.get("pipeline", []),
+                parameters.get("database"),
+                connection,
+            )
+            return QueryResult(
+                rows=[],
+                columns=columns,
+                row_count=0,
+                affected_rows=0,
+                execution_time_ms=(time.time() - start_time) * 1000,
+            )
 
-        try:
-            collection_name = query
-            pipeline = parameters.get("pipeline", []) if parameters else []
-            database_name = parameters.get("database") if parameters else None
+        result = list(self.execute_cursor(query, parameters, connection))
 
-            collection = self._get_collection(
-                connection, collection_name, database_name
-            )
+        execution_time = (time.time() - start_time) * 1000
 
-            result = list(collection.aggregate(pipeline))
+        return QueryResult(
+            rows=result,
+            columns=list(result[0].keys()) if result else [],
+            row_count=len(result),
+            affected_rows=0,
+            execution_time_ms=execution_time,
+        )
 
-            execution_time = (time.time() - start_time) * 1000
+    def execute_cursor(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        connection: Optional[MongoClient] = None,
+    ) -> CommandCursor:
+        """Run an aggregation pipeline and return its cursor unconsumed.
 
-            return QueryResult(
-                rows=result,
-                columns=list(result[0].keys()) if result else [],
-                row_count=len(result),
-                affected_rows=0,
-                execution_time_ms=execution_time,
-            )
-        finally:
-            if should_close:
-                self.disconnect(connection)
+        Takes the same parameters as execute(). Documents are fetched batch
+        by batch as the cursor is iterated, and stages may spill to disk.
+        """
+        connection = self._get_client(connection)
+
+        parameters = parameters or {}
+        collection = self._get_collection(connection, query, parameters.get("database"))
+
+        options: Dict[str, Any] = {"allowDiskUse": True}
+        if parameters.get("batch_size") is not None:
+            options["batchSize"] = parameters["batch_size"]
+
+        return collection.aggregate(parameters.get("pipeline", []), **options)
+
+    def execute_many_concurrent(
+        self,
+        queries: List[Tuple[str, Optional[Dict[str, Any]]]],
+        max_workers: int = 8,
+    ) -> List[QueryResult]:
+        """Run several aggregation pipelines in parallel threads.
+
+        Args:
+            queries: (collection name, execute() parameters) pairs.
+            max_workers: Maximum number of pipelines in flight at once.
+
+        Returns:
+            One QueryResult per query, in the order given.
+        """
+        if not queries:
+            return []
+
+        # The shared client is thread-safe; create it before fanning out
+        self._get_client()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+            return list(pool.map(lambda query: self.execute(*query), queries))
+
+    def get_pipeline_schema(
+        self,
+        collection_name: str,
+        pipeline: List[Dict[str, Any]],
+        database: Optional[str] = None,
+        connection: Optional[MongoClient] = None,
+    ) -> List[str]:
+        """Get the fields of a pipeline's first result document.
+
+        Only one document is produced and transferred, so this is cheap even
+        when the full pipeline output is large.
+        """
+        cursor = self.execute_cursor(
+            collection_name,
+            {"pipeline": [*pipeline, {"$limit": 1}], "database": database},
+            connection,
+        )
+        return list(next(cursor, {}).keys())
 
     def executemany(
         self,
@@ -210,196 +354,208 @@ class MongoDBConnector(BaseConnector):
         import time
 
         start_time = time.time()
-        should_close = False
 
-        if connection is None:
-            if self._client:
-                connection = self._client
-            else:
-                connection = self.connect()
-                should_close = True
+        connection = self._get_client(connection)
 
-        try:
-            collection_name = query
-            database_name = (
-                parameters_list[0].get("database") if parameters_list else None
-            )
+        collection_name = query
+        database_name = parameters_list[0].get("database") if parameters_list else None
 
-            collection = self._get_collection(
-                connection, collection_name, database_name
-            )
+        collection = self._get_collection(connection, collection_name, database_name)
 
-            # Build bulk operations
-            operations = []
-            for params in parameters_list:
-                op = params.get("operation", "insert")
-                doc = params.get("document", {})
-                filter_doc = params.get("filter", {})
-
-                if op == "insert":
-                    operations.append(doc)
-                elif op == "update":
-                    collection.update_one(
-                        filter_doc, {"$set": doc}, upsert=params.get("upsert", False)
-                    )
-                elif op == "delete":
-                    collection.delete_one(filter_doc)
+        # Send every operation in a single bulk write
+        operations = []
+        for params in parameters_list:
+            op = params.get("operation", "insert")
+            doc = params.get("document", {})
+            filter_doc = params.get("filter", {})
 
-            # Bulk insert
-            if operations:
-                result = collection.insert_many(operations)
-                affected_rows = len(result.inserted_ids)
-            else:
-                affected_rows = len(parameters_list)
+            if op == "insert":
+                operations.append(InsertOne(doc))
+            elif op == "update":
+                operations.append(
+                    UpdateOne(
+                        filter_doc,
+                        {"$set": doc},
+                        upsert=params.get("upsert", False),
+                    )
+                )
+            elif op == "delete":
+                operations.append(DeleteOne(filter_doc))
+
+        affected_rows = 0
+        if operations:
+            # Unordered bulks are regrouped by operation type, which could run
+            # a delete after a re-insert of the same _id, so mixed lists keep
+            # their order
+            ordered = len({type(operation) for operation in operations}) > 1
+            result = collection.bulk_write(operations, ordered=ordered)
+            affected_rows = (
+                result.inserted_count
+                + result.upserted_count
+                + result.modified_count
+                + result.deleted_count
+            )
 
-            execution_time = (time.time() - start_time) * 1000
+        execution_time = (time.time() - start_time) * 1000
 
-            return QueryResult(
-                rows=[],
-                columns=[],
-                row_count=0,
-                affected_rows=affected_rows,
-                execution_time_ms=execution_time,
-            )
-        finally:
-            if should_close:
-                self.disconnect(connection)
+        return QueryResult(
+            rows=[],
+            columns=[],
+            row_count=0,
+            affected_rows=affected_rows,
+            execution_time_ms=execution_time,
+        )
 
     def fetchiter(
         self,
         query: str,
         parameters: Optional[Dict[str, Any]] = None,
-        batch_size: int = 1000,
+        batch_size: Optional[int] = None,
         connection: Optional[MongoClient] = None,
+        object_id_as_str: bool = False,
     ) -> Iterator[Dict[str, Any]]:
-        """Fetch documents as an iterator."""
-        should_close = False
+        """Fetch documents as an iterator.
 
-        if connection is None:
-            if self._client:
-                connection = self._client
-            else:
-                connection = self.connect()
-                should_close = True
+        PyMongo already fetches 101 documents and then 16 MiB batches per
+        round-trip, so ``batch_size`` is left unset by default. Pass a value
+        only to cap the documents buffered in memory at once.
 
-        try:
-            collection_name = query
-            filter_doc = parameters.get("filter", {}) if parameters else {}
-            projection = parameters.get("projection") if parameters else None
-            database_name = parameters.get("database") if parameters else None
+        Documents are yielded as decoded. Set ``object_id_as_str`` when they
+        are headed for JSON and ``_id`` must be a string.
+        """
+        connection = self._get_client(connection)
 
-            collection = self._get_collection(
-                connection, collection_name, database_name
-            )
+        collection_name = query
+        filter_doc = parameters.get("filter", {}) if parameters else {}
+        projection = parameters.get("projection") if parameters else None
+        database_name = parameters.get("database") if parameters else None
+        read_preference = parameters.get("read_preference") if parameters else None
 
-            cursor = collection.find(filter_doc, projection).batch_size(batch_size)
+        collection = self._get_collection(
+            connection, collection_name, database_name, read_preference
+        )
 
-            for doc in cursor:
-                # Convert ObjectId to string for JSON serialization
-                if "_id" in doc:
-                    doc["_id"] = str(doc["_id"])
-                yield doc
-        finally:
-            if should_close:
-                self.disconnect(connection)
+        cursor = collection.find(filter_doc, projection)
+        if batch_size is not None:
+            cursor = cursor.batch_size(batch_size)
 
-    def get_tables(self, schema: Optional[str] = None) -> List[TableInfo]:
-        """Get list of collections (treated as tables)."""
-        client = self._client or self.connect()
-        should_close = self._client is None
+        if not object_id_as_str:
+            yield from cursor
+            return
 
-        try:
-            db = self._get_database(client, schema)
-            collection_names = db.list_collection_names()
+        for doc in cursor:
+            # Convert ObjectId to string for JSON serialization
+            if "_id" in doc:
+                doc["_id"] = str(doc["_id"])
+            yield doc
 
-            tables = []
-            for name in collection_names:
-                collection = db[name]
+    def fetchiter_chunks(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        connection: Optional[MongoClient] = None,
+        object_id_as_str: bool = False,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Fetch documents as lists of up to ``batch_size`` documents.
 
-                # Get document count
-                try:
-                    row_count = collection.estimated_document_count()
-                except Exception:
-                    row_count = collection.count_documents({})
+        The cursor itself keeps PyMongo's batching; ``batch_size`` only sets
+        how many documents each yielded list holds.
+        """
+        docs = self.fetchiter(
+            query,
+            parameters,
+            connection=connection,
+            object_id_as_str=object_id_as_str,
+        )
+        while True:
+            chunk = list(islice(docs, batch_size))
+            if not chunk:
+                return
+            yield chunk
 
-                # Get stats
-                try:
-                    stats = db.command("collStats", name)
-                    size_bytes = stats.get("size", 0)
-                except Exception:
-                    size_bytes = None
-
-                table_info = TableInfo(
-                    name=name,
-                    schema=schema or self.config.database,
-                    row_count=row_count,
-                    size_bytes=size_bytes,
+    def get_tables(self, schema: Optional[str] = None) -> List[TableInfo]:
+        """Get list of collections (treated as tables)."""
+        client = self._get_client()
+
+        db = self._get_database(client, schema)
+        collection_names = db.list_collection_names()
+
+        tables = []
+        for name in collection_names:
+            # collStats reports count and size from metadata in one round-trip;
+            # count_documents({}) would scan the whole collection.
+            try:
+                stats = db.command(
+                    "collStats", name, read_preference=SecondaryPreferred()
                 )
-                tables.append(table_info)
-
-            # Sample documents for schema inference
-            for table in tables:
-                table.columns = self.get_columns(table.name, schema)
+                row_count = stats.get("count", 0)
+                size_bytes = stats.get("size", 0)
+            except PyMongoError:
+                row_count = size_bytes = None
+
+            table_info = TableInfo(
+                name=name,
+                schema=schema or self.config.database,
+                row_count=row_count,
+                size_bytes=size_bytes,
+            )
+            tables.append(table_info)
+
+        # Sample documents for schema inference, overlapping the round-trips.
+        # More workers than pooled connections would only queue for one.
+        if tables:
+            workers = min(16, self.config.pool_size, len(tables))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                columns = executor.map(
+                    lambda table: self.get_columns(table.name, schema), tables
+                )
+                for table, table_columns in zip(tables, columns):
+                    table.columns = table_columns
 
-            return tables
-        finally:
-            if should_close:
-                self.disconnect(client)
+        return tables
 
     def get_columns(
         self, collection_name: str, schema: Optional[str] = None
     ) -> List[ColumnInfo]:
         """Infer schema by sampling documents."""
-        client = self._client or self.connect()
-        should_close = self._client is None
+        client = self._get_client()
 
-        try:
-            collection = self._get_collection(client, collection_name, schema)
-
-            # Sample documents to infer schema
-            sample_docs = list(collection.find().limit(100))
-
-            if not sample_docs:
-                return []
-
-            # Collect all unique fields and their types
-            field_info: Dict[str, Dict[str, Any]] = {}
-
-            for doc in sample_docs:
-                for key, value in doc.items():
-                    if key not in field_info:
-                        field_info[key] = {
-                            "types": set(),
-                            "nullable": False,
-                        }
-
-                    value_type = type(value).__name__
-                    field_info[key]["types"].add(value_type)
-
-                    if value is None:
-                        field_info[key]["nullable"] = True
-
-            columns = []
-            for name, info in field_info.items():
-                # Determine data type (most common or mixed)
-                types = info["types"]
-                if len(types) == 1:
-                    data_type = list(types)[0]
-                else:
-                    data_type = f"mixed({', '.join(sorted(types))})"
-
-                column_info = ColumnInfo(
-                    name=name,
-                    data_type=data_type,
-                    nullable=info["nullable"],
-                    is_primary_key=(name == "_id"),
-                )
-                columns.append(column_info)
+        collection = self._get_collection(
+            client, collection_name, schema, SecondaryPreferred()
+        )
+
+        # Sample random documents so inference isn't biased to the oldest ones
+        sample_docs = list(collection.aggregate([{"$sample": {"size": 100}}]))
+
+        if not sample_docs:
+            return []
+
+        # Collect the value types seen for each field, naming them afterwards
+        field_types: DefaultDict[str, Set[type]] = defaultdict(set)
+
+        for doc in sample_docs:
+            for key, value in doc.items():
+                field_types[key].add(type(value))
+
+        columns = []
+        for name, types in field_types.items():
+            # Determine data type (single or mixed)
+            type_names = {t.__name__ for t in types}
+            if len(type_names) == 1:
+                (data_type,) = type_names
+            else:
+                data_type = f"mixed({', '.join(sorted(type_names))})"
+
+            column_info = ColumnInfo(
+                name=name,
+                data_type=data_type,
+                nullable=type(None) in types,
+                is_primary_key=(name == "_id"),
+            )
+            columns.append(column_info)
 
-            return columns
-        finally:
-            if should_close:
-                self.disconnect(client)
+        return columns
 
     def get_primary_key(
         self, collection_name: str, schema: Optional[str] = None
@@ -415,19 +571,29 @@ class MongoDBConnector(BaseConnector):
         table_name: str,
         columns: Optional[List[str]] = None,
         schema: Optional[str] = None,
-        batch_size: int = 1000,
+        batch_size: Optional[int] = None,
+        include_id: bool = False,
     ) -> Iterator[Dict[str, Any]]:
-        """Scan a collection (table)."""
+        """Scan a collection (table).
+
+        When ``columns`` are given, ``_id`` is only returned if it is one of
+        them or ``include_id`` is set, sparing the ObjectId transfer and decode.
+        """
         # Build projection
         projection = None
         if columns:
             projection = {col: 1 for col in columns}
-            projection["_id"] = 1  # Always include _id
+            projection.setdefault("_id", int(include_id))
 
         return self.fetchiter(
             table_name,
-            {"projection": projection, "database": schema},
+            {
+                "projection": projection,
+                "database": schema,
+                "read_preference": SecondaryPreferred(),
+            },
             batch_size=batch_size,
+            object_id_as_str=True,
         )
 
     def update_rows(
@@ -448,29 +614,85 @@ class MongoDBConnector(BaseConnector):
         Returns:
             Number of documents updated.
         """
-        client = self._client or self.connect()
-        should_close = self._client is None
+        client = self._get_client()
 
-        try:
-            collection = self._get_collection(client, table_name, schema)
+        collection = self._get_collection(client, table_name, schema)
 
-            total_updated = 0
+        total_updated = 0
 
-            for i in range(0, len(updates), batch_size):
-                batch = updates[i : i + batch_size]
+        for i in range(0, len(updates), batch_size):
+            batch = updates[i : i + batch_size]
 
-                for filter_doc, update_values in batch:
-                    result = collection.update_one(
-                        filter_doc, {"$set": update_values}, upsert=False
-                    )
-                    total_updated += result.modified_count
+            # One round-trip per batch; unordered lets the server apply
+            # the updates independently.
+            operations = self._update_operations(batch)
+            result = collection.bulk_write(operations, ordered=False)
+            total_updated += result.modified_count
 
-                logger.debug(f"Batch update: {len(batch)} documents")
+            logger.debug("Batch update: %d documents", len(batch))
 
-            return total_updated
-        finally:
-            if should_close:
-                self.disconnect(client)
+        return total_updated
+
+    @staticmethod
+    def _update_operations(
+        batch: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    ) -> List[Any]:
+        """Build the write operations for one batch of updates.
+
+        Updates that match a single ``_id`` and set identical values are
+        merged into one UpdateMany over ``{"_id": {"$in": ids}}``, placed
+        where the first of them was; everything else becomes an UpdateOne.
+        An ``_id`` updated more than once in the batch is never merged, so
+        its updates still apply in input order.
+        """
+        id_counts = Counter()
+        for filter_doc, _ in batch:
+            try:
+                id_counts[filter_doc.get("_id")] += 1
+            except TypeError:
+                pass
+
+        groups: Dict[Any, Tuple[Dict[str, Any], List[Any]]] = {}
+        # UpdateOne operations, or the (update_values, ids) of a merged group
+        entries: List[Any] = []
+
+        for filter_doc, update_values in batch:
+            doc_id = filter_doc.get("_id")
+            if len(filter_doc) == 1 and doc_id is not None:
+                try:
+                    # Types are part of the key so 1 and True aren't merged
+                    key = frozenset(
+                        (name, type(value), value)
+                        for name, value in update_values.items()
+                    )
+                    unique = id_counts[doc_id] == 1
+                except TypeError:
+                    # Unhashable values or an operator filter like {"$gt": ...}
+                    unique = False
+                if unique:
+                    if key not in groups:
+                        groups[key] = (update_values, [])
+                        entries.append(groups[key])
+                    groups[key][1].append(doc_id)
+                    continue
+            entries.append(UpdateOne(filter_doc, {"$set": update_values}, upsert=False))
+
+        operations: List[Any] = []
+        for entry in entries:
+            if not isinstance(entry, tuple):
+                operations.append(entry)
+                continue
+            update_values, ids = entry
+            if len(ids) == 1:
+                operations.append(
+                    UpdateOne({"_id": ids[0]}, {"$set": update_values}, upsert=False)
+                )
+            else:
+                operations.append(
+                    UpdateMany({"_id": {"$in": ids}}, {"$set": update_values})
+                )
+
+        return operations
 
     def bulk_update(
         self,
@@ -479,24 +701,17 @@ class MongoDBConnector(BaseConnector):
         schema: Optional[str] = None,
     ) -> int:
         """Bulk update documents using bulk_write."""
-        from pymongo import UpdateOne
-
-        client = self._client or self.connect()
-        should_close = self._client is None
+        client = self._get_client()
 
-        try:
-            collection = self._get_collection(client, collection_name, schema)
+        collection = self._get_collection(client, collection_name, schema)
 
-            operations = [
-                UpdateOne(filter_doc, {"$set": update_values})
-                for filter_doc, update_values in updates
-            ]
+        operations = [
+            UpdateOne(filter_doc, {"$set": update_values})
+            for filter_doc, update_values in updates
+        ]
 
-            result = collection.bulk_write(operations)
-            return result.modified_count
-        finally:
-            if should_close:
-                self.disconnect(client)
+        result = collection.bulk_write(operations)
+        return result.modified_count
 
     def test_connection(self) -> bool:
         """Test if the MongoDB connection is working."""
@@ -539,25 +754,55 @@ class MongoDBConnector(BaseConnector):
             collection_name: Name of the collection.
             keys: List of (field, direction) tuples.
             schema: Optional database name.
-            **kwargs: Additional index options.
+            **kwargs: Additional index options. ``background`` defaults to
+                True so pre-4.2 servers don't block the collection during the
+                build; newer servers ignore it.
 
         Returns:
             Index name.
         """
-        client = self._client or self.connect()
-        should_close = self._client is None
+        kwargs.setdefault("background", True)
+        client = self._get_client()
 
-        try:
-            collection = self._get_collection(client, collection_name, schema)
-            result = collection.create_index(keys, **kwargs)
-            return result
-        finally:
-            if should_close:
-                self.disconnect(client)
+        collection = self._get_collection(client, collection_name, schema)
+        result = collection.create_index(keys, **kwargs)
+        return result
+
+    def create_indexes(
+        self,
+        collection_name: str,
+        indexes: List[List[Tuple[str, int]]],
+        schema: Optional[str] = None,
+        **kwargs,
+    ) -> List[str]:
+        """Create several indexes on a collection in one command.
+
+        Args:
+            collection_name: Name of the collection.
+            indexes: One list of (field, direction) tuples per index.
+            schema: Optional database name.
+            **kwargs: Index options applied to every index, with the same
+                ``background`` default as create_index().
+
+        Returns:
+            Index names, in the order given.
+        """
+        kwargs.setdefault("background", True)
+        client = self._get_client()
+
+        collection = self._get_collection(client, collection_name, schema)
+        return collection.create_indexes(
+            [IndexModel(keys, **kwargs) for keys in indexes]
+        )
 
     def close(self) -> None:
         """Close the connector and release all resources."""
         if self._client:
             self._client.close()
             self._client = None
-        super().close()
+        self._collection_cache.clear()
+        self._closed = True
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the shared client when leaving the context."""
+        self.close()
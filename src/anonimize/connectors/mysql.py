@@ -5,16 +5,26 @@ support for table scanning and connection pooling.
 """
 
 import logging
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+import queue
+import threading
+import time
+from collections import deque
+from functools import partial
+from itertools import groupby, islice
+from operator import itemgetter
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
     import pymysql
-    from pymysql.cursors import DictCursor, SSCursor
+    from pymysql.constants import CLIENT
+    from pymysql.cursors import Cursor, DictCursor, SSCursor
 
     PYMYSQL_AVAILABLE = True
 except ImportError:
     PYMYSQL_AVAILABLE = False
     pymysql = None
+    CLIENT = None
+    Cursor = None
     DictCursor = None
     SSCursor = None
 
@@ -22,12 +32,44 @@ from anonimize.connectors.base import (
     BaseConnector,
     ColumnInfo,
     ConnectionConfig,
+    ConnectionPool,
     QueryResult,
     TableInfo,
+    cached_schema,
+    row_caster,
 )
 
 logger = logging.getLogger(__name__)
 
+# Marks the end of a prefetched result
+_DONE = object()
+
+# Backticks inside an identifier are escaped by doubling them
+_IDENTIFIER_ESCAPES = str.maketrans({"`": "``"})
+
+
+def _quote(identifier: str) -> str:
+    """Quote a MySQL identifier with backticks."""
+    return "`" + identifier.translate(_IDENTIFIER_ESCAPES) + "`"
+
+
+def _join_statements(statements: Iterable[str], max_bytes: int) -> Iterator[str]:
+    """Join statements into multi-statement queries of at most ``max_bytes``.
+
+    A single statement longer than ``max_bytes`` is sent on its own.
+    """
+    chunk: List[str] = []
+    size = 0
+    for statement in statements:
+        length = len(statement.encode()) + 2
+        if chunk and size + length > max_bytes:
+            yield ";\n".join(chunk)
+            chunk, size = [], 0
+        chunk.append(statement)
+        size += length
+    if chunk:
+        yield ";\n".join(chunk)
+
 
 class MySQLConnector(BaseConnector):
     """MySQL database connector.
@@ -54,6 +96,25 @@ class MySQLConnector(BaseConnector):
     DB_TYPE = "mysql"
     DEFAULT_PORT = 3306
 
+    # Estimated row count above which scan_table() streams by default
+    STREAMING_ROW_THRESHOLD = 10_000
+
+    # Batches fetchiter() reads ahead of the consumer when streaming
+    PREFETCH_BATCHES = 2
+
+    # Largest multi-statement query update_rows() sends; well under the
+    # 4 MiB max_allowed_packet default of MySQL 5.7
+    MAX_STATEMENT_BYTES = 1024 * 1024
+
+    # Shared by get_columns() and get_tables(); read by _column_info()
+    _COLUMN_FIELDS = """
+                COLUMN_NAME,
+                DATA_TYPE,
+                IS_NULLABLE,
+                COLUMN_DEFAULT,
+                CHARACTER_MAXIMUM_LENGTH,
+                COLUMN_KEY"""
+
     # MySQL isolation levels
     ISOLATION_LEVELS = {
         "read_uncommitted": "READ UNCOMMITTED",
@@ -78,12 +139,26 @@ class MySQLConnector(BaseConnector):
             )
 
         super().__init__(config)
+        # Multi-statement connections, kept apart so only update_rows() can
+        # send stacked queries
+        self._multi_pool: Optional[ConnectionPool] = None
 
         if config.port is None:
             config.port = self.DEFAULT_PORT
 
-    def connect(self) -> Any:
-        """Create a raw MySQL connection."""
+    def connect(
+        self, cursorclass: Optional[type] = None, multi_statements: bool = False
+    ) -> Any:
+        """Create a raw MySQL connection.
+
+        Cursors return tuples unless ``cursorclass`` says otherwise; execute()
+        asks for a DictCursor itself. ``multi_statements`` lets one query
+        hold several statements, as update_rows() needs.
+        """
+        extra = dict(self.config.extra)
+        client_flag = extra.pop("client_flag", 0)
+        if multi_statements:
+            client_flag |= CLIENT.MULTI_STATEMENTS
         conn = pymysql.connect(
             host=self.config.host,
             port=self.config.port,
@@ -91,10 +166,11 @@ class MySQLConnector(BaseConnector):
             user=self.config.user,
             password=self.config.password,
             charset="utf8mb4",
-            cursorclass=DictCursor,
+            cursorclass=cursorclass or Cursor,
             connect_timeout=self.config.connect_timeout,
             autocommit=False,
-            **self.config.extra,
+            client_flag=client_flag,
+            **extra,
         )
         return conn
 
@@ -103,6 +179,40 @@ class MySQLConnector(BaseConnector):
         if connection:
             connection.close()
 
+    def initialize_pool(self) -> None:
+        """Initialize the connection pool."""
+        if self._pool is None:
+            self._pool = ConnectionPool(self.connect, self.config)
+            logger.info("Initialized MySQL connection pool")
+
+    def _acquire(self, pool: Optional[ConnectionPool] = None) -> Any:
+        """Check out a pooled connection, reconnecting it if it went stale."""
+        if pool is None:
+            self.initialize_pool()
+            pool = self._pool
+        connection = pool.acquire()
+        try:
+            connection.ping(reconnect=True)
+        except Exception:
+            pool.release(connection)
+            raise
+        return connection
+
+    def _release(self, connection: Any) -> None:
+        """Roll back and return a connection checked out by _acquire().
+
+        Connections don't autocommit, so without this the next caller would
+        inherit the open transaction: its REPEATABLE READ snapshot and any
+        row locks. Uncommitted writes are discarded, as they were when each
+        call closed its own connection.
+        """
+        try:
+            connection.rollback()
+        except Exception as e:
+            # A dead connection is reconnected by the next _acquire()
+            logger.debug("Rollback before release failed: %s", e)
+        self._pool.release(connection)
+
     def execute(
         self,
         query: str,
@@ -110,20 +220,15 @@ class MySQLConnector(BaseConnector):
         connection: Optional[Any] = None,
     ) -> QueryResult:
         """Execute a query."""
-        import time
-
-        start_time = time.time()
+        start_time = time.perf_counter()
         should_close = False
 
         if connection is None:
-            if self._pool:
-                connection = self._pool.acquire()
-            else:
-                connection = self.connect()
+            connection = self._acquire()
             should_close = True
 
         try:
-            with connection.cursor() as cursor:
+            with connection.cursor(DictCursor) as cursor:
                 if parameters:
                     cursor.execute(query, parameters)
                 else:
@@ -137,7 +242,7 @@ class MySQLConnector(BaseConnector):
                     columns = [desc[0] for desc in cursor.description]
                     rows = cursor.fetchall()
 
-                execution_time = (time.time() - start_time) * 1000
+                execution_time = (time.perf_counter() - start_time) * 1000
 
                 return QueryResult(
                     rows=rows,
@@ -148,10 +253,23 @@ class MySQLConnector(BaseConnector):
                 )
         finally:
             if should_close:
-                if self._pool:
-                    self._pool.release(connection)
-                else:
-                    self.disconnect(connection)
+                self._release(connection)
+
+    def _fetchall(
+        self, query: str, parameters: Optional[tuple] = None
+    ) -> Tuple[tuple, ...]:
+        """Run a query and return its rows as tuples.
+
+        For the connector's own queries, which know their column order and
+        don't need execute()'s per-row dicts.
+        """
+        connection = self._acquire()
+        try:
+            with connection.cursor(Cursor) as cursor:
+                cursor.execute(query, parameters)
+                return cursor.fetchall()
+        finally:
+            self._release(connection)
 
     def executemany(
         self,
@@ -159,24 +277,30 @@ class MySQLConnector(BaseConnector):
         parameters_list: List[Dict[str, Any]],
         connection: Optional[Any] = None,
     ) -> QueryResult:
-        """Execute a query multiple times."""
-        import time
+        """Execute a query multiple times.
+
+        PyMySQL already rewrites ``INSERT``/``REPLACE ... VALUES`` into
+        multi-row statements of up to ``cursor.max_stmt_length`` bytes; other
+        statements run once per parameter set.
+        """
+        start_time = time.perf_counter()
+
+        if not parameters_list:
+            return QueryResult(
+                execution_time_ms=(time.perf_counter() - start_time) * 1000
+            )
 
-        start_time = time.time()
         should_close = False
 
         if connection is None:
-            if self._pool:
-                connection = self._pool.acquire()
-            else:
-                connection = self.connect()
+            connection = self._acquire()
             should_close = True
 
         try:
             with connection.cursor() as cursor:
                 cursor.executemany(query, parameters_list)
 
-                execution_time = (time.time() - start_time) * 1000
+                execution_time = (time.perf_counter() - start_time) * 1000
 
                 return QueryResult(
                     rows=[],
@@ -187,10 +311,7 @@ class MySQLConnector(BaseConnector):
                 )
         finally:
             if should_close:
-                if self._pool:
-                    self._pool.release(connection)
-                else:
-                    self.disconnect(connection)
+                self._release(connection)
 
     def fetchiter(
         self,
@@ -198,127 +319,233 @@ class MySQLConnector(BaseConnector):
         parameters: Optional[Dict[str, Any]] = None,
         batch_size: int = 1000,
         connection: Optional[Any] = None,
+        streaming: bool = True,
+        prefetch: bool = True,
     ) -> Iterator[Dict[str, Any]]:
-        """Fetch results as an iterator using server-side cursor."""
-        # For MySQL, we create a new connection with SSCursor
-        conn = pymysql.connect(
-            host=self.config.host,
-            port=self.config.port,
-            database=self.config.database,
-            user=self.config.user,
-            password=self.config.password,
-            charset="utf8mb4",
-            cursorclass=SSCursor,
-            connect_timeout=self.config.connect_timeout,
-        )
+        """Fetch results as an iterator, ``batch_size`` rows at a time.
 
-        try:
-            with conn.cursor() as cursor:
-                if parameters:
-                    cursor.execute(query, parameters)
-                else:
-                    cursor.execute(query)
+        With ``streaming`` the rows stay on the server (SSCursor) until read;
+        without it the result is buffered client-side, which is much cheaper
+        for small result sets. Streamed results are read by a background
+        thread up to PREFETCH_BATCHES batches ahead, so network reads overlap
+        with the consumer's work, unless ``prefetch`` is False.
+        """
+        should_close = connection is None
+        if should_close:
+            connection = self._acquire()
 
-                columns = (
-                    [desc[0] for desc in cursor.description]
-                    if cursor.description
-                    else []
+        try:
+            if streaming and prefetch:
+                batches = self._prefetch(connection, query, parameters, batch_size)
+            else:
+                cursorclass = SSCursor if streaming else Cursor
+                batches = self._fetch_batches(
+                    connection, cursorclass, query, parameters, batch_size
                 )
+            cast = row_caster(tuple(next(batches, ())))
+            for rows in batches:
+                for row in rows:
+                    yield cast(row)
+        finally:
+            batches.close()
+            if should_close:
+                self._release(connection)
+
+    @staticmethod
+    def _fetch_batches(
+        connection: Any,
+        cursorclass: type,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        batch_size: int,
+    ) -> Iterator[Any]:
+        """Yield the result's column names, then its rows in batches."""
+        with connection.cursor(cursorclass) as cursor:
+            if parameters:
+                cursor.execute(query, parameters)
+            else:
+                cursor.execute(query)
+
+            yield [desc[0] for desc in cursor.description or ()]
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
 
-                for row in cursor:
-                    yield dict(zip(columns, row))
+    def _prefetch(
+        self,
+        connection: Any,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        batch_size: int,
+    ) -> Iterator[Any]:
+        """Run _fetch_batches() on a streaming cursor in a reader thread.
+
+        The thread owns the cursor until it finishes; closing this generator
+        stops it and waits for it, so the connection is idle afterwards.
+        """
+        batches: queue.Queue[Any] = queue.Queue(maxsize=self.PREFETCH_BATCHES)
+        stop = threading.Event()
+
+        def put(item: Any) -> None:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def read() -> None:
+            try:
+                for item in self._fetch_batches(
+                    connection, SSCursor, query, parameters, batch_size
+                ):
+                    put(item)
+                    if stop.is_set():
+                        break
+            except BaseException as e:
+                put(e)
+            put(_DONE)
+
+        reader = threading.Thread(target=read, daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
         finally:
-            conn.close()
+            stop.set()
+            reader.join()
 
+    @cached_schema
     def get_tables(self, schema: Optional[str] = None) -> List[TableInfo]:
-        """Get list of tables."""
-        database = schema or self.config.database
+        """Get list of tables with their columns and primary keys.
 
-        query = """
-            SELECT 
-                TABLE_NAME as name,
-                TABLE_SCHEMA as schema_name,
-                TABLE_ROWS as row_count,
-                DATA_LENGTH + INDEX_LENGTH as size_bytes
+        The whole schema is read with three catalog queries rather than two
+        per table.
+        """
+        schema_clause, params = self._schema_filter(schema)
+
+        query = f"""
+            SELECT
+                TABLE_NAME,
+                TABLE_SCHEMA,
+                TABLE_ROWS,
+                DATA_LENGTH + INDEX_LENGTH
             FROM information_schema.TABLES
-            WHERE TABLE_SCHEMA = %s
+            WHERE {schema_clause}
             AND TABLE_TYPE = 'BASE TABLE'
-            ORDER BY TABLE_NAME
+            ORDER BY TABLE_SCHEMA, TABLE_NAME
         """
 
-        result = self.execute(query, {"database": database})
-
         tables = []
-        for row in result.rows:
+        for name, schema_name, row_count, size_bytes in self._fetchall(query, params):
             table_info = TableInfo(
-                name=row["name"],
-                schema=row["schema_name"],
-                row_count=row["row_count"],
-                size_bytes=row["size_bytes"],
+                name=name,
+                schema=schema_name,
+                row_count=row_count,
+                size_bytes=size_bytes,
             )
             tables.append(table_info)
 
-        # Get column info for each table
+        # Columns and primary keys for every table at once, grouped by table
+        query = f"""
+            SELECT {self._COLUMN_FIELDS}, TABLE_NAME
+            FROM information_schema.COLUMNS
+            WHERE {schema_clause}
+            ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+        """
+        rows = self._fetchall(query, params)
+        columns = {
+            name: [self._column_info(row) for row in group]
+            for name, group in groupby(rows, key=itemgetter(-1))
+        }
+
+        query = f"""
+            SELECT TABLE_NAME, COLUMN_NAME
+            FROM information_schema.KEY_COLUMN_USAGE
+            WHERE {schema_clause}
+            AND CONSTRAINT_NAME = 'PRIMARY'
+            ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+        """
+        rows = self._fetchall(query, params)
+        primary_keys = {
+            name: [row[1] for row in group]
+            for name, group in groupby(rows, key=itemgetter(0))
+        }
+
         for table in tables:
-            table.columns = self.get_columns(table.name, table.schema)
-            table.primary_key = self.get_primary_key(table.name, table.schema)
+            table.columns = columns.get(table.name, [])
+            table.primary_key = primary_keys.get(table.name, [])
 
         return tables
 
+    @staticmethod
+    def _schema_filter(schema: Optional[str]) -> Tuple[str, Optional[tuple]]:
+        """Return a TABLE_SCHEMA condition and its parameters.
+
+        Without an explicit schema the session's DATABASE() is used, which
+        MySQL folds into a constant instead of binding a parameter.
+        """
+        if not schema:
+            return "TABLE_SCHEMA = DATABASE()", None
+        return "TABLE_SCHEMA = %s", (schema,)
+
+    @staticmethod
+    def _column_info(row: tuple) -> ColumnInfo:
+        """Build a ColumnInfo from a row starting with _COLUMN_FIELDS."""
+        name, data_type, is_nullable, default, max_length, column_key = row[:6]
+        return ColumnInfo(
+            name=name,
+            data_type=data_type,
+            nullable=is_nullable == "YES",
+            default=default,
+            max_length=max_length,
+            is_primary_key=column_key == "PRI",
+            is_unique=column_key in ("PRI", "UNI"),
+        )
+
+    @cached_schema
     def get_columns(
         self, table_name: str, schema: Optional[str] = None
     ) -> List[ColumnInfo]:
         """Get column information for a table."""
-        database = schema or self.config.database
+        schema_clause, params = self._schema_filter(schema)
 
-        query = """
-            SELECT 
-                COLUMN_NAME as name,
-                DATA_TYPE as data_type,
-                IS_NULLABLE as is_nullable,
-                COLUMN_DEFAULT as default_value,
-                CHARACTER_MAXIMUM_LENGTH as max_length,
-                COLUMN_KEY as column_key,
-                EXTRA as extra
+        query = f"""
+            SELECT {self._COLUMN_FIELDS}
             FROM information_schema.COLUMNS
-            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-            ORDER BY ORDINAL_POSITION
+            WHERE {schema_clause} AND TABLE_NAME = %s
+            ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
         """
 
-        result = self.execute(query, {"database": database, "table": table_name})
-
-        columns = []
-        for row in result.rows:
-            column_info = ColumnInfo(
-                name=row["name"],
-                data_type=row["data_type"],
-                nullable=row["is_nullable"] == "YES",
-                default=row["default_value"],
-                max_length=row["max_length"],
-                is_primary_key=row["column_key"] == "PRI",
-                is_unique=row["column_key"] in ("PRI", "UNI"),
-            )
-            columns.append(column_info)
-
-        return columns
+        rows = self._fetchall(query, (*(params or ()), table_name))
+        return [self._column_info(row) for row in rows]
 
+    @cached_schema
     def get_primary_key(
         self, table_name: str, schema: Optional[str] = None
     ) -> List[str]:
         """Get primary key columns for a table."""
-        database = schema or self.config.database
+        schema_clause, params = self._schema_filter(schema)
 
-        query = """
-            SELECT COLUMN_NAME as name
+        query = f"""
+            SELECT COLUMN_NAME
             FROM information_schema.KEY_COLUMN_USAGE
-            WHERE TABLE_SCHEMA = %s 
+            WHERE {schema_clause}
             AND TABLE_NAME = %s
             AND CONSTRAINT_NAME = 'PRIMARY'
-            ORDER BY ORDINAL_POSITION
+            ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
         """
 
-        result = self.execute(query, {"database": database, "table": table_name})
-        return [row["name"] for row in result.rows]
+        rows = self._fetchall(query, (*(params or ()), table_name))
+        return [row[0] for row in rows]
 
     def scan_table(
         self,
@@ -326,19 +553,89 @@ class MySQLConnector(BaseConnector):
         columns: Optional[List[str]] = None,
         schema: Optional[str] = None,
         batch_size: int = 1000,
+        streaming: Optional[bool] = None,
     ) -> Iterator[Dict[str, Any]]:
-        """Scan a table with server-side cursor."""
+        """Scan a table, streaming it if it is large.
+
+        Unless ``streaming`` is given, a server-side cursor is used only when
+        the table's estimated row count exceeds STREAMING_ROW_THRESHOLD or is
+        unknown.
+        """
         database = schema or self.config.database
+        query = self._statement(
+            ("scan", database, table_name, tuple(columns or ())),
+            lambda: (
+                "SELECT "
+                + (", ".join(map(_quote, columns)) if columns else "*")
+                + f" FROM {_quote(database)}.{_quote(table_name)}"
+            ),
+        )
 
-        # Build column list
-        if columns:
-            column_str = ", ".join(f"`{col}`" for col in columns)
-        else:
-            column_str = "*"
+        if streaming is None:
+            row_count = self._estimated_rows(table_name, database)
+            streaming = row_count is None or row_count > self.STREAMING_ROW_THRESHOLD
 
-        query = f"SELECT {column_str} FROM `{database}`.`{table_name}`"
+        return self.fetchiter(query, batch_size=batch_size, streaming=streaming)
 
-        return self.fetchiter(query, batch_size=batch_size)
+    def scan_tables(
+        self,
+        table_names: List[str],
+        schema: Optional[str] = None,
+        batch_size: int = 1000,
+        max_concurrent: Optional[int] = None,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Scan several tables at once, yielding (table name, row) pairs.
+
+        Up to ``max_concurrent`` tables (default: the pool size) stream at a
+        time, each on its own pooled connection with a prefetching reader
+        thread, so their network reads overlap. Tables take turns yielding
+        ``batch_size`` rows; rows within a table keep their order.
+        """
+        limit = max_concurrent or self.config.pool_size
+        pending = iter(table_names)
+        active: Deque[Tuple[str, Iterator[Dict[str, Any]]]] = deque()
+
+        def start() -> None:
+            for name in islice(pending, limit - len(active)):
+                rows = self.scan_table(
+                    name, schema=schema, batch_size=batch_size, streaming=True
+                )
+                active.append((name, rows))
+
+        start()
+        try:
+            while active:
+                name, rows = active.popleft()
+                batch = list(islice(rows, batch_size))
+                for row in batch:
+                    yield name, row
+                if len(batch) == batch_size:
+                    active.append((name, rows))
+                else:
+                    start()
+        finally:
+            for _, rows in active:
+                rows.close()
+
+    def _estimated_rows(self, table_name: str, database: str) -> Optional[int]:
+        """Return information_schema's row estimate, from the cache if fresh."""
+        keys = [("get_tables", database)]
+        if database == self.config.database:
+            keys.append(("get_tables", None))
+        for key in keys:
+            for table in self._cached_schema(key) or ():
+                if table.name == table_name:
+                    return table.row_count
+
+        rows = self._fetchall(
+            """
+            SELECT TABLE_ROWS
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+            """,
+            (database, table_name),
+        )
+        return rows[0][0] if rows else None
 
     def update_rows(
         self,
@@ -347,50 +644,86 @@ class MySQLConnector(BaseConnector):
         schema: Optional[str] = None,
         batch_size: int = 1000,
     ) -> int:
-        """Update multiple rows efficiently."""
+        """Update multiple rows efficiently.
+
+        Updates with the same SET and WHERE columns share one statement.
+        Each batch is bound client-side and sent as multi-statement queries
+        of up to MAX_STATEMENT_BYTES, then committed; PyMySQL's executemany()
+        would instead pay a round-trip per UPDATE.
+        """
         database = schema or self.config.database
         total_updated = 0
 
-        if self._pool is None:
-            self.initialize_pool()
-
-        connection = self._pool.acquire()
+        if self._multi_pool is None:
+            self._multi_pool = ConnectionPool(
+                partial(self.connect, multi_statements=True), self.config
+            )
+        connection = self._acquire(self._multi_pool)
 
         try:
             with connection.cursor() as cursor:
-                for i in range(0, len(updates), batch_size):
-                    batch = updates[i : i + batch_size]
-
-                    for where_conditions, set_values in batch:
-                        # Build UPDATE statement
-                        set_clause = ", ".join(f"`{k}` = %s" for k in set_values.keys())
-                        where_clause = " AND ".join(
-                            f"`{k}` = %s" for k in where_conditions.keys()
-                        )
-
-                        query = f"UPDATE `{database}`.`{table_name}` SET {set_clause} WHERE {where_clause}"
-                        params = list(set_values.values()) + list(
-                            where_conditions.values()
-                        )
-
-                        cursor.execute(query, params)
+                for set_cols, where_cols, params in self._update_batches(
+                    updates, batch_size
+                ):
+                    query = self._statement(
+                        ("update", database, table_name, set_cols, where_cols),
+                        lambda: (
+                            f"UPDATE {_quote(database)}.{_quote(table_name)} SET "
+                            + ", ".join(f"{_quote(k)} = %s" for k in set_cols)
+                            + " WHERE "
+                            + " AND ".join(f"{_quote(k)} = %s" for k in where_cols)
+                        ),
+                    )
+                    for statements in _join_statements(
+                        (cursor.mogrify(query, row) for row in params),
+                        self.MAX_STATEMENT_BYTES,
+                    ):
+                        cursor.execute(statements)
                         total_updated += cursor.rowcount
+                        while cursor.nextset():
+                            total_updated += cursor.rowcount
 
                     connection.commit()
-                    logger.debug(f"Batch update committed: {len(batch)} updates")
+                    logger.debug("Batch update committed: %d updates", len(params))
 
             return total_updated
+        except Exception:
+            # Otherwise the next update_rows() would commit the statements of
+            # the failed batch that already ran
+            try:
+                connection.rollback()
+            except Exception as e:
+                logger.debug("Rollback of failed batch failed: %s", e)
+            raise
         finally:
-            self._pool.release(connection)
+            self._multi_pool.release(connection)
 
     def test_connection(self) -> bool:
-        """Test if the database connection is working."""
+        """Test if the database connection is working.
+
+        Checking out a connection already pings the server (COM_PING), so no
+        query is needed.
+        """
         try:
-            result = self.execute("SELECT 1 as test")
-            return result.row_count == 1 and result.rows[0].get("test") == 1
+            connection = self._acquire()
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
             return False
+        self._pool.release(connection)
+        return True
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        for pool in (self._pool, self._multi_pool):
+            if pool is not None:
+                pool.close_all(self.disconnect)
+        self._pool = None
+        self._multi_pool = None
+        self._closed = True
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the pools when leaving the context."""
+        self.close()
 
     def begin_transaction(self, connection: Any) -> None:
         """Begin a transaction."""
@@ -1,8 +1,112 @@
 """PostgreSQL database connector."""
 
-from typing import Any, Dict, Iterator, List, Optional
+import io
+import json
+import re
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from anonimize.connectors.base import DatabaseConnector
+from anonimize.connectors.base import DatabaseConnector, row_caster
+
+# Statements execute_values() can expand into multi-row VALUES lists
+_INSERT_VALUES = re.compile(r"^\s*INSERT\b.*\bVALUES\s*%s", re.IGNORECASE | re.DOTALL)
+
+# Bytes handed to libpq per read while streaming COPY data
+_COPY_CHUNK_SIZE = 64 * 1024
+
+# pyarrow type factory and arguments for common PostgreSQL type OIDs
+_ARROW_TYPES = {
+    16: ("bool_",),
+    17: ("binary",),
+    19: ("string",),
+    20: ("int64",),
+    21: ("int16",),
+    23: ("int32",),
+    25: ("string",),
+    700: ("float32",),
+    701: ("float64",),
+    1042: ("string",),
+    1043: ("string",),
+    1082: ("date32",),
+    1083: ("time64", "us"),
+    1114: ("timestamp", "us"),
+    1184: ("timestamp", "us", "UTC"),
+    1186: ("duration", "us"),
+    2950: ("string",),
+}
+
+# Conversions for driver values pyarrow can't take as they are
+_ARROW_CONVERTERS = {17: bytes, 2950: str}
+
+_NUMERIC_OID = 1700
+_JSON_OIDS = (114, 3802)
+
+# Characters that must be backslash-escaped in COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _arrow_column(pa: Any, desc: Any) -> Tuple[Any, Optional[Callable[[Any], Any]]]:
+    """Pick the Arrow type for a cursor column, and a value converter if needed.
+
+    Every column gets a fixed type, so all batches of a read share a schema.
+    """
+    type_code, precision, scale = desc[1], desc[4], desc[5]
+    if type_code in _ARROW_TYPES:
+        factory, *args = _ARROW_TYPES[type_code]
+        return getattr(pa, factory)(*args), _ARROW_CONVERTERS.get(type_code)
+    if type_code == _NUMERIC_OID and precision is not None:
+        factory = pa.decimal128 if precision <= 38 else pa.decimal256
+        return factory(precision, scale), None
+    if type_code in _JSON_OIDS:
+        return pa.string(), json.dumps
+    # Unconstrained NUMERIC has no fixed width; it and any other type are
+    # read as text
+    return pa.string(), str
+
+
+def _quote_ident(name: str) -> str:
+    """Quote a PostgreSQL identifier, as copy_from() did for column names."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class _IterStream(io.RawIOBase):
+    """Read-only file object over an iterator of byte strings."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        """Return True; the stream only supports reading."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Fill ``buffer`` from the iterator; return 0 once it is exhausted."""
+        size = 0
+        while size < len(buffer):
+            if not self._pending:
+                self._pending = next(self._chunks, b"")
+                if not self._pending:
+                    break
+            n = min(len(buffer) - size, len(self._pending))
+            buffer[size : size + n] = self._pending[:n]
+            self._pending = self._pending[n:]
+            size += n
+        return size
+
+
+class StatementPipeline:
+    """Statements queued by :meth:`PostgreSQLConnector.pipeline`."""
+
+    def __init__(self, cursor: Any):
+        """Initialize the pipeline on the cursor used to bind parameters."""
+        self._cursor = cursor
+        self.statements: List[bytes] = []
+
+    def execute(self, query: str, params: Optional[tuple] = None) -> None:
+        """Queue a statement; parameters are bound client-side right away."""
+        self.statements.append(self._cursor.mogrify(query, params or ()))
 
 
 class PostgreSQLConnector(DatabaseConnector):
@@ -68,39 +172,132 @@ class PostgreSQLConnector(DatabaseConnector):
             )
         return columns
 
+    @contextmanager
+    def _select_all(self, table: str, batch_size: int) -> Iterator[Any]:
+        """Open a server-side cursor on ``SELECT * FROM table``.
+
+        Rows stay on the server until fetched, so reading a large table holds
+        only one batch in memory. The cursor is held across commits so the
+        caller can write between batches. Its description is only known
+        after its first fetch.
+        """
+        cursor = self._connection.cursor(name=f"scan_{uuid.uuid4().hex}", withhold=True)
+        cursor.itersize = batch_size
+        try:
+            cursor.execute(f"SELECT * FROM {table}")
+            yield cursor
+        finally:
+            cursor.close()
+
     def read_table(self, table: str, batch_size: int = 1000) -> Iterator[List[Dict]]:
         """Read table in batches."""
-        cursor = self._connection.cursor()
-        cursor.execute(f"SELECT * FROM {table}")
+        with self._select_all(table, batch_size) as cursor:
+            rows = cursor.fetchmany(batch_size)
+            cast = row_caster(tuple(desc[0] for desc in cursor.description or ()))
+
+            while rows:
+                yield [cast(row) for row in rows]
+                rows = cursor.fetchmany(batch_size)
 
-        columns = [desc[0] for desc in cursor.description]
+    def read_table_arrow(self, table: str, batch_size: int = 10_000) -> Iterator[Any]:
+        """Read table as pyarrow RecordBatches of up to ``batch_size`` rows.
 
-        while True:
+        Rows are transposed straight from the cursor's tuples into columns,
+        so no per-row dicts are built. Common PostgreSQL types map to fixed
+        Arrow types and declared NUMERIC to a decimal of its precision and
+        scale; JSON and other types are read as text. Every batch has the
+        same schema. Requires pyarrow.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("pyarrow required. Install with: pip install pyarrow")
+
+        with self._select_all(table, batch_size) as cursor:
             rows = cursor.fetchmany(batch_size)
-            if not rows:
-                break
-            yield [dict(zip(columns, row)) for row in rows]
+            description = cursor.description or ()
+            names = [desc[0] for desc in description]
+            columns = [_arrow_column(pa, desc) for desc in description]
+            types = [arrow_type for arrow_type, _ in columns]
+            converters = [convert for _, convert in columns]
+
+            while rows:
+                arrays = []
+                for i, column in enumerate(zip(*rows)):
+                    convert = converters[i]
+                    if convert is not None:
+                        column = [None if v is None else convert(v) for v in column]
+                    arrays.append(pa.array(column, type=types[i]))
+                yield pa.RecordBatch.from_arrays(arrays, names=names)
+                rows = cursor.fetchmany(batch_size)
 
     def write_table(self, table: str, data: List[Dict]) -> int:
         """Write data using COPY for efficiency."""
         if not data:
             return 0
 
-        import csv
-        import io
-
         columns = list(data[0].keys())
-        buffer = io.StringIO()
-        writer = csv.DictWriter(buffer, fieldnames=columns, delimiter="\t")
-        writer.writerows(data)
-        buffer.seek(0)
+        lines = (
+            "\t".join(
+                "" if row.get(c) is None else str(row[c]).translate(_COPY_ESCAPES)
+                for c in columns
+            ).encode()
+            + b"\n"
+            for row in data
+        )
+        sql = (
+            f"COPY {table} ({', '.join(map(_quote_ident, columns))}) "
+            "FROM STDIN WITH (FORMAT text, NULL '')"
+        )
 
+        # Rows are encoded as libpq reads them, so memory stays flat
         cursor = self._connection.cursor()
-        cursor.copy_from(buffer, table, columns=columns, null="")
+        cursor.copy_expert(sql, _IterStream(lines), size=_COPY_CHUNK_SIZE)
         self._connection.commit()
 
         return len(data)
 
+    def execute_many(
+        self, query: str, params_list: List[tuple], page_size: int = 500
+    ) -> None:
+        """Run a statement for many parameter sets, ``page_size`` per round-trip.
+
+        ``INSERT ... VALUES %s`` statements go through execute_values(), which
+        sends each page as one multi-row INSERT; anything else uses
+        execute_batch(). Everything is committed once at the end. No row count
+        is returned: psycopg2 only reports it for the last page.
+        """
+        from psycopg2.extras import execute_batch, execute_values
+
+        cursor = self._connection.cursor()
+        if _INSERT_VALUES.match(query):
+            execute_values(cursor, query, params_list, page_size=page_size)
+        else:
+            execute_batch(cursor, query, params_list, page_size=page_size)
+        self._connection.commit()
+
+    @contextmanager
+    def pipeline(self) -> Iterator[StatementPipeline]:
+        """Queue statements and send them in a single round-trip.
+
+        Statements passed to the yielded pipeline's ``execute()`` are sent
+        together when the block exits, then committed once. Nothing runs
+        until then, so no statement can read another's results; do lookups
+        that later statements depend on before entering the block. If the
+        block raises, the queued statements are discarded.
+
+        Example:
+            >>> with conn.pipeline() as p:
+            ...     p.execute("INSERT INTO audit (id) VALUES (%s)", (1,))
+            ...     p.execute("DELETE FROM staging WHERE id = %s", (1,))
+        """
+        cursor = self._connection.cursor()
+        pipeline = StatementPipeline(cursor)
+        yield pipeline
+        if pipeline.statements:
+            cursor.execute(b";\n".join(pipeline.statements))
+            self._connection.commit()
+
     def execute(self, query: str, params: Optional[tuple] = None) -> Any:
         """Execute raw SQL."""
         cursor = self._connection.cursor()
@@ -4,13 +4,21 @@ This module provides a production-grade PostgreSQL connector with
 full support for table scanning, connection pooling, and transactions.
 """
 
+import hashlib
+import io
 import logging
+import re
+import struct
 import threading
-from typing import Any, Dict, Iterator, List, Optional, Tuple
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 try:
     import psycopg2
-    from psycopg2 import extras, sql
+    from psycopg2 import errors, extensions, extras, sql
     from psycopg2.pool import ThreadedConnectionPool
 
     PSYCOPG2_AVAILABLE = True
@@ -18,6 +26,8 @@ except ImportError:
     PSYCOPG2_AVAILABLE = False
     psycopg2 = None
     sql = None
+    errors = None
+    extensions = None
     extras = None
     ThreadedConnectionPool = None
 
@@ -27,10 +37,134 @@ from anonimize.connectors.base import (
     ConnectionConfig,
     QueryResult,
     TableInfo,
+    cached_schema,
+    row_caster,
 )
 
 logger = logging.getLogger(__name__)
 
+# psycopg2 placeholders: %s, %(name)s and the %% escape
+_PLACEHOLDER = re.compile(r"%(?:\((\w+)\))?s|%%")
+
+# Statements PREPARE accepts
+_PREPARABLE = re.compile(
+    r"^\s*(SELECT|INSERT|UPDATE|DELETE|VALUES|WITH)\b", re.IGNORECASE
+)
+
+_INT2 = struct.Struct(">h")
+_INT4 = struct.Struct(">i")
+_INT8 = struct.Struct(">q")
+
+# Binary COPY framing: signature, flags and header extension length; trailer
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + b"\x00" * 8
+_COPY_TRAILER = b"\xff\xff"
+_COPY_NULL = _INT4.pack(-1)
+
+_MICROSECOND = timedelta(microseconds=1)
+
+# PostgreSQL counts dates and timestamps from 2000-01-01
+_PG_EPOCH = datetime(2000, 1, 1)
+_PG_EPOCH_UTC = _PG_EPOCH.replace(tzinfo=timezone.utc)
+_PG_EPOCH_ORDINAL = _PG_EPOCH.toordinal()
+
+# Binary encoders by type name, as format_type() spells it without a type
+# modifier. Each rejects values of the wrong Python type, so bulk_insert can
+# fall back to text COPY.
+_BINARY_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "smallint": _INT2.pack,
+    "integer": _INT4.pack,
+    "bigint": _INT8.pack,
+    "real": struct.Struct(">f").pack,
+    "double precision": struct.Struct(">d").pack,
+    "boolean": {True: b"\x01", False: b"\x00"}.__getitem__,
+    "text": lambda v: str(v).encode(),
+    "character varying": lambda v: str(v).encode(),
+    "bpchar": lambda v: str(v).encode(),
+    "bytea": lambda v: memoryview(v).tobytes(),
+    "uuid": lambda v: v.bytes,
+    "date": lambda v: _INT4.pack(v.toordinal() - _PG_EPOCH_ORDINAL),
+    "timestamp without time zone": lambda v: _INT8.pack(
+        (v - _PG_EPOCH) // _MICROSECOND
+    ),
+    "timestamp with time zone": lambda v: _INT8.pack(
+        (v - _PG_EPOCH_UTC) // _MICROSECOND
+    ),
+}
+
+
+def _number_placeholders(query: str, parameters: Any) -> Tuple[str, List[Any]]:
+    """Rewrite psycopg2 placeholders as $1, $2, ... for PREPARE.
+
+    Returns the rewritten query, with ``%%`` unescaped, and the parameter
+    values in $n order. Named placeholders used twice share a number.
+    """
+    numbers: Dict[str, int] = {}
+    args: List[Any] = []
+    positional = None if isinstance(parameters, dict) else iter(parameters)
+
+    def number(match: "re.Match[str]") -> str:
+        name = match.group(1)
+        if match.group(0) == "%%":
+            return "%"
+        if name is None:
+            args.append(next(positional))
+            return f"${len(args)}"
+        if name not in numbers:
+            args.append(parameters[name])
+            numbers[name] = len(args)
+        return f"${numbers[name]}"
+
+    return _PLACEHOLDER.sub(number, query), args
+
+
+def _binary_copy_data(
+    data: List[Dict[str, Any]],
+    columns: List[str],
+    encoders: List[Callable[[Any], bytes]],
+) -> io.BytesIO:
+    """Encode rows in PostgreSQL's binary COPY format."""
+    buffer = io.BytesIO()
+    buffer.write(_COPY_HEADER)
+    field_count = _INT2.pack(len(columns))
+    for row in data:
+        buffer.write(field_count)
+        for col, encode in zip(columns, encoders):
+            value = row.get(col)
+            if value is None:
+                buffer.write(_COPY_NULL)
+            else:
+                field = encode(value)
+                buffer.write(_INT4.pack(len(field)))
+                buffer.write(field)
+    buffer.write(_COPY_TRAILER)
+    buffer.seek(0)
+    return buffer
+
+
+def _text_copy_data(data: List[Dict[str, Any]], columns: List[str]) -> io.StringIO:
+    r"""Encode rows in COPY text format, with NULL written as \N."""
+    buffer = io.StringIO()
+    for row in data:
+        values = []
+        for col in columns:
+            val = row.get(col)
+            if val is None:
+                values.append("\\N")
+            else:
+                # Escape special characters
+                val_str = (
+                    str(val)
+                    .replace("\\", "\\\\")
+                    .replace("\t", "\\t")
+                    .replace("\n", "\\n")
+                    .replace("\r", "\\r")
+                )
+                values.append(val_str)
+        buffer.write("\t".join(values) + "\n")
+
+    buffer.seek(0)
+    return buffer
+
 
 class PostgreSQLConnector(BaseConnector):
     """PostgreSQL database connector.
@@ -57,6 +191,9 @@ class PostgreSQLConnector(BaseConnector):
     DB_TYPE = "postgresql"
     DEFAULT_PORT = 5432
 
+    # Server-side prepared statements execute() keeps per connection; 0 disables
+    PREPARED_STATEMENT_CACHE_SIZE = 500
+
     # PostgreSQL isolation levels
     ISOLATION_LEVELS = {
         "read_uncommitted": "READ UNCOMMITTED",
@@ -83,6 +220,8 @@ class PostgreSQLConnector(BaseConnector):
         super().__init__(config)
         self._pg_pool = None
         self._lock = threading.RLock()
+        # connection -> {query: prepared statement name, or None if unpreparable}
+        self._prepared = weakref.WeakKeyDictionary()
 
         if config.port is None:
             config.port = self.DEFAULT_PORT
@@ -115,6 +254,16 @@ class PostgreSQLConnector(BaseConnector):
 
         return conn
 
+    def invalidate_cache(self) -> None:
+        """Forget cached catalog lookups, SQL and prepared statement names.
+
+        Statements already prepared on a connection are replaced when their
+        query is next prepared there.
+        """
+        super().invalidate_cache()
+        with self._lock:
+            self._prepared.clear()
+
     def disconnect(self, connection: Any) -> None:
         """Close a PostgreSQL connection."""
         if connection:
@@ -158,11 +307,17 @@ class PostgreSQLConnector(BaseConnector):
         query: str,
         parameters: Optional[Dict[str, Any]] = None,
         connection: Optional[Any] = None,
+        prepare: bool = True,
     ) -> QueryResult:
-        """Execute a query."""
-        import time
+        """Execute a query.
 
-        start_time = time.time()
+        SELECT and DML statements are prepared on the connection the first
+        time they run and executed by name afterwards, so PostgreSQL parses
+        them once. A statement whose result columns were changed by DDL is
+        prepared again. Pass ``prepare=False`` for queries that plan badly
+        with a generic plan.
+        """
+        start_time = time.perf_counter()
         should_close = False
 
         if connection is None:
@@ -174,10 +329,15 @@ class PostgreSQLConnector(BaseConnector):
             cursor = self._get_cursor(connection)
 
             try:
-                if parameters:
-                    cursor.execute(query, parameters)
-                else:
-                    cursor.execute(query)
+                if not (
+                    prepare
+                    and self.PREPARED_STATEMENT_CACHE_SIZE
+                    and self._execute_prepared(connection, cursor, query, parameters)
+                ):
+                    if parameters:
+                        cursor.execute(query, parameters)
+                    else:
+                        cursor.execute(query)
 
                 # Fetch results if any
                 rows = []
@@ -187,7 +347,7 @@ class PostgreSQLConnector(BaseConnector):
                     columns = [desc[0] for desc in cursor.description]
                     rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
 
-                execution_time = (time.time() - start_time) * 1000
+                execution_time = (time.perf_counter() - start_time) * 1000
 
                 return QueryResult(
                     rows=rows,
@@ -202,6 +362,119 @@ class PostgreSQLConnector(BaseConnector):
             if should_close and self._pg_pool:
                 self._pg_pool.putconn(connection)
 
+    def _execute_prepared(
+        self, connection: Any, cursor: Any, query: str, parameters: Any
+    ) -> bool:
+        """Run ``query`` as a prepared statement; False if it can't be prepared.
+
+        After DDL changes a statement's result columns, EXECUTE fails with
+        "cached plan must not change result type". The statement is then
+        prepared again and retried, unless the caller's transaction was
+        already open and rolling it back would lose earlier work.
+        """
+        # Checked first, as preparing may itself open a transaction
+        idle = (
+            connection.autocommit
+            or connection.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE
+        )
+        prepared = self._prepared_statement(connection, cursor, query, parameters)
+        if prepared is None:
+            return False
+        try:
+            cursor.execute(*prepared)
+        except errors.FeatureNotSupported:
+            # Preparing the query again replaces the forgotten statement
+            self._prepared.get(connection, {}).pop(query, None)
+            if not idle:
+                raise
+            if not connection.autocommit:
+                connection.rollback()
+            prepared = self._prepared_statement(connection, cursor, query, parameters)
+            if prepared is None:
+                return False
+            cursor.execute(*prepared)
+        return True
+
+    def _prepared_statement(
+        self, connection: Any, cursor: Any, query: str, parameters: Any
+    ) -> Optional[Tuple[str, Optional[List[Any]]]]:
+        """Get an ``EXECUTE`` call for ``query``, preparing it if needed.
+
+        Returns the statement and its arguments, or None if the query can't
+        be prepared and should run as is. A statement of the same name that
+        this cache has forgotten may be stale, so it is replaced.
+        """
+        statement = query.rstrip()
+        if statement.endswith(";"):
+            statement = statement[:-1]
+        # PREPARE takes one statement; with several, the rest would run while
+        # preparing. A ";" inside a literal also skips preparation, harmlessly.
+        if not _PREPARABLE.match(statement) or ";" in statement:
+            return None
+        if parameters:
+            try:
+                body, args = _number_placeholders(statement, parameters)
+            except (KeyError, StopIteration, TypeError):
+                return None
+        else:
+            body, args = statement, []
+
+        with self._lock:
+            statements = self._prepared.setdefault(connection, OrderedDict())
+
+        if query in statements:
+            statements.move_to_end(query)
+            name = statements[query]
+        else:
+            name = "s_" + hashlib.blake2b(query.encode(), digest_size=8).hexdigest()
+            commands = [f"PREPARE {name} AS {body}"]
+            if len(statements) >= self.PREPARED_STATEMENT_CACHE_SIZE:
+                evicted = statements.popitem(last=False)[1]
+                if evicted is not None:
+                    commands.insert(0, f"DEALLOCATE {evicted}")
+
+            error = self._try_prepare(connection, cursor, commands)
+            if isinstance(error, errors.DuplicatePreparedStatement):
+                error = self._try_prepare(
+                    connection, cursor, [f"DEALLOCATE {name}", commands[-1]]
+                )
+            if error is not None:
+                logger.debug("Not preparing query: %s", error)
+                name = None
+            statements[query] = name
+
+        if name is None:
+            return None
+        if not args:
+            return f"EXECUTE {name}", None
+        return f"EXECUTE {name} ({', '.join(['%s'] * len(args))})", args
+
+    @staticmethod
+    def _try_prepare(
+        connection: Any, cursor: Any, commands: List[str]
+    ) -> Optional[Exception]:
+        """Send PREPARE/DEALLOCATE commands in one round-trip.
+
+        Returns the error if they fail. Inside a transaction they run under
+        a savepoint, so a failure doesn't abort the caller's transaction.
+        """
+        if not connection.autocommit:
+            commands = [
+                "SAVEPOINT anonimize_prepare",
+                *commands,
+                "RELEASE SAVEPOINT anonimize_prepare",
+            ]
+        try:
+            cursor.execute("; ".join(commands))
+        except psycopg2.Error as e:
+            if not connection.autocommit:
+                cursor.execute(
+                    "ROLLBACK TO SAVEPOINT anonimize_prepare; "
+                    "RELEASE SAVEPOINT anonimize_prepare"
+                )
+            return e
+        return None
+
     def executemany(
         self,
         query: str,
@@ -209,9 +482,7 @@ class PostgreSQLConnector(BaseConnector):
         connection: Optional[Any] = None,
     ) -> QueryResult:
         """Execute a query multiple times."""
-        import time
-
-        start_time = time.time()
+        start_time = time.perf_counter()
         should_close = False
 
         if connection is None:
@@ -225,7 +496,7 @@ class PostgreSQLConnector(BaseConnector):
             try:
                 cursor.executemany(query, parameters_list)
 
-                execution_time = (time.time() - start_time) * 1000
+                execution_time = (time.perf_counter() - start_time) * 1000
 
                 return QueryResult(
                     rows=[],
@@ -269,20 +540,17 @@ class PostgreSQLConnector(BaseConnector):
                 else:
                     cursor.execute(query)
 
-                columns = (
-                    [desc[0] for desc in cursor.description]
-                    if cursor.description
-                    else []
-                )
+                cast = row_caster(tuple(desc[0] for desc in cursor.description or ()))
 
                 for row in cursor:
-                    yield dict(zip(columns, row))
+                    yield cast(row)
             finally:
                 cursor.close()
         finally:
             if should_close and self._pg_pool:
                 self._pg_pool.putconn(connection)
 
+    @cached_schema
     def get_tables(self, schema: Optional[str] = None) -> List[TableInfo]:
         """Get list of tables."""
         schema_filter = schema or "public"
@@ -300,7 +568,7 @@ class PostgreSQLConnector(BaseConnector):
             ORDER BY tablename
         """
 
-        result = self.execute(query, {"schema": schema_filter})
+        result = self.execute(query, (schema_filter,))
 
         tables = []
         for row in result.rows:
@@ -319,6 +587,7 @@ class PostgreSQLConnector(BaseConnector):
 
         return tables
 
+    @cached_schema
     def get_columns(
         self, table_name: str, schema: Optional[str] = None
     ) -> List[ColumnInfo]:
@@ -359,7 +628,7 @@ class PostgreSQLConnector(BaseConnector):
             ORDER BY c.ordinal_position
         """
 
-        result = self.execute(query, {"table": table_name, "schema": schema_name})
+        result = self.execute(query, (table_name, schema_name))
 
         columns = []
         for row in result.rows:
@@ -376,6 +645,7 @@ class PostgreSQLConnector(BaseConnector):
 
         return columns
 
+    @cached_schema
     def get_primary_key(
         self, table_name: str, schema: Optional[str] = None
     ) -> List[str]:
@@ -394,7 +664,7 @@ class PostgreSQLConnector(BaseConnector):
             ORDER BY kcu.ordinal_position
         """
 
-        result = self.execute(query, {"table": table_name, "schema": schema_name})
+        result = self.execute(query, (table_name, schema_name))
         return [row["column_name"] for row in result.rows]
 
     def scan_table(
@@ -429,6 +699,13 @@ class PostgreSQLConnector(BaseConnector):
     ) -> int:
         """Update multiple rows efficiently using batch updates.
 
+        Updates touching the same columns are sent together as one
+        ``UPDATE ... FROM (VALUES ...)`` statement per batch, committing
+        after each batch. Each bound value is cast to its column's type, since
+        VALUES alone would type string literals as text. A row updated more
+        than once in a batch gets the last of its updates, as it would if
+        they ran in order.
+
         Args:
             table_name: Name of the table.
             updates: List of (where_conditions, set_values) tuples.
@@ -445,43 +722,102 @@ class PostgreSQLConnector(BaseConnector):
         connection = self._pg_pool.getconn()
 
         try:
-            cursor = connection.cursor()
+            with connection.cursor() as cursor:
+                for set_cols, where_cols, params in self._update_batches(
+                    updates, batch_size
+                ):
+                    query = self._statement(
+                        ("update", schema_name, table_name, set_cols, where_cols),
+                        lambda: self._update_from_values(
+                            schema_name, table_name, set_cols, where_cols
+                        ),
+                    )
+                    template = self._statement(
+                        ("values", schema_name, table_name, set_cols + where_cols),
+                        lambda: self._values_template(
+                            schema_name, table_name, set_cols + where_cols
+                        ),
+                    )
+                    # UPDATE ... FROM applies only one of several joined rows
+                    # to a target row, so keep just the last update per key
+                    try:
+                        params = list(
+                            {row[len(set_cols) :]: row for row in params}.values()
+                        )
+                    except TypeError:
+                        # Unhashable key values; send the batch as it is
+                        pass
+                    extras.execute_values(
+                        cursor, query, params, template=template, page_size=len(params)
+                    )
+                    total_updated += cursor.rowcount
 
-            try:
-                batch = []
+                    connection.commit()
+                    logger.debug("Batch update committed: %d updates", len(params))
 
-                for where_conditions, set_values in updates:
-                    if not batch:
-                        connection.commit()  # Ensure clean state
+            return total_updated
+        finally:
+            self._pg_pool.putconn(connection)
 
-                    # Build UPDATE statement
-                    set_clause = ", ".join(f'"{k}" = %s' for k in set_values.keys())
-                    where_clause = " AND ".join(
-                        f'"{k}" = %s' for k in where_conditions.keys()
-                    )
+    def _update_from_values(
+        self,
+        schema_name: str,
+        table_name: str,
+        set_cols: Tuple[str, ...],
+        where_cols: Tuple[str, ...],
+    ) -> str:
+        """Build an UPDATE joining the table to a ``VALUES %s`` list.
 
-                    query = f'UPDATE "{schema_name}"."{table_name}" SET {set_clause} WHERE {where_clause}'
-                    params = list(set_values.values()) + list(where_conditions.values())
+        The VALUES columns are named v0, v1, ... in params order: the set
+        values, then the where values.
+        """
+        columns = set_cols + where_cols
+        set_clause = ", ".join(f'"{col}" = data.v{i}' for i, col in enumerate(set_cols))
+        where_clause = " AND ".join(
+            f't."{col}" = data.v{i}'
+            for i, col in enumerate(where_cols, start=len(set_cols))
+        )
+        aliases = ", ".join(f"v{i}" for i in range(len(columns)))
+        return (
+            f'UPDATE "{schema_name}"."{table_name}" AS t SET {set_clause} '
+            f"FROM (VALUES %s) AS data({aliases}) WHERE {where_clause}"
+        )
 
-                    cursor.execute(query, params)
-                    total_updated += cursor.rowcount
+    def _values_template(
+        self, schema_name: str, table_name: str, columns: Tuple[str, ...]
+    ) -> str:
+        """Build the execute_values() row template, casting to column types.
 
-                    # Commit in batches
-                    if len(batch) >= batch_size:
-                        connection.commit()
-                        batch = []
-                    else:
-                        batch.append(1)
+        Each value is cast where it is bound, so a VALUES column mixing
+        Python ints and strs still resolves to the column's type.
+        """
+        types = dict(self._column_types(table_name, schema_name))
+        return (
+            "("
+            + ", ".join(f"%s::{types[c]}" if c in types else "%s" for c in columns)
+            + ")"
+        )
 
-                # Final commit
-                if batch:
-                    connection.commit()
+    @cached_schema
+    def _column_types(
+        self, table_name: str, schema: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        """Get (column, SQL type) pairs for a table, e.g. ("name", "text").
 
-                return total_updated
-            finally:
-                cursor.close()
-        finally:
-            self._pg_pool.putconn(connection)
+        Types leave out modifiers such as a varchar's length, so casting to
+        them never truncates and the column still checks the value.
+        """
+        schema_name = schema or "public"
+
+        query = """
+            SELECT attname AS name, format_type(atttypid, NULL) AS type
+            FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+            ORDER BY attnum
+        """
+
+        result = self.execute(query, (f'"{schema_name}"."{table_name}"',))
+        return [(row["name"], row["type"]) for row in result.rows]
 
     def bulk_insert(
         self,
@@ -509,49 +845,54 @@ class PostgreSQLConnector(BaseConnector):
         if columns is None:
             columns = list(data[0].keys())
 
+        # Binary COPY skips escaping and server-side parsing; fall back to text
+        # for column types or values the binary encoders don't handle
+        buffer, copy_format = None, "binary"
+        encoders = self._binary_encoders(table_name, schema_name, columns)
+        if encoders is not None:
+            try:
+                buffer = _binary_copy_data(data, columns, encoders)
+            except (
+                struct.error,
+                AttributeError,
+                KeyError,
+                OverflowError,
+                TypeError,
+                ValueError,
+            ) as e:
+                logger.debug("Falling back to text COPY: %s", e)
+        if buffer is None:
+            buffer, copy_format = _text_copy_data(data, columns), "text"
+
         self.initialize_pool()
         connection = self._pg_pool.getconn()
 
         try:
-            # Use COPY for efficient bulk insert
-            import io
-
-            buffer = io.StringIO()
-            for row in data:
-                values = []
-                for col in columns:
-                    val = row.get(col)
-                    if val is None:
-                        values.append("\\N")
-                    else:
-                        # Escape special characters
-                        val_str = (
-                            str(val)
-                            .replace("\\", "\\\\")
-                            .replace("\t", "\\t")
-                            .replace("\n", "\\n")
-                            .replace("\r", "\\r")
-                        )
-                        values.append(val_str)
-                buffer.write("\t".join(values) + "\n")
-
-            buffer.seek(0)
-
             column_str = ", ".join(f'"{col}"' for col in columns)
-
             with connection.cursor() as cursor:
-                cursor.copy_from(
+                cursor.copy_expert(
+                    f'COPY "{schema_name}"."{table_name}" ({column_str}) '
+                    f"FROM STDIN WITH (FORMAT {copy_format})",
                     buffer,
-                    f'"{schema_name}"."{table_name}"',
-                    columns=columns,
-                    sep="\t",
-                    null="\\N",
                 )
                 connection.commit()
                 return len(data)
         finally:
             self._pg_pool.putconn(connection)
 
+    def _binary_encoders(
+        self, table_name: str, schema_name: str, columns: List[str]
+    ) -> Optional[List[Callable[[Any], bytes]]]:
+        """Get binary COPY encoders for ``columns``, or None if any is unknown."""
+        types = dict(self._column_types(table_name, schema_name))
+        encoders = []
+        for col in columns:
+            encoder = _BINARY_ENCODERS.get(types.get(col, ""))
+            if encoder is None:
+                return None
+            encoders.append(encoder)
+        return encoders
+
     def test_connection(self) -> bool:
         """Test if the database connection is working."""
         try:
@@ -7,7 +7,8 @@ the anonymization process across different data sources.
 import hashlib
 import logging
 import random
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, List, Optional, Union
 
 # Import Phoney for fake data generation
 try:
@@ -21,6 +22,18 @@ from anonimize.detectors.regex import RegexDetector
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _hash_constructor(algorithm: str) -> Callable[..., Any]:
+    """Resolve the hashlib constructor for an algorithm name once.
+
+    Named constructors such as ``hashlib.sha256`` skip the name lookup that
+    ``hashlib.new`` repeats on every call.
+    """
+    if algorithm in hashlib.algorithms_guaranteed:
+        return getattr(hashlib, algorithm)
+    return partial(hashlib.new, algorithm)
+
+
 class Anonymizer:
     """Main anonymization engine for PII data.
 
@@ -292,9 +305,7 @@ class Anonymizer:
         if salt:
             value_str = f"{salt}:{value_str}"
 
-        hasher = hashlib.new(algorithm)
-        hasher.update(value_str.encode("utf-8"))
-        return hasher.hexdigest()
+        return _hash_constructor(algorithm)(value_str.encode("utf-8")).hexdigest()
 
     def _mask_value(self, value: Any, settings: Dict[str, Any]) -> str:
         """Mask a value.
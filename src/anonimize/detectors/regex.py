@@ -12,6 +12,9 @@ from anonimize.detectors.base import BaseDetector
 
 logger = logging.getLogger(__name__)
 
+# Patterns using backreferences can't be renumbered into a combined scan
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
 
 class RegexDetector(BaseDetector):
     """PII detector using regular expressions.
@@ -20,7 +23,8 @@ class RegexDetector(BaseDetector):
     common types of PII such as emails, phone numbers, SSNs, etc.
 
     Attributes:
-        patterns: Dictionary of regex patterns for each PII type.
+        patterns: Dictionary of regex patterns for each PII type. Change it
+            through add_pattern() so the combined scan is rebuilt.
 
     Example:
         >>> detector = RegexDetector()
@@ -149,6 +153,35 @@ class RegexDetector(BaseDetector):
                     "confidence": config.get("confidence", 0.8),
                 }
 
+        self._build_scan()
+
+    def _build_scan(self) -> None:
+        """Compile all value patterns into one alternation.
+
+        Branches are tried in pattern order, so one ``match()`` call finds
+        the same PII type as trying each pattern in turn. Falls back to the
+        per-pattern loop when the patterns can't be combined safely.
+        """
+        self._scan: Optional[Pattern] = None
+        self._scan_types: Dict[str, str] = {}
+
+        branches = []
+        for i, (pii_type, config) in enumerate(self.patterns.items()):
+            pattern = config["pattern"]
+            if (
+                pattern.flags != re.UNICODE
+                or pattern.groupindex
+                or _BACKREFERENCE.search(pattern.pattern)
+            ):
+                return
+            branches.append(f"(?P<_p{i}>{pattern.pattern})")
+            self._scan_types[f"_p{i}"] = pii_type
+
+        try:
+            self._scan = re.compile("|".join(branches))
+        except re.error:
+            self._scan_types = {}
+
     def detect(
         self, data: Union[Dict[str, Any], List[Dict[str, Any]], str], **kwargs
     ) -> Dict[str, Dict[str, Any]]:
@@ -203,6 +236,17 @@ class RegexDetector(BaseDetector):
         Returns:
             Detection result or None.
         """
+        if self._scan is not None:
+            match = self._scan.match(str(value))
+            if match is None:
+                return None
+            pii_type = self._scan_types[match.lastgroup]
+            return {
+                "type": pii_type,
+                "confidence": self.patterns[pii_type]["confidence"],
+                "pattern": pii_type,
+            }
+
         for pii_type, config in self.patterns.items():
             pattern = config["pattern"]
             confidence = config["confidence"]
@@ -257,6 +301,7 @@ class RegexDetector(BaseDetector):
             "pattern": pattern,
             "confidence": confidence,
         }
+        self._build_scan()
 
         logger.debug(f"Added pattern for '{pii_type}' with confidence {confidence}")
 
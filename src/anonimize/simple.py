@@ -221,7 +221,8 @@ def preview(
         input_path: Path to CSV file
         num_rows: Number of rows to preview (default: 3)
         strategy: Anonymization strategy to preview
-        **kwargs: Additional options
+        **kwargs: Additional options (``columns`` limits which detected
+            columns are anonymized, as in anonymize())
 
     Returns:
         List of dictionaries showing before/after
@@ -244,9 +245,11 @@ def preview(
     detected = csv_anon.detect_columns(path)
 
     # Build config
+    columns = kwargs.get("columns")
     config = {
         col: {"strategy": strategy, "type": pii_type}
         for col, pii_type in detected.items()
+        if not columns or col in columns
     }
 
     # Get preview
@@ -348,9 +351,16 @@ def _show_progress(
     try:
         from tqdm import tqdm
 
-        # Count total rows
-        with open(input_path) as f:
-            total = sum(1 for _ in f) - 1  # Subtract header
+        # Count total rows by scanning raw bytes for newlines, which skips
+        # decoding the whole file just to size the progress bar
+        total = 0
+        chunk = b""
+        with open(input_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                total += chunk.count(b"\n")
+        if chunk and not chunk.endswith(b"\n"):
+            total += 1  # Last line has no newline
+        total -= 1  # Subtract header
 
         # Create wrapper that shows progress
         chunk_size = csv_anon.chunk_size
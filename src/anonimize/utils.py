@@ -6,7 +6,8 @@ for data processing, validation, and transformation.
 
 import hashlib
 import re
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
 
 
 def hash_value(
@@ -249,3 +250,53 @@ def merge_configs(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, A
             result[key] = value
 
     return result
+
+
+class LRUCache:
+    """Size-capped mapping that evicts the least recently used entry.
+
+    Used for per-instance memoization of anonymized values so that long
+    streaming runs keep a bounded memory footprint.
+
+    Args:
+        maxsize: Maximum number of entries to retain.
+
+    Example:
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache["a"] = 1
+        >>> cache.get("a")
+        1
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, marking it as recently used."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the oldest entry when full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check membership without affecting recency."""
+        return key in self._data
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._data)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._data.clear()
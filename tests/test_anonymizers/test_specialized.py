@@ -26,6 +26,13 @@ class TestEmailAnonymizer:
         anon = EmailAnonymizer(seed=42)
         assert anon.seed == 42
 
+    def test_seeded_instances_are_independent(self):
+        """Test that each seeded instance reproduces its own sequence."""
+        anon1 = EmailAnonymizer(seed=42)
+        anon2 = EmailAnonymizer(seed=42)
+
+        assert anon1.anonymize("a@b.com").value == anon2.anonymize("a@b.com").value
+
     def test_validate_valid_emails(self):
         """Test validation of valid emails."""
         anon = EmailAnonymizer()
@@ -173,6 +180,29 @@ class TestEmailAnonymizer:
 
         assert result1.value != result2.value
 
+    def test_deterministic_across_instances(self):
+        """Test deterministic strategy is stable across anonymizer instances."""
+        result1 = EmailAnonymizer().anonymize(
+            "test@example.com", strategy=AnonymizationStrategy.DETERMINISTIC
+        )
+        result2 = EmailAnonymizer().anonymize(
+            "test@example.com", strategy=AnonymizationStrategy.DETERMINISTIC
+        )
+
+        assert result1.value == result2.value
+
+    def test_deterministic_cache_is_bounded(self):
+        """Test deterministic cache evicts old entries past its size limit."""
+        anon = EmailAnonymizer()
+        anon._deterministic_cache.maxsize = 2
+
+        for i in range(5):
+            anon.anonymize(
+                f"user{i}@example.com", strategy=AnonymizationStrategy.DETERMINISTIC
+            )
+
+        assert len(anon._deterministic_cache) == 2
+
     def test_is_disposable(self):
         """Test disposable email detection."""
         anon = EmailAnonymizer()
@@ -277,6 +307,26 @@ class TestPhoneAnonymizer:
 
         assert result.value.startswith("+44")
 
+    def test_extract_country_code_prefers_longest(self):
+        """Test country code extraction picks the longest matching code."""
+        anon = PhoneAnonymizer()
+
+        assert anon._extract_country_code("+44 20 7946 0958") == ("44", "2079460958")
+        assert anon._extract_country_code("+1 555 123 4567") == ("1", "5551234567")
+        assert anon._extract_country_code("+999 123") == ("", "999123")
+
+    def test_subclass_country_codes(self):
+        """Test subclasses overriding COUNTRY_CODES get their own lookup."""
+
+        class NordicPhoneAnonymizer(PhoneAnonymizer):
+            COUNTRY_CODES = {"45": "DK", "46": "SE", "358": "FI"}
+
+        anon = NordicPhoneAnonymizer()
+
+        assert anon._extract_country_code("+358 40 123 4567")[0] == "358"
+        assert anon._extract_country_code("+44 20 7946 0958")[0] == ""
+        assert PhoneAnonymizer()._extract_country_code("+44 20")[0] == "44"
+
 
 class TestSSNAnonymizer:
     """Test cases for SSNAnonymizer."""
@@ -445,3 +495,38 @@ class TestAnonymizationResult:
         assert hasattr(result, "metadata")
 
         assert isinstance(result.metadata, dict)
+
+
+class TestAnonymizeBatch:
+    """Test cases for batch anonymization."""
+
+    def test_batch_matches_single_value_results(self):
+        """Test batch output matches per-value anonymize for pure strategies."""
+        anon = SSNAnonymizer()
+        values = ["123-45-6789", "987-65-4321"]
+
+        batch = anon.anonymize_batch(values, AnonymizationStrategy.MASK)
+
+        assert batch == [
+            anon.anonymize(v, strategy=AnonymizationStrategy.MASK).value for v in values
+        ]
+
+    def test_batch_passes_options(self):
+        """Test strategy options are forwarded to every value."""
+        anon = EmailAnonymizer()
+
+        batch = anon.anonymize_batch(
+            ["a@example.com", "b@example.com"],
+            AnonymizationStrategy.MASK,
+            mask_char="#",
+        )
+
+        assert batch == ["#@example.com", "#@example.com"]
+
+    def test_batch_empty_values(self):
+        """Test empty values pass through unchanged."""
+        anon = EmailAnonymizer()
+
+        batch = anon.anonymize_batch(["", None], AnonymizationStrategy.REMOVE)
+
+        assert batch == ["", ""]
@@ -0,0 +1,125 @@
+"""Tests for the command line interface."""
+
+import csv
+import io
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from anonimize.cli import main
+
+
+class TestMain:
+    """Test cases for CLI argument routing."""
+
+    @pytest.fixture
+    def sample_csv(self):
+        """Create a sample CSV file for testing."""
+        with TemporaryDirectory() as tmpdir:
+            csv_path = Path(tmpdir) / "test.csv"
+            with open(csv_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["name", "email"])
+                writer.writerow(["John Doe", "john@example.com"])
+            yield str(csv_path)
+
+    def test_bare_file_runs_anonymize(self, sample_csv, capsys):
+        """Test a bare file argument is treated as the anonymize command."""
+        assert main([sample_csv, "--dry-run", "--no-progress"]) == 0
+        assert "DRY RUN" in capsys.readouterr().out
+
+    def test_explicit_anonymize_command(self, sample_csv, capsys):
+        """Test the explicit anonymize subcommand."""
+        assert main(["anonymize", sample_csv, "--dry-run", "--no-progress"]) == 0
+        assert "DRY RUN" in capsys.readouterr().out
+
+    def test_bare_file_rejects_unknown_flags(self, sample_csv):
+        """Test unknown options are reported instead of silently dropped."""
+        with pytest.raises(SystemExit):
+            main([sample_csv, "--bogus"])
+
+    def test_missing_file(self, capsys):
+        """Test a missing input file returns an error code."""
+        assert main(["does-not-exist.csv"]) == 1
+        assert "File not found" in capsys.readouterr().err
+
+    def test_no_arguments_shows_help(self, capsys):
+        """Test running without arguments prints usage."""
+        assert main([]) == 0
+        assert "Quick start" in capsys.readouterr().out
+
+
+class TestDetectCommand:
+    """Test cases for the detect command."""
+
+    sample = str(Path(__file__).parent / "fixtures" / "sample_data.csv")
+
+    def test_detect_table(self, capsys):
+        """Test detect prints one table line per PII column."""
+        assert main(["detect", self.sample]) == 0
+
+        out = capsys.readouterr().out
+        assert "email" in out
+        assert "PII field(s) detected" in out
+
+    def test_detect_json(self, capsys):
+        """Test detect emits valid JSON."""
+        assert main(["detect", self.sample, "--format", "json"]) == 0
+
+        assert "email" in json.loads(capsys.readouterr().out)
+
+    def test_detect_json_without_orjson(self, capsys, monkeypatch):
+        """Test JSON output falls back to the standard library encoder."""
+        monkeypatch.setattr("anonimize.cli.orjson", None)
+
+        assert main(["detect", self.sample, "--format", "json"]) == 0
+
+        assert "email" in json.loads(capsys.readouterr().out)
+
+
+class TestPreviewCommand:
+    """Test cases for the preview command."""
+
+    def test_preview_table(self, capsys):
+        """Test preview renders a header and one line per row."""
+        sample = Path(__file__).parent / "fixtures" / "sample_data.csv"
+
+        assert main(["preview", str(sample), "-n", "2", "-s", "mask"]) == 0
+
+        lines = [line for line in capsys.readouterr().out.splitlines() if line]
+        assert lines[1].split()[0] == "id"
+        assert set(lines[2].strip()) == {"-"}
+        assert len(lines) == 5
+
+
+class TestConfigCommand:
+    """Test cases for the config command."""
+
+    def test_generate_config(self):
+        """Test a sample config file is written."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "anonimize.yaml"
+
+            assert main(["config", "--generate", "-o", str(output)]) == 0
+            assert output.read_text().startswith("# Anonimize Configuration File")
+
+    def test_existing_file_not_overwritten_without_tty(self, monkeypatch):
+        """Test an existing file is kept when no one can answer the prompt."""
+        monkeypatch.setattr("sys.stdin", io.StringIO(""))
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "anonimize.yaml"
+            output.write_text("keep me")
+
+            assert main(["config", "--generate", "-o", str(output)]) == 1
+            assert output.read_text() == "keep me"
+
+    def test_force_overwrites_existing_file(self):
+        """Test --force replaces an existing file without prompting."""
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "anonimize.yaml"
+            output.write_text("old")
+
+            assert main(["config", "--generate", "-o", str(output), "--force"]) == 0
+            assert output.read_text().startswith("# Anonimize Configuration File")
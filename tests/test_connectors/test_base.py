@@ -1,5 +1,8 @@
 """Tests for database connectors base classes."""
 
+import sys
+import threading
+
 import pytest
 from unittest.mock import Mock, MagicMock
 
@@ -11,6 +14,8 @@ from anonimize.connectors.base import (
     QueryResult,
     BaseConnector,
     Transaction,
+    cached_schema,
+    row_caster,
 )
 
 
@@ -113,6 +118,76 @@ class TestConnectionPool:
         assert len(pool._pool) == 0
         assert pool._overflow == 0
 
+    def test_pool_close_all_disconnects(self):
+        """Test idle and checked-out connections are passed to disconnect."""
+        pool = ConnectionPool(factory=Mock, config=ConnectionConfig(pool_size=2))
+        idle, busy = pool.acquire(), pool.acquire()
+        pool.release(idle)
+        disconnect = Mock(side_effect=[None, OSError("gone")])
+
+        pool.close_all(disconnect)
+
+        assert {id(c.args[0]) for c in disconnect.call_args_list} == {
+            id(idle),
+            id(busy),
+        }
+        assert pool.get_stats()["in_use"] == 0
+
+    def test_pool_exhausted_after_timeout(self):
+        """Test acquire gives up once the timeout passes."""
+        config = ConnectionConfig(pool_size=1, max_overflow=0)
+        pool = ConnectionPool(factory=Mock, config=config)
+
+        pool.acquire()
+
+        with pytest.raises(RuntimeError, match="exhausted"):
+            pool.acquire(timeout=0.01)
+
+    def test_pool_acquire_waits_for_release(self):
+        """Test a blocked acquire receives the next released connection."""
+        config = ConnectionConfig(pool_size=1, max_overflow=0)
+        pool = ConnectionPool(factory=Mock, config=config)
+        conn = pool.acquire()
+
+        timer = threading.Timer(0.05, pool.release, args=(conn,))
+        timer.start()
+        try:
+            assert pool.acquire(timeout=5.0) is conn
+        finally:
+            timer.join()
+
+    def test_pool_double_release_ignored(self):
+        """Test releasing a connection twice does not pool it twice."""
+        pool = ConnectionPool(factory=Mock, config=ConnectionConfig())
+        conn = pool.acquire()
+
+        pool.release(conn)
+        pool.release(conn)
+
+        assert len(pool._pool) == 1
+
+    def test_pool_concurrent_acquire_release(self):
+        """Test threads sharing the pool never exceed its size."""
+        config = ConnectionConfig(pool_size=2, max_overflow=1)
+        pool = ConnectionPool(factory=Mock, config=config)
+        peak = []
+
+        def worker():
+            for _ in range(50):
+                conn = pool.acquire(timeout=5.0)
+                peak.append(pool.get_stats()["in_use"])
+                pool.release(conn)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(peak) <= 3
+        assert pool.get_stats()["in_use"] == 0
+        assert pool._total_created <= 3
+
 
 class TestColumnInfo:
     """Test ColumnInfo dataclass."""
@@ -161,6 +236,15 @@ class TestTableInfo:
         assert table.row_count is None
         assert table.size_bytes is None
 
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="needs slots=True")
+    def test_no_instance_dict(self):
+        """Test schema objects are slotted to keep large schemas small."""
+        col = ColumnInfo(name="id", data_type="INTEGER")
+
+        assert not hasattr(col, "__dict__")
+        with pytest.raises(AttributeError):
+            col.unknown = 1
+
     def test_with_columns(self):
         """Test table info with columns."""
         columns = [
@@ -207,6 +291,16 @@ class TestQueryResult:
         assert result.row_count == 1
         assert result.execution_time_ms == 15.5
 
+    def test_column_values(self):
+        """Test extracting one column as a list."""
+        result = QueryResult(
+            rows=[{"id": 1, "name": "John"}, {"id": 2}],
+            columns=["id", "name"],
+        )
+
+        assert result.column("id") == [1, 2]
+        assert result.column("name") == ["John", None]
+
 
 class MockConnector(BaseConnector):
     """Mock connector for testing."""
@@ -256,6 +350,22 @@ class MockConnector(BaseConnector):
         pass
 
 
+class TestRowCaster:
+    """Test cached row-to-dict functions."""
+
+    def test_matches_zip(self):
+        """Test rows map to dicts like dict(zip(columns, row)), quotes included."""
+        columns = ("id", "it's", 'say "hi"', "id")
+        row = (1, 2, 3, 4)
+
+        assert row_caster(columns)(row) == dict(zip(columns, row))
+        assert row_caster(())(()) == {}
+
+    def test_cached_per_columns(self):
+        """Test the same column tuple reuses one function."""
+        assert row_caster(("a", "b")) is row_caster(("a", "b"))
+
+
 class TestBaseConnector:
     """Test BaseConnector class."""
 
@@ -277,6 +387,95 @@ class TestBaseConnector:
 
         assert connector._closed is True
 
+    def test_statement_cache(self):
+        """Test generated SQL is built once per key."""
+        connector = MockConnector(ConnectionConfig())
+        build = Mock(return_value="UPDATE t SET a = ? WHERE id = ?")
+        key = ("update", "t", ("a",), ("id",))
+
+        assert connector._statement(key, build) == build.return_value
+        assert connector._statement(key, build) == build.return_value
+        assert build.call_count == 1
+
+        connector._statement(("update", "t", ("b",), ("id",)), build)
+        assert build.call_count == 2
+
+    def test_statement_cache_evicts_least_recently_used(self, monkeypatch):
+        """Test the cache stays bounded, dropping the stalest statement."""
+        connector = MockConnector(ConnectionConfig())
+        monkeypatch.setattr(connector, "STATEMENT_CACHE_SIZE", 2)
+        build = Mock(return_value="SQL")
+
+        connector._statement(("a",), build)
+        connector._statement(("b",), build)
+        connector._statement(("a",), build)
+        connector._statement(("c",), build)
+
+        assert list(connector._stmt_cache) == [("a",), ("c",)]
+
+    def test_cached_schema(self, monkeypatch):
+        """Test catalog lookups are reused per arguments until invalidated."""
+        calls = []
+
+        class CachingConnector(MockConnector):
+            @cached_schema
+            def get_columns(self, table_name, schema=None):
+                calls.append(table_name)
+                return [table_name]
+
+        connector = CachingConnector(ConnectionConfig())
+        assert connector.get_columns("a") == ["a"]
+        assert connector.get_columns("a", schema=None) == ["a"]
+        assert connector.get_columns("b") == ["b"]
+        assert calls == ["a", "b"]
+
+        connector.get_columns("a").append("mutated")
+        assert connector.get_columns("a") == ["a"]
+
+        connector.invalidate_cache()
+        connector.get_columns("a")
+        assert len(calls) == 3
+
+        monkeypatch.setattr(connector, "SCHEMA_CACHE_TTL", 0)
+        connector.get_columns("a")
+        assert len(calls) == 4
+
+    def test_invalidate_cache_drops_statements(self):
+        """Test cached SQL is rebuilt after the cache is invalidated."""
+        connector = MockConnector(ConnectionConfig())
+        build = MagicMock(side_effect=["old", "new"])
+
+        connector._statement(("update", "t"), build)
+        connector.invalidate_cache()
+
+        assert connector._statement(("update", "t"), build) == "new"
+
+    def test_update_batches_group_by_shape(self):
+        """Test consecutive same-column updates share a batch, in order."""
+        updates = [
+            ({"id": 1}, {"email": "a"}),
+            ({"id": 2}, {"email": "b"}),
+            ({"id": 3}, {"email": "c", "name": "x"}),
+            ({"id": 4}, {"email": "d"}),
+        ]
+
+        batches = list(BaseConnector._update_batches(updates, batch_size=10))
+
+        assert batches == [
+            (("email",), ("id",), [("a", 1), ("b", 2)]),
+            (("email", "name"), ("id",), [("c", "x", 3)]),
+            (("email",), ("id",), [("d", 4)]),
+        ]
+
+    def test_update_batches_respect_batch_size(self):
+        """Test batches are split at batch_size."""
+        updates = [({"id": i}, {"email": str(i)}) for i in range(5)]
+
+        batches = list(BaseConnector._update_batches(updates, batch_size=2))
+
+        assert [len(params) for _, _, params in batches] == [2, 2, 1]
+        assert not list(BaseConnector._update_batches([], batch_size=2))
+
     def test_get_pool_stats_not_initialized(self):
         """Test getting pool stats before initialization."""
         config = ConnectionConfig()
@@ -0,0 +1,63 @@
+"""Tests for create_connector scheme dispatch and lazy connector imports."""
+
+import subprocess
+import sys
+
+import pytest
+
+import anonimize.connectors as connectors
+from anonimize.connectors import SQLiteConnector, create_connector
+
+
+class TestCreateConnector:
+    """Test choosing a connector from a connection string."""
+
+    def test_sqlite(self):
+        """Test sqlite URLs build a SQLite connector."""
+        connector = create_connector("sqlite:///:memory:")
+
+        assert isinstance(connector, SQLiteConnector)
+        assert connector.connection_string == "sqlite:///:memory:"
+
+    @pytest.mark.parametrize(
+        "connection_string",
+        ["oracle://host/db", "localhost/db", "postgresql:/missing-slash", ""],
+    )
+    def test_unsupported_scheme(self, connection_string):
+        """Test unknown or malformed connection strings are rejected."""
+        with pytest.raises(ValueError, match="Unsupported connection string"):
+            create_connector(connection_string)
+
+    @pytest.mark.parametrize(
+        "connection_string,name,extra",
+        [
+            ("postgres://u@h/db", "PostgreSQLConnector", "postgresql"),
+            ("mariadb://u@h/db", "MySQLConnector", "mysql"),
+            ("mongodb+srv://u@h/db", "MongoDBConnector", "mongodb"),
+        ],
+    )
+    def test_missing_driver(self, monkeypatch, connection_string, name, extra):
+        """Test a missing optional driver names the extra to install."""
+        monkeypatch.setattr(connectors, name, None)
+
+        with pytest.raises(ImportError, match=rf"anonimize\[{extra}\]"):
+            create_connector(connection_string)
+
+
+class TestLazyConnectors:
+    """Test optional connectors are imported on first use."""
+
+    def test_import_does_not_load_optional_connectors(self):
+        """Test importing the package leaves driver-backed modules unloaded."""
+        code = (
+            "import sys, anonimize.connectors as c; "
+            "assert 'anonimize.connectors.mongodb' not in sys.modules; "
+            "c.MongoDBConnector; "
+            "assert 'anonimize.connectors.mongodb' in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_unknown_attribute(self):
+        """Test unknown names still raise AttributeError."""
+        with pytest.raises(AttributeError):
+            connectors.NoSuchConnector
@@ -0,0 +1,530 @@
+"""Tests for the MongoDB connector."""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from bson import ObjectId  # noqa: E402
+from pymongo import (  # noqa: E402
+    ASCENDING,
+    DESCENDING,
+    DeleteOne,
+    InsertOne,
+    UpdateMany,
+    UpdateOne,
+)
+from pymongo.errors import OperationFailure  # noqa: E402
+from pymongo.read_preferences import SecondaryPreferred  # noqa: E402
+
+from anonimize.connectors.base import (  # noqa: E402
+    ColumnInfo,
+    ConnectionConfig,
+    QueryResult,
+)
+from anonimize.connectors.mongodb import MongoDBConnector  # noqa: E402
+
+
+@pytest.fixture
+def connector():
+    """Create a connector backed by a mock client."""
+    connector = MongoDBConnector(ConnectionConfig(host="localhost", database="db"))
+    connector._client = MagicMock()
+    return connector
+
+
+@pytest.fixture
+def collection(connector):
+    """Return the mock collection every lookup resolves to."""
+    db = connector._client["db"]
+    db.get_collection.return_value = db["users"]
+    return db["users"]
+
+
+class TestClient:
+    """Test the shared client lifecycle."""
+
+    def test_pool_options(self):
+        """Test pool options are derived from the config and accepted by PyMongo."""
+        config = ConnectionConfig(host="localhost", pool_size=50, max_connecting=4)
+        client = MongoDBConnector(config, connect=False).connect()
+
+        try:
+            pool = client.options.pool_options
+            assert pool.max_pool_size == 50
+            assert pool.min_pool_size == 10
+            assert pool.max_connecting == 4
+        finally:
+            client.close()
+
+    def test_min_pool_size_capped_by_pool_size(self):
+        """Test the default minimum never exceeds a small maximum."""
+        client = MongoDBConnector(ConnectionConfig(), connect=False).connect()
+
+        try:
+            assert client.options.pool_options.min_pool_size == 5
+        finally:
+            client.close()
+
+    def test_client_created_once(self, monkeypatch):
+        """Test operations reuse one lazily created client."""
+        connector = MongoDBConnector(ConnectionConfig(host="localhost", database="db"))
+        client = MagicMock()
+        connect = MagicMock(return_value=client)
+        monkeypatch.setattr(connector, "connect", connect)
+
+        connector.get_columns("users")
+        connector.update_rows("users", [({"_id": 1}, {"name": "a"})])
+        list(connector.fetchiter("users"))
+
+        connect.assert_called_once_with()
+        client.close.assert_not_called()
+
+    def test_explicit_connection_preferred(self, connector):
+        """Test a caller-supplied client is used instead of the shared one."""
+        other = MagicMock()
+        other["db"]["users"].aggregate.return_value = iter([{"a": 1}])
+
+        assert connector.execute("users", {}, connection=other).rows == [{"a": 1}]
+        connector._client["db"]["users"].aggregate.assert_not_called()
+
+    def test_context_manager_closes_client(self, connector):
+        """Test leaving the context closes the shared client."""
+        client = connector._client
+
+        with connector:
+            pass
+
+        client.close.assert_called_once_with()
+        assert connector._client is None
+
+
+class TestCollectionCache:
+    """Test reuse of collection handles."""
+
+    def test_handles_cached_per_read_preference(self, connector):
+        """Test handles are reused, separately for each read preference."""
+        primary = connector._get_collection(connector._client, "users")
+        secondary = connector._get_collection(
+            connector._client, "users", read_preference=SecondaryPreferred()
+        )
+
+        assert connector._get_collection(connector._client, "users") is primary
+        assert (
+            connector._get_collection(
+                connector._client, "users", read_preference=SecondaryPreferred()
+            )
+            is secondary
+        )
+        assert len(connector._collection_cache) == 2
+
+    def test_other_clients_not_cached(self, connector):
+        """Test a caller-supplied client never gets or fills cached handles."""
+        connector._get_collection(MagicMock(), "users")
+
+        assert not connector._collection_cache
+
+    def test_close_clears_cache(self, connector):
+        """Test closing drops handles tied to the old client."""
+        connector._get_collection(connector._client, "users")
+
+        connector.close()
+
+        assert not connector._collection_cache
+
+
+class TestUpdateRows:
+    """Test batched document updates."""
+
+    def test_one_bulk_write_per_batch(self, connector, collection):
+        """Test updates are sent as unordered bulk writes, one per batch."""
+        collection.bulk_write.return_value.modified_count = 2
+        updates = [({"_id": i}, {"email": f"user{i}@example.com"}) for i in range(5)]
+
+        assert connector.update_rows("users", updates, batch_size=2) == 6
+
+        calls = collection.bulk_write.call_args_list
+        assert [len(call.args[0]) for call in calls] == [2, 2, 1]
+        assert all(call.kwargs == {"ordered": False} for call in calls)
+        assert calls[0].args[0][0] == UpdateOne(
+            {"_id": 0}, {"$set": {"email": "user0@example.com"}}, upsert=False
+        )
+        collection.update_one.assert_not_called()
+
+    def test_identical_sets_merged(self, connector, collection):
+        """Test _id updates sharing a $set collapse into one UpdateMany."""
+        updates = [
+            ({"_id": 1}, {"name": "REDACTED"}),
+            ({"_id": 2}, {"name": "REDACTED"}),
+            ({"_id": 3}, {"name": True}),
+            ({"_id": 4}, {"name": 1}),
+            ({"email": "a@example.com"}, {"name": "REDACTED"}),
+            ({"_id": {"$gt": 9}}, {"name": "REDACTED"}),
+        ]
+
+        connector.update_rows("users", updates)
+
+        operations = collection.bulk_write.call_args.args[0]
+        assert operations == [
+            UpdateMany({"_id": {"$in": [1, 2]}}, {"$set": {"name": "REDACTED"}}),
+            UpdateOne({"_id": 3}, {"$set": {"name": True}}, upsert=False),
+            UpdateOne({"_id": 4}, {"$set": {"name": 1}}, upsert=False),
+            UpdateOne(
+                {"email": "a@example.com"}, {"$set": {"name": "REDACTED"}}, upsert=False
+            ),
+            UpdateOne(
+                {"_id": {"$gt": 9}}, {"$set": {"name": "REDACTED"}}, upsert=False
+            ),
+        ]
+
+    def test_repeated_id_keeps_input_order(self, connector, collection):
+        """Test an _id updated twice in a batch is not merged out of order."""
+        updates = [
+            ({"_id": 2}, {"a": "x"}),
+            ({"_id": 1}, {"a": "y"}),
+            ({"_id": 1}, {"a": "x"}),
+        ]
+
+        connector.update_rows("users", updates)
+
+        assert collection.bulk_write.call_args.args[0] == [
+            UpdateOne({"_id": 2}, {"$set": {"a": "x"}}, upsert=False),
+            UpdateOne({"_id": 1}, {"$set": {"a": "y"}}, upsert=False),
+            UpdateOne({"_id": 1}, {"$set": {"a": "x"}}, upsert=False),
+        ]
+
+    def test_unhashable_values_not_merged(self, connector, collection):
+        """Test updates with nested values are still sent individually."""
+        updates = [({"_id": i}, {"tags": ["x"]}) for i in range(2)]
+
+        connector.update_rows("users", updates)
+
+        assert collection.bulk_write.call_args.args[0] == [
+            UpdateOne({"_id": i}, {"$set": {"tags": ["x"]}}, upsert=False)
+            for i in range(2)
+        ]
+
+    def test_no_updates(self, connector, collection):
+        """Test an empty update list never contacts the server."""
+        assert connector.update_rows("users", []) == 0
+        collection.bulk_write.assert_not_called()
+
+
+class TestExecute:
+    """Test aggregation pipelines."""
+
+    def test_cursor_returned_unconsumed(self, connector, collection):
+        """Test execute_cursor hands back the driver cursor as-is."""
+        pipeline = [{"$match": {"active": True}}]
+
+        cursor = connector.execute_cursor(
+            "users", {"pipeline": pipeline, "batch_size": 500}
+        )
+
+        assert cursor is collection.aggregate.return_value
+        collection.aggregate.assert_called_once_with(
+            pipeline, allowDiskUse=True, batchSize=500
+        )
+
+    def test_execute_materializes_result(self, connector, collection):
+        """Test execute still returns every row with columns from the first."""
+        collection.aggregate.return_value = iter([{"a": 1, "b": 2}, {"a": 3}])
+
+        result = connector.execute("users", {"pipeline": []})
+
+        assert result.row_count == 2
+        assert result.columns == ["a", "b"]
+        collection.aggregate.assert_called_once_with([], allowDiskUse=True)
+
+    def test_concurrent_results_in_order(self, connector, monkeypatch):
+        """Test concurrent pipelines return results in query order."""
+        monkeypatch.setattr(
+            connector,
+            "execute",
+            lambda name, params: QueryResult(
+                rows=[params], columns=[name], row_count=1, affected_rows=0
+            ),
+        )
+        queries = [(f"c{i}", {"pipeline": [{"$limit": i}]}) for i in range(10)]
+
+        results = connector.execute_many_concurrent(queries, max_workers=4)
+
+        assert [r.columns[0] for r in results] == [f"c{i}" for i in range(10)]
+        assert connector.execute_many_concurrent([]) == []
+
+    def test_schema_only(self, connector, collection):
+        """Test schema-only execution fetches a single document."""
+        collection.aggregate.return_value = iter([{"a": 1, "b": 2}])
+        pipeline = [{"$match": {"active": True}}]
+
+        result = connector.execute("users", {"pipeline": pipeline, "schema_only": True})
+
+        assert (result.columns, result.rows) == (["a", "b"], [])
+        collection.aggregate.assert_called_once_with(
+            [{"$match": {"active": True}}, {"$limit": 1}], allowDiskUse=True
+        )
+        assert pipeline == [{"$match": {"active": True}}]
+
+    def test_schema_of_empty_result(self, connector, collection):
+        """Test an empty pipeline result has no columns."""
+        collection.aggregate.return_value = iter([])
+
+        assert connector.get_pipeline_schema("users", []) == []
+
+
+class TestExecuteMany:
+    """Test mixed bulk operations."""
+
+    def test_single_bulk_write(self, connector, collection):
+        """Test mixed operations share one bulk write that keeps their order."""
+        result = collection.bulk_write.return_value
+        result.inserted_count = 1
+        result.upserted_count = 0
+        result.modified_count = 1
+        result.deleted_count = 1
+
+        query_result = connector.executemany(
+            "users",
+            [
+                {"operation": "insert", "document": {"name": "a"}},
+                {"operation": "update", "filter": {"_id": 1}, "document": {"n": 2}},
+                {"operation": "delete", "filter": {"_id": 2}},
+            ],
+        )
+
+        assert query_result.affected_rows == 3
+        operations = collection.bulk_write.call_args.args[0]
+        assert operations == [
+            InsertOne({"name": "a"}),
+            UpdateOne({"_id": 1}, {"$set": {"n": 2}}, upsert=False),
+            DeleteOne({"_id": 2}),
+        ]
+        assert collection.bulk_write.call_args.kwargs == {"ordered": True}
+        collection.update_one.assert_not_called()
+        collection.insert_many.assert_not_called()
+
+    def test_single_operation_type_unordered(self, connector, collection):
+        """Test operations of one type are sent as an unordered bulk write."""
+        connector.executemany(
+            "users",
+            [{"operation": "insert", "document": {"n": i}} for i in range(2)],
+        )
+
+        assert collection.bulk_write.call_args.kwargs == {"ordered": False}
+
+    def test_empty_list(self, connector, collection):
+        """Test no operations means no bulk write."""
+        assert connector.executemany("users", []).affected_rows == 0
+        collection.bulk_write.assert_not_called()
+
+
+class TestFetchIter:
+    """Test cursor iteration."""
+
+    def test_default_batch_size_left_to_driver(self, connector, collection):
+        """Test the cursor batch size is only set when asked for."""
+        collection.find.return_value = iter([{"name": "a"}])
+
+        assert list(connector.scan_table("users")) == [{"name": "a"}]
+        assert not hasattr(collection.find.return_value, "batch_size")
+
+    def test_explicit_batch_size(self, connector, collection):
+        """Test an explicit batch size is passed to the cursor."""
+        cursor = collection.find.return_value
+        cursor.batch_size.return_value = iter([{"name": "a"}])
+
+        assert list(connector.scan_table("users", batch_size=50)) == [{"name": "a"}]
+        cursor.batch_size.assert_called_once_with(50)
+
+    def test_object_ids_left_as_decoded(self, connector, collection):
+        """Test fetchiter yields documents untouched unless asked to convert."""
+        oid = ObjectId()
+        collection.find.return_value = iter([{"_id": oid}])
+
+        assert list(connector.fetchiter("users")) == [{"_id": oid}]
+
+    def test_scan_table_stringifies_object_ids(self, connector, collection):
+        """Test scanned documents carry string ids for serialization."""
+        oid = ObjectId()
+        collection.find.return_value = iter([{"_id": oid, "name": "a"}])
+
+        assert list(connector.scan_table("users")) == [{"_id": str(oid), "name": "a"}]
+
+
+class TestScanTable:
+    """Test collection scans."""
+
+    @pytest.mark.parametrize(
+        "columns,include_id,expected",
+        [
+            (["email"], False, {"email": 1, "_id": 0}),
+            (["email"], True, {"email": 1, "_id": 1}),
+            (["_id", "email"], False, {"_id": 1, "email": 1}),
+            (None, False, None),
+        ],
+    )
+    def test_id_projection(self, connector, collection, columns, include_id, expected):
+        """Test _id is only fetched when requested."""
+        collection.find.return_value = iter([])
+
+        list(connector.scan_table("users", columns, include_id=include_id))
+
+        assert collection.find.call_args.args == ({}, expected)
+
+
+class TestReadPreference:
+    """Test which reads may be served by secondaries."""
+
+    def test_scans_prefer_secondaries(self, connector, collection):
+        """Test table scans and schema sampling read from secondaries."""
+        db = connector._client["db"]
+        collection.find.return_value = iter([])
+        collection.aggregate.return_value = iter([])
+
+        list(connector.scan_table("users"))
+        connector.get_columns("users")
+
+        db.get_collection.assert_called_once_with(
+            "users", read_preference=SecondaryPreferred()
+        )
+
+    def test_writes_use_default_preference(self, connector, collection):
+        """Test the write path never asks for a secondary."""
+        connector.update_rows("users", [({"_id": 1}, {"name": "a"})])
+
+        connector._client["db"].get_collection.assert_not_called()
+
+
+class TestFetchIterChunks:
+    """Test chunked cursor iteration."""
+
+    def test_chunks_with_partial_tail(self, connector, collection):
+        """Test documents are grouped into lists with a short final chunk."""
+        collection.find.return_value = iter([{"n": i} for i in range(5)])
+
+        chunks = list(connector.fetchiter_chunks("users", batch_size=2))
+
+        assert [[doc["n"] for doc in chunk] for chunk in chunks] == [
+            [0, 1],
+            [2, 3],
+            [4],
+        ]
+        assert not hasattr(collection.find.return_value, "batch_size")
+
+    def test_empty_collection(self, connector, collection):
+        """Test an empty cursor yields no chunks."""
+        collection.find.return_value = iter([])
+
+        assert list(connector.fetchiter_chunks("users")) == []
+
+
+class TestGetTables:
+    """Test collection listing."""
+
+    def test_counts_come_from_coll_stats(self, connector, monkeypatch):
+        """Test counts and sizes are read from one collStats call."""
+        db = connector._client["db"]
+        db.list_collection_names.return_value = ["users"]
+        db.command.return_value = {"count": 42, "size": 1024}
+        monkeypatch.setattr(connector, "get_columns", lambda *a: [])
+
+        (table,) = connector.get_tables()
+
+        assert (table.name, table.row_count, table.size_bytes) == ("users", 42, 1024)
+        db.command.assert_called_once_with(
+            "collStats", "users", read_preference=SecondaryPreferred()
+        )
+        db["users"].count_documents.assert_not_called()
+
+    def test_stats_failure_leaves_counts_unknown(self, connector, monkeypatch):
+        """Test a collection without stats never falls back to a full scan."""
+        db = connector._client["db"]
+        db.list_collection_names.return_value = ["view"]
+        db.command.side_effect = OperationFailure("not a collection")
+        monkeypatch.setattr(connector, "get_columns", lambda *a: [])
+
+        (table,) = connector.get_tables()
+
+        assert table.row_count is None and table.size_bytes is None
+        db["view"].count_documents.assert_not_called()
+
+    def test_columns_sampled_for_every_collection(self, connector, monkeypatch):
+        """Test every collection gets its own sampled schema, in order."""
+        db = connector._client["db"]
+        db.list_collection_names.return_value = ["users", "orders", "events"]
+        db.command.return_value = {"count": 1, "size": 10}
+        monkeypatch.setattr(
+            connector, "get_columns", lambda name, schema: [ColumnInfo(name, "str")]
+        )
+
+        tables = connector.get_tables()
+
+        assert [t.columns[0].name for t in tables] == ["users", "orders", "events"]
+
+
+class TestGetColumns:
+    """Test schema inference."""
+
+    def test_uses_random_sample(self, connector, collection):
+        """Test columns are inferred from a $sample rather than the first rows."""
+        collection.aggregate.return_value = iter([{"_id": 1, "email": None}])
+
+        columns = connector.get_columns("users")
+
+        collection.aggregate.assert_called_once_with([{"$sample": {"size": 100}}])
+        collection.find.assert_not_called()
+        assert [(c.name, c.is_primary_key, c.nullable) for c in columns] == [
+            ("_id", True, False),
+            ("email", False, True),
+        ]
+
+    def test_mixed_types(self, connector, collection):
+        """Test fields with several value types are reported as mixed."""
+        collection.aggregate.return_value = iter(
+            [{"age": 1}, {"age": "one"}, {"age": None}, {"age": 2}]
+        )
+
+        (column,) = connector.get_columns("users")
+
+        assert column.data_type == "mixed(NoneType, int, str)"
+        assert column.nullable
+
+
+class TestCreateIndex:
+    """Test index creation."""
+
+    def test_background_by_default(self, connector, collection):
+        """Test index builds default to background but can be overridden."""
+        connector.create_index("users", [("email", ASCENDING)])
+        connector.create_index("users", [("name", ASCENDING)], background=False)
+
+        assert collection.create_index.call_args_list == [
+            call([("email", ASCENDING)], background=True),
+            call([("name", ASCENDING)], background=False),
+        ]
+
+    def test_create_indexes_in_one_command(self, connector, collection):
+        """Test several indexes are created with a single create_indexes call."""
+        collection.create_indexes.return_value = ["email_1", "name_-1"]
+
+        names = connector.create_indexes(
+            "users", [[("email", ASCENDING)], [("name", DESCENDING)]], sparse=True
+        )
+
+        assert names == ["email_1", "name_-1"]
+        (models,) = collection.create_indexes.call_args.args
+        assert [model.document for model in models] == [
+            {
+                "key": {"email": 1},
+                "name": "email_1",
+                "background": True,
+                "sparse": True,
+            },
+            {
+                "key": {"name": -1},
+                "name": "name_-1",
+                "background": True,
+                "sparse": True,
+            },
+        ]
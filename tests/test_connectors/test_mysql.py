@@ -0,0 +1,445 @@
+"""Tests for the MySQL connector."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+pymysql = pytest.importorskip("pymysql")
+
+from pymysql.constants import CLIENT  # noqa: E402
+from pymysql.cursors import Cursor, DictCursor, SSCursor  # noqa: E402
+
+from anonimize.connectors.base import ConnectionConfig  # noqa: E402
+from anonimize.connectors.mysql import MySQLConnector  # noqa: E402
+
+
+@pytest.fixture
+def connector():
+    """Create a connector whose pool hands out a mock connection."""
+    connector = MySQLConnector(ConnectionConfig(host="localhost", database="db"))
+    connector._pool = MagicMock()
+    return connector
+
+
+@pytest.fixture
+def connection(connector):
+    """Return the mock connection the pool hands out."""
+    return connector._pool.acquire.return_value
+
+
+@pytest.fixture
+def cursor(connection):
+    """Return the mock cursor opened on the connection."""
+    return connection.cursor.return_value.__enter__.return_value
+
+
+class TestUpdateRows:
+    """Test batched row updates."""
+
+    @pytest.fixture
+    def connector(self, connector):
+        """Hand out the mock connection for multi-statement queries too."""
+        connector._multi_pool = connector._pool
+        return connector
+
+    @pytest.fixture
+    def cursor(self, cursor):
+        """Bind parameters like PyMySQL and report one result set per call."""
+        cursor.mogrify.side_effect = lambda query, row: query % tuple(map(repr, row))
+        cursor.nextset.return_value = None
+        return cursor
+
+    def test_one_round_trip_per_column_shape(self, connector, connection, cursor):
+        """Test updates sharing columns are sent together, one commit each."""
+        cursor.rowcount = 2
+        cursor.nextset.side_effect = [True, None, None]
+        updates = [
+            ({"id": 1}, {"email": "a@example.com"}),
+            ({"id": 2}, {"email": "b@example.com"}),
+            ({"id": 3}, {"email": "c@example.com", "name": "C"}),
+        ]
+
+        assert connector.update_rows("users", updates) == 6
+
+        assert [call.args for call in cursor.execute.call_args_list] == [
+            (
+                "UPDATE `db`.`users` SET `email` = 'a@example.com' WHERE `id` = 1;\n"
+                "UPDATE `db`.`users` SET `email` = 'b@example.com' WHERE `id` = 2",
+            ),
+            (
+                "UPDATE `db`.`users` SET `email` = 'c@example.com', `name` = 'C' "
+                "WHERE `id` = 3",
+            ),
+        ]
+        cursor.executemany.assert_not_called()
+        assert connection.commit.call_count == 2
+        connector._pool.release.assert_called_once_with(connection)
+
+    def test_batch_size_respected(self, connector, cursor):
+        """Test a large group is split into batch_size statements."""
+        cursor.rowcount = 1
+        updates = [({"id": i}, {"email": "x"}) for i in range(5)]
+
+        connector.update_rows("users", updates, batch_size=2)
+
+        sizes = [len(call.args[0].split(";")) for call in cursor.execute.call_args_list]
+        assert sizes == [2, 2, 1]
+
+    def test_failed_batch_rolled_back(self, connector, connection, cursor):
+        """Test a failed batch's partial updates aren't committed by the next call."""
+        manager = MagicMock()
+        manager.attach_mock(connection.rollback, "rollback")
+        manager.attach_mock(connection.commit, "commit")
+        cursor.execute.side_effect = [pymysql.err.OperationalError("lost"), None]
+        cursor.rowcount = 1
+        updates = [({"id": 1}, {"email": "x"}), ({"id": 2}, {"email": "y"})]
+
+        with pytest.raises(pymysql.err.OperationalError):
+            connector.update_rows("users", updates)
+        assert connector.update_rows("users", updates) == 1
+
+        assert [name for name, _, _ in manager.mock_calls] == ["rollback", "commit"]
+        assert connector._pool.release.call_count == 2
+
+    def test_statement_bytes_bounded(self, connector, connection, cursor):
+        """Test a batch is split into queries under MAX_STATEMENT_BYTES."""
+        connector.MAX_STATEMENT_BYTES = 120
+        updates = [({"id": i}, {"email": "x"}) for i in range(5)]
+
+        connector.update_rows("users", updates)
+
+        queries = [call.args[0] for call in cursor.execute.call_args_list]
+        assert [len(query.split(";")) for query in queries] == [2, 2, 1]
+        assert all(len(query.encode()) <= 120 for query in queries)
+        connection.commit.assert_called_once_with()
+
+    def test_pool_created_on_demand(self):
+        """Test update_rows builds its multi-statement pool when first used."""
+        connector = MySQLConnector(ConnectionConfig(host="localhost", database="db"))
+        connector.connect = MagicMock()
+
+        connector.update_rows("users", [])
+
+        connector.connect.assert_called_once_with(multi_statements=True)
+        assert connector._multi_pool.get_stats()["available"] == 1
+        assert connector.get_pool_stats() == {"status": "not_initialized"}
+
+
+class TestConnect:
+    """Test connection options."""
+
+    def test_multi_statements_off_by_default(self, monkeypatch):
+        """Test pooled connections for execute() can't run stacked queries."""
+        connect = MagicMock()
+        monkeypatch.setattr(pymysql, "connect", connect)
+        config = ConnectionConfig(extra={"client_flag": CLIENT.FOUND_ROWS})
+
+        MySQLConnector(config).connect()
+
+        assert connect.call_args.kwargs["client_flag"] == CLIENT.FOUND_ROWS
+
+    def test_multi_statements_enabled(self, monkeypatch):
+        """Test multi-statements are added to any caller-supplied flags."""
+        connect = MagicMock()
+        monkeypatch.setattr(pymysql, "connect", connect)
+        config = ConnectionConfig(extra={"client_flag": CLIENT.FOUND_ROWS})
+
+        MySQLConnector(config).connect(multi_statements=True)
+
+        assert connect.call_args.kwargs["client_flag"] == (
+            CLIENT.FOUND_ROWS | CLIENT.MULTI_STATEMENTS
+        )
+
+
+class TestPooling:
+    """Test connection reuse across calls."""
+
+    def test_execute_reuses_one_connection(self):
+        """Test repeated queries share a lazily created pooled connection."""
+        connector = MySQLConnector(ConnectionConfig(host="localhost", database="db"))
+        connection = MagicMock()
+        connector.connect = MagicMock(return_value=connection)
+
+        connector.execute("SELECT 1")
+        connector.execute("SELECT 1")
+
+        connector.connect.assert_called_once_with()
+        assert connection.ping.call_count == 2
+        connection.ping.assert_called_with(reconnect=True)
+        assert connector.get_pool_stats()["in_use"] == 0
+
+    def test_fetchiter_uses_pooled_connection(self, connector, connection):
+        """Test streaming opens a server-side cursor on a pooled connection."""
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.description = (("id",),)
+        cursor.fetchmany.side_effect = [[(1,), (2,)], []]
+
+        assert list(connector.fetchiter("SELECT id FROM users")) == [
+            {"id": 1},
+            {"id": 2},
+        ]
+        connection.cursor.assert_called_once_with(SSCursor)
+        connector._pool.release.assert_called_once_with(connection)
+
+    def test_transaction_ended_before_release(self, connector, connection):
+        """Test a pooled connection is rolled back before it is reused."""
+        manager = MagicMock()
+        manager.attach_mock(connection.rollback, "rollback")
+        manager.attach_mock(connector._pool.release, "release")
+
+        connector.execute("UPDATE users SET name = 'x'")
+
+        assert [name for name, _, _ in manager.mock_calls] == ["rollback", "release"]
+        connection.commit.assert_not_called()
+
+    def test_close_disconnects_pooled_connections(self):
+        """Test close() closes idle connections in both pools."""
+        connector = MySQLConnector(ConnectionConfig(host="localhost", database="db"))
+        plain, multi = MagicMock(), MagicMock()
+        connector.connect = MagicMock(side_effect=[plain, multi])
+
+        connector.execute("SELECT 1")
+        connector.update_rows("users", [])
+        connector.close()
+
+        plain.close.assert_called_once_with()
+        multi.close.assert_called_once_with()
+        assert connector.get_pool_stats() == {"status": "not_initialized"}
+
+
+class TestPrefetch:
+    """Test reading streamed results ahead of the consumer."""
+
+    @pytest.fixture
+    def cursor(self, connection):
+        """Return a streaming cursor serving ten single-row batches."""
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.description = (("id",),)
+        cursor.fetchmany.side_effect = [[(i,)] for i in range(10)] + [[]]
+        return cursor
+
+    def test_rows_arrive_in_order(self, connector, cursor):
+        """Test prefetched batches are yielded in cursor order."""
+        rows = list(connector.fetchiter("SELECT id FROM t", batch_size=1))
+
+        assert rows == [{"id": i} for i in range(10)]
+
+    def test_early_close_stops_reader(self, connector, connection, cursor):
+        """Test abandoning the iterator stops reading and frees the connection."""
+        rows = connector.fetchiter("SELECT id FROM t", batch_size=1)
+        next(rows)
+        rows.close()
+
+        assert cursor.fetchmany.call_count < 10
+        connection.cursor.return_value.__exit__.assert_called_once()
+        connector._pool.release.assert_called_once_with(connection)
+
+    def test_reader_errors_propagate(self, connector, cursor):
+        """Test a failure in the reader thread is raised to the consumer."""
+        cursor.fetchmany.side_effect = RuntimeError("lost connection")
+
+        with pytest.raises(RuntimeError, match="lost connection"):
+            list(connector.fetchiter("SELECT id FROM t"))
+        connector._pool.release.assert_called_once()
+
+
+class TestScanTable:
+    """Test choosing between streamed and buffered scans."""
+
+    @pytest.fixture
+    def fetchiter(self, connector, monkeypatch):
+        """Record fetchiter calls instead of running them."""
+        fetchiter = MagicMock()
+        monkeypatch.setattr(connector, "fetchiter", fetchiter)
+        return fetchiter
+
+    @pytest.mark.parametrize(
+        "estimate, streaming", [((), True), (((50,),), False), (((10**6,),), True)]
+    )
+    def test_streams_large_or_unknown_tables(
+        self, connector, fetchiter, monkeypatch, estimate, streaming
+    ):
+        """Test only tables above the threshold, or unknown, are streamed."""
+        monkeypatch.setattr(connector, "_fetchall", lambda query, params: estimate)
+
+        connector.scan_table("users")
+
+        assert fetchiter.call_args.kwargs["streaming"] is streaming
+
+    def test_identifiers_are_quoted(self, connector, fetchiter):
+        """Test names are backtick-quoted with embedded backticks doubled."""
+        connector.scan_table("odd`name", columns=["id", "a`b"], streaming=True)
+
+        assert fetchiter.call_args.args[0] == (
+            "SELECT `id`, `a``b` FROM `db`.`odd``name`"
+        )
+
+    def test_explicit_choice_skips_estimate(self, connector, fetchiter, monkeypatch):
+        """Test an explicit streaming flag doesn't query the catalog."""
+        monkeypatch.setattr(connector, "_fetchall", MagicMock())
+
+        connector.scan_table("users", streaming=False)
+
+        connector._fetchall.assert_not_called()
+        assert fetchiter.call_args.kwargs["streaming"] is False
+
+    def test_buffered_fetchiter_uses_client_cursor(self, connector, connection):
+        """Test non-streaming reads use the buffered tuple cursor."""
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchmany.return_value = []
+
+        list(connector.fetchiter("SELECT 1", streaming=False))
+
+        connection.cursor.assert_called_once_with(Cursor)
+
+
+class TestScanTables:
+    """Test scanning several tables concurrently."""
+
+    @pytest.fixture
+    def scans(self, connector, monkeypatch):
+        """Serve canned rows per table and record which scans are open."""
+        data = {"a": [1, 2, 3], "b": [4], "c": [5, 6]}
+        opened, closed = [], []
+
+        def scan_table(name, schema=None, batch_size=1000, streaming=None):
+            opened.append(name)
+            try:
+                for value in data[name]:
+                    yield {"v": value}
+            finally:
+                closed.append(name)
+
+        monkeypatch.setattr(connector, "scan_table", scan_table)
+        return opened, closed
+
+    def test_tables_take_turns(self, connector, scans):
+        """Test batches interleave across tables, limited to max_concurrent."""
+        rows = connector.scan_tables(["a", "b", "c"], batch_size=2, max_concurrent=2)
+
+        assert [(name, row["v"]) for name, row in rows] == [
+            ("a", 1),
+            ("a", 2),
+            ("b", 4),
+            ("a", 3),
+            ("c", 5),
+            ("c", 6),
+        ]
+
+    def test_early_close_closes_open_scans(self, connector, scans):
+        """Test abandoning the scan closes every table still streaming."""
+        opened, closed = scans
+        rows = connector.scan_tables(["a", "b", "c"], batch_size=1)
+        next(rows)
+        rows.close()
+
+        assert set(closed) == set(opened)
+
+
+class TestExecuteMany:
+    """Test repeated statements."""
+
+    def test_passes_through_to_driver(self, connector, cursor):
+        """Test inserts go to PyMySQL's executemany, which batches them."""
+        cursor.rowcount = 2
+        query = "INSERT INTO users (name) VALUES (%s)"
+
+        result = connector.executemany(query, [("a",), ("b",)])
+
+        cursor.executemany.assert_called_once_with(query, [("a",), ("b",)])
+        assert result.affected_rows == 2
+
+    def test_empty_list(self, connector):
+        """Test nothing is sent and no rows are reported for no parameters."""
+        assert connector.executemany("INSERT INTO t VALUES (%s)", []).affected_rows == 0
+        connector._pool.acquire.assert_not_called()
+
+
+class TestGetTables:
+    """Test catalog reads."""
+
+    @pytest.fixture
+    def catalog(self, connector, monkeypatch):
+        """Serve canned catalog rows and record each query's parameters."""
+        results = {
+            "TABLES": (("orders", "db", 5, 1), ("users", "db", 9, 2)),
+            "COLUMNS": (
+                ("id", "int", "NO", None, None, "PRI", "orders"),
+                ("total", "decimal", "YES", None, None, "", "orders"),
+                ("id", "int", "NO", None, None, "PRI", "users"),
+            ),
+            "KEY_COLUMN_USAGE": (("orders", "id"), ("users", "id")),
+        }
+        calls = []
+
+        def fetchall(query, parameters=None):
+            calls.append((query, parameters))
+            for view, rows in results.items():
+                if f"information_schema.{view}" in query:
+                    return rows
+
+        monkeypatch.setattr(connector, "_fetchall", fetchall)
+        return calls
+
+    def test_three_queries_for_whole_schema(self, connector, catalog):
+        """Test columns and keys are fetched in bulk, not per table."""
+        tables = connector.get_tables("db")
+
+        assert [params for _, params in catalog] == [("db",)] * 3
+        assert [t.name for t in tables] == ["orders", "users"]
+        assert [c.name for c in tables[0].columns] == ["id", "total"]
+        assert tables[0].columns[0].is_primary_key
+        assert [t.primary_key for t in tables] == [["id"], ["id"]]
+
+    def test_cached_until_ttl(self, connector, catalog, monkeypatch):
+        """Test repeated calls reuse the catalog until it expires."""
+        connector.get_tables()
+        connector.get_tables()
+        assert len(catalog) == 3
+
+        monkeypatch.setattr(connector, "SCHEMA_CACHE_TTL", 0)
+        connector.get_tables()
+        assert len(catalog) == 6
+
+    def test_single_table_lookups_use_positional_parameters(self, connector, catalog):
+        """Test per-table lookups pass a tuple matching their placeholders."""
+        connector.get_columns("users", "db")
+        connector.get_primary_key("users", "db")
+
+        assert [params for _, params in catalog] == [("db", "users")] * 2
+
+    def test_default_schema_uses_session_database(self, connector, catalog):
+        """Test lookups without a schema filter on DATABASE() unbound."""
+        connector.get_tables()
+        connector.get_columns("users")
+
+        assert all("TABLE_SCHEMA = DATABASE()" in query for query, _ in catalog)
+        assert [params for _, params in catalog] == [None] * 3 + [("users",)]
+
+
+class TestTupleCursors:
+    """Test which queries build dict rows."""
+
+    def test_execute_returns_dict_rows(self, connector, connection):
+        """Test execute() keeps returning rows keyed by column name."""
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.description = (("id",),)
+        cursor.fetchall.return_value = [{"id": 1}]
+
+        assert connector.execute("SELECT id FROM users").rows == [{"id": 1}]
+        connection.cursor.assert_called_once_with(DictCursor)
+
+    def test_test_connection_only_pings(self, connector, connection):
+        """Test the connection check pings instead of running a query."""
+        assert connector.test_connection()
+
+        connection.ping.assert_called_once_with(reconnect=True)
+        connection.cursor.assert_not_called()
+        connector._pool.release.assert_called_once_with(connection)
+
+    def test_test_connection_failure(self, connector, connection):
+        """Test a failed ping reports the connection as down."""
+        connection.ping.side_effect = OSError("gone")
+
+        assert not connector.test_connection()
+        connector._pool.release.assert_called_once_with(connection)
@@ -0,0 +1,253 @@
+"""Tests for the PostgreSQL connector."""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+psycopg2_extras = pytest.importorskip("psycopg2.extras")
+
+from anonimize.connectors import postgres  # noqa: E402
+from anonimize.connectors.postgres import PostgreSQLConnector  # noqa: E402
+
+
+@pytest.fixture
+def connector():
+    """Create a connector with a mock open connection."""
+    connector = PostgreSQLConnector("postgresql://u@localhost/db")
+    connector._connection = MagicMock()
+    return connector
+
+
+@pytest.fixture
+def cursor(connector):
+    """Return the mock cursor the connection hands out."""
+    return connector._connection.cursor.return_value
+
+
+class TestExecuteMany:
+    """Test paged bulk statements."""
+
+    def test_insert_uses_execute_values(self, connector, cursor, monkeypatch):
+        """Test multi-row INSERTs are expanded by execute_values."""
+        execute_values = MagicMock()
+        monkeypatch.setattr(psycopg2_extras, "execute_values", execute_values)
+        query = "insert into users (name) values %s"
+
+        connector.execute_many(query, [("a",), ("b",)], page_size=100)
+
+        execute_values.assert_called_once_with(
+            cursor, query, [("a",), ("b",)], page_size=100
+        )
+        connector._connection.commit.assert_called_once_with()
+
+    def test_update_uses_execute_batch(self, connector, cursor, monkeypatch):
+        """Test other statements are paged with execute_batch."""
+        execute_batch = MagicMock()
+        monkeypatch.setattr(psycopg2_extras, "execute_batch", execute_batch)
+        query = "UPDATE users SET name = %s WHERE id = %s"
+
+        connector.execute_many(query, [("a", 1)])
+
+        execute_batch.assert_called_once_with(cursor, query, [("a", 1)], page_size=500)
+
+
+class TestReadTable:
+    """Test batched row reads."""
+
+    def test_server_side_cursor(self, connector, cursor):
+        """Test a named cursor streams the table and is closed afterwards."""
+        cursor.description = (("id", 23),)
+        cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+        batches = list(connector.read_table("users", batch_size=2))
+
+        assert batches == [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+        name = connector._connection.cursor.call_args.kwargs["name"]
+        assert name.startswith("scan_")
+        assert cursor.itersize == 2
+        cursor.execute.assert_called_once_with("SELECT * FROM users")
+        cursor.close.assert_called_once_with()
+
+    def test_survives_writes_between_batches(self, connector, cursor):
+        """Test committing a write_table mid-read doesn't close the scan."""
+        cursor.description = (("id", 23),)
+        batches = iter([[(1,)], [(2,)], []])
+
+        def fetchmany(size):
+            withhold = connector._connection.cursor.call_args_list[0].kwargs.get(
+                "withhold"
+            )
+            if connector._connection.commit.called and not withhold:
+                raise psycopg2_extras.psycopg2.ProgrammingError(
+                    "named cursor isn't valid anymore"
+                )
+            return next(batches)
+
+        cursor.fetchmany.side_effect = fetchmany
+
+        for batch in connector.read_table("users", batch_size=1):
+            connector.write_table("users_anonymized", batch)
+
+        assert cursor.copy_expert.call_count == 2
+        assert connector._connection.commit.call_count == 2
+
+
+class TestReadTableArrow:
+    """Test columnar reads."""
+
+    def test_record_batches(self, connector, cursor):
+        """Test rows arrive as column-oriented record batches."""
+        pa = pytest.importorskip("pyarrow")
+        cursor.description = (
+            ("id", 23, None, 4, None, None, None),
+            ("name", 25, None, -1, None, None, None),
+            ("score", 701, None, 8, None, None, None),
+        )
+        cursor.fetchmany.side_effect = [
+            [(1, None, None), (2, "b", 1.5)],
+            [(3, None, None)],
+            [],
+        ]
+
+        batches = list(connector.read_table_arrow("users", batch_size=2))
+
+        cursor.fetchmany.assert_called_with(2)
+        assert all(isinstance(batch, pa.RecordBatch) for batch in batches)
+        table = pa.Table.from_batches(batches)
+        assert table.schema.types == [pa.int32(), pa.string(), pa.float64()]
+        assert table.to_pydict() == {
+            "id": [1, 2, 3],
+            "name": [None, "b", None],
+            "score": [None, 1.5, None],
+        }
+
+    def test_numeric_and_json_types_fixed(self, connector, cursor):
+        """Test NUMERIC and JSON columns don't depend on the first batch."""
+        pa = pytest.importorskip("pyarrow")
+        cursor.description = (
+            ("price", 1700, None, -1, 10, 3, None),
+            ("total", 1700, None, -1, None, None, None),
+            ("meta", 3802, None, -1, None, None, None),
+        )
+        cursor.fetchmany.side_effect = [
+            [(Decimal("1.5"), Decimal("1.5"), {"a": 1})],
+            [(Decimal("1234.125"), Decimal("1e40"), {"b": "x"})],
+            [],
+        ]
+
+        table = pa.Table.from_batches(
+            connector.read_table_arrow("orders", batch_size=1)
+        )
+
+        assert table.schema.types == [pa.decimal128(10, 3), pa.string(), pa.string()]
+        assert table.to_pydict() == {
+            "price": [Decimal("1.500"), Decimal("1234.125")],
+            "total": ["1.5", "1E+40"],
+            "meta": ['{"a": 1}', '{"b": "x"}'],
+        }
+
+    def test_all_null_first_batch(self, connector, cursor):
+        """Test batches share one schema even when the first is all NULL."""
+        pa = pytest.importorskip("pyarrow")
+        cursor.description = tuple(
+            (name, oid, None, -1, None, None, None)
+            for name, oid in [("seen", 1114), ("key", 2950), ("raw", 17), ("ip", 869)]
+        )
+        key = uuid.UUID(int=1)
+        cursor.fetchmany.side_effect = [
+            [(None, None, None, None)],
+            [(datetime(2000, 1, 1), key, memoryview(b"ab"), "10.0.0.1")],
+            [],
+        ]
+
+        batches = list(connector.read_table_arrow("events", batch_size=1))
+
+        assert batches[0].schema == batches[1].schema
+        table = pa.Table.from_batches(batches)
+        assert table.schema.types == [
+            pa.timestamp("us"),
+            pa.string(),
+            pa.binary(),
+            pa.string(),
+        ]
+        assert table.to_pydict() == {
+            "seen": [None, datetime(2000, 1, 1)],
+            "key": [None, str(key)],
+            "raw": [None, b"ab"],
+            "ip": [None, "10.0.0.1"],
+        }
+
+
+class TestWriteTable:
+    """Test COPY-based writes."""
+
+    def test_streams_rows_to_copy(self, connector, cursor, monkeypatch):
+        """Test rows stream through one COPY in bounded reads, committed once."""
+        monkeypatch.setattr(postgres, "_COPY_CHUNK_SIZE", 16)
+        reads = []
+
+        def copy_expert(sql, file, size):
+            while chunk := file.read(size):
+                reads.append(chunk)
+
+        cursor.copy_expert.side_effect = copy_expert
+        data = [{"id": i, "name": f"user{i}"} for i in range(5)]
+
+        assert connector.write_table("users", data) == 5
+
+        assert cursor.copy_expert.call_args.args[0] == (
+            'COPY users ("id", "name") ' "FROM STDIN WITH (FORMAT text, NULL '')"
+        )
+        assert max(len(chunk) for chunk in reads) <= 16
+        assert b"".join(reads).decode().splitlines() == [
+            f"{i}\tuser{i}" for i in range(5)
+        ]
+        connector._connection.commit.assert_called_once_with()
+
+    def test_escapes_text_format(self, connector, cursor):
+        """Test special characters are escaped and None becomes NULL."""
+        reads = []
+        cursor.copy_expert.side_effect = lambda sql, f, size: reads.append(f.read())
+
+        connector.write_table("t", [{"a": "x\ty\\z\n", "b": None}])
+
+        assert reads == [b"x\\ty\\\\z\\n\t\n"]
+
+    def test_columns_quoted(self, connector, cursor):
+        """Test reserved, mixed-case and quoted column names are quoted."""
+        connector.write_table("t", [{"user": 1, "Email": 2, 'a"b': 3}])
+
+        assert cursor.copy_expert.call_args.args[0].startswith(
+            'COPY t ("user", "Email", "a""b") FROM STDIN'
+        )
+
+
+class TestPipeline:
+    """Test queued multi-statement round-trips."""
+
+    def test_statements_sent_together(self, connector, cursor):
+        """Test queued statements are joined into one execute and commit."""
+        cursor.mogrify.side_effect = lambda query, params: query.encode()
+
+        with connector.pipeline() as p:
+            p.execute("INSERT INTO a VALUES (%s)", (1,))
+            p.execute("DELETE FROM b")
+            cursor.execute.assert_not_called()
+
+        cursor.execute.assert_called_once_with(
+            b"INSERT INTO a VALUES (%s);\nDELETE FROM b"
+        )
+        connector._connection.commit.assert_called_once_with()
+
+    def test_error_discards_queue(self, connector, cursor):
+        """Test nothing is sent when the block raises."""
+        with pytest.raises(RuntimeError):
+            with connector.pipeline() as p:
+                p.execute("DELETE FROM b")
+                raise RuntimeError
+
+        cursor.execute.assert_not_called()
+        connector._connection.commit.assert_not_called()
@@ -0,0 +1,357 @@
+"""Tests for the pooled PostgreSQL connector."""
+
+import struct
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+from anonimize.connectors import postgresql  # noqa: E402
+from anonimize.connectors.base import ConnectionConfig  # noqa: E402
+from anonimize.connectors.postgresql import PostgreSQLConnector  # noqa: E402
+
+
+@pytest.fixture
+def connector():
+    """Create a connector whose pool hands out a mock connection."""
+    connector = PostgreSQLConnector(ConnectionConfig(host="localhost", database="db"))
+    connector._pg_pool = MagicMock()
+    return connector
+
+
+@pytest.fixture
+def connection(connector):
+    """Return the mock connection the pool hands out."""
+    return connector._pg_pool.getconn.return_value
+
+
+@pytest.fixture
+def cursor(connection):
+    """Return the mock cursor opened on the connection."""
+    return connection.cursor.return_value.__enter__.return_value
+
+
+class TestUpdateRows:
+    """Test batched row updates."""
+
+    @pytest.fixture
+    def execute_values(self, connector, monkeypatch):
+        """Record execute_values calls and serve canned column types."""
+        execute_values = MagicMock()
+        monkeypatch.setattr(postgresql.extras, "execute_values", execute_values)
+        monkeypatch.setattr(
+            connector,
+            "_column_types",
+            lambda table, schema=None: [("id", "integer"), ("born", "date")],
+        )
+        return execute_values
+
+    def test_update_from_values_per_column_shape(
+        self, connector, connection, cursor, execute_values
+    ):
+        """Test each column shape is sent as one typed UPDATE ... FROM VALUES."""
+        cursor.rowcount = 2
+        updates = [
+            ({"id": 1}, {"born": "2000-01-01"}),
+            ({"id": 2}, {"born": "2001-01-01"}),
+            ({"id": 3}, {"born": None, "note": "x"}),
+        ]
+
+        assert connector.update_rows("users", updates) == 4
+
+        calls = execute_values.call_args_list
+        assert [(c.args[1:], c.kwargs["template"]) for c in calls] == [
+            (
+                (
+                    'UPDATE "public"."users" AS t SET "born" = data.v0 '
+                    'FROM (VALUES %s) AS data(v0, v1) WHERE t."id" = data.v1',
+                    [("2000-01-01", 1), ("2001-01-01", 2)],
+                ),
+                "(%s::date, %s::integer)",
+            ),
+            (
+                (
+                    'UPDATE "public"."users" AS t SET "born" = data.v0, '
+                    '"note" = data.v1 '
+                    "FROM (VALUES %s) AS data(v0, v1, v2) "
+                    'WHERE t."id" = data.v2',
+                    [(None, "x", 3)],
+                ),
+                "(%s::date, %s, %s::integer)",
+            ),
+        ]
+        assert connection.commit.call_count == 2
+        connector._pg_pool.putconn.assert_called_once_with(connection)
+
+    def test_batch_size_respected(self, connector, cursor, execute_values):
+        """Test each batch is sent as a single page."""
+        cursor.rowcount = 1
+        updates = [({"id": i}, {"born": None}) for i in range(5)]
+
+        connector.update_rows("users", updates, batch_size=2)
+
+        pages = [call.kwargs["page_size"] for call in execute_values.call_args_list]
+        assert pages == [2, 2, 1]
+
+    def test_column_types_without_modifiers(self, connector, monkeypatch):
+        """Test casts leave out typmods, so varchar(n) can't silently truncate."""
+        execute = MagicMock()
+        execute.return_value.rows = [{"name": "name", "type": "character varying"}]
+        monkeypatch.setattr(connector, "execute", execute)
+
+        assert connector._column_types("users") == [("name", "character varying")]
+        assert "format_type(atttypid, NULL)" in execute.call_args.args[0]
+
+    def test_last_update_per_row_wins(self, connector, cursor, execute_values):
+        """Test a row updated twice in a batch is sent once, with its last values."""
+        cursor.rowcount = 2
+        updates = [
+            ({"id": 1}, {"born": "2000-01-01"}),
+            ({"id": 2}, {"born": "2001-01-01"}),
+            ({"id": 1}, {"born": "2002-01-01"}),
+        ]
+
+        connector.update_rows("users", updates)
+
+        assert execute_values.call_args.args[2] == [
+            ("2002-01-01", 1),
+            ("2001-01-01", 2),
+        ]
+        assert execute_values.call_args.kwargs["page_size"] == 2
+
+    def test_mixed_value_types_cast_per_value(self, connector, cursor, execute_values):
+        """Test each bound value is cast, so ints and strs can share a column."""
+        cursor.rowcount = 2
+        updates = [({"id": 1}, {"born": None}), ({"id": "2"}, {"born": None})]
+
+        connector.update_rows("users", updates)
+
+        call = execute_values.call_args
+        assert call.kwargs["template"] == "(%s::date, %s::integer)"
+        assert call.args[2] == [(None, 1), (None, "2")]
+        assert "::" not in call.args[1]
+
+
+class TestBulkInsert:
+    """Test COPY-based inserts."""
+
+    @pytest.fixture
+    def copied(self, connector, cursor, monkeypatch):
+        """Record each COPY statement and its payload."""
+        monkeypatch.setattr(
+            connector,
+            "_column_types",
+            lambda table, schema=None: [
+                ("id", "integer"),
+                ("name", "character varying"),
+                ("born", "date"),
+                ("seen", "timestamp without time zone"),
+                ("score", "numeric"),
+                ("ratio", "real"),
+            ],
+        )
+        copied = []
+        cursor.copy_expert.side_effect = lambda sql, f: copied.append((sql, f.read()))
+        return copied
+
+    def test_binary_copy(self, connector, connection, copied):
+        """Test supported types are sent in the binary COPY format."""
+        data = [
+            {
+                "id": 1,
+                "name": "Zoë",
+                "born": date(2000, 1, 2),
+                "seen": datetime(2000, 1, 1, 0, 0, 1),
+            },
+            {"id": 2, "name": None, "born": None, "seen": None},
+        ]
+
+        assert connector.bulk_insert("users", data) == 2
+
+        sql, payload = copied[0]
+        assert sql == (
+            'COPY "public"."users" ("id", "name", "born", "seen") '
+            "FROM STDIN WITH (FORMAT binary)"
+        )
+        name = "Zoë".encode()
+        assert payload == (
+            b"PGCOPY\n\xff\r\n\x00" + bytes(8)
+            + struct.pack(">hii", 4, 4, 1)
+            + struct.pack(">i", len(name)) + name
+            + struct.pack(">ii", 4, 1)
+            + struct.pack(">iq", 8, 1_000_000)
+            + struct.pack(">hiiiii", 4, 4, 2, -1, -1, -1)
+            + b"\xff\xff"
+        )  # fmt: skip
+        connection.commit.assert_called_once_with()
+
+    def test_unsupported_type_uses_text(self, connector, copied):
+        """Test a column without a binary encoder falls back to text COPY."""
+        connector.bulk_insert("users", [{"id": 1, "score": "1.50"}])
+
+        assert copied == [
+            (
+                'COPY "public"."users" ("id", "score") FROM STDIN WITH (FORMAT text)',
+                "1\t1.50\n",
+            )
+        ]
+
+    def test_mismatched_value_uses_text(self, connector, copied):
+        """Test a value the binary encoder rejects falls back to text COPY."""
+        connector.bulk_insert("users", [{"id": "7", "name": "a\tb"}, {"id": None}])
+
+        assert copied[0][0].endswith("(FORMAT text)")
+        assert copied[0][1] == "7\ta\\tb\n\\N\t\\N\n"
+
+    def test_out_of_range_float_uses_text(self, connector, copied):
+        """Test a value too large for a binary real falls back to text COPY."""
+        connector.bulk_insert("users", [{"ratio": 1e300}])
+
+        assert copied[0] == (
+            'COPY "public"."users" ("ratio") FROM STDIN WITH (FORMAT text)',
+            "1e+300\n",
+        )
+
+
+class TestPreparedStatements:
+    """Test server-side prepared statement caching in execute()."""
+
+    @pytest.fixture
+    def cursor(self, connection):
+        """Return the plain cursor execute() opens."""
+        connection.autocommit = False
+        cursor = connection.cursor.return_value
+        cursor.description = None
+        return cursor
+
+    def test_prepared_once_then_executed(self, connector, cursor):
+        """Test the first call prepares and later calls only execute."""
+        query = "SELECT * FROM users WHERE id = %s AND name LIKE 'a%%'"
+
+        connector.execute(query, (1,))
+        connector.execute(query, (2,))
+
+        name = (
+            "s_" + postgresql.hashlib.blake2b(query.encode(), digest_size=8).hexdigest()
+        )
+        assert [c.args for c in cursor.execute.call_args_list] == [
+            (
+                f"SAVEPOINT anonimize_prepare; PREPARE {name} AS "
+                "SELECT * FROM users WHERE id = $1 AND name LIKE 'a%'; "
+                "RELEASE SAVEPOINT anonimize_prepare",
+            ),
+            (f"EXECUTE {name} (%s)", [1]),
+            (f"EXECUTE {name} (%s)", [2]),
+        ]
+
+    def test_named_parameters_numbered(self):
+        """Test named placeholders map to $n in first-use order."""
+        query, args = postgresql._number_placeholders(
+            "SELECT %(b)s, %(a)s, %(b)s", {"a": 1, "b": 2}
+        )
+
+        assert query == "SELECT $1, $2, $1"
+        assert args == [2, 1]
+
+    def test_failed_prepare_runs_unprepared(self, connector, cursor):
+        """Test a query PREPARE rejects is rolled back and run as is."""
+        psycopg2 = pytest.importorskip("psycopg2")
+        cursor.execute.side_effect = [psycopg2.Error("no"), None, None, None]
+        query = "SELECT %s"
+
+        connector.execute(query, (1,))
+        connector.execute(query, (1,))
+
+        calls = [c.args for c in cursor.execute.call_args_list]
+        assert calls[1] == (
+            "ROLLBACK TO SAVEPOINT anonimize_prepare; "
+            "RELEASE SAVEPOINT anonimize_prepare",
+        )
+        assert calls[2:] == [(query, (1,)), (query, (1,))]
+
+    def test_eviction_deallocates(self, connector, cursor, monkeypatch):
+        """Test the least recently used statement is deallocated when full."""
+        monkeypatch.setattr(connector, "PREPARED_STATEMENT_CACHE_SIZE", 1)
+        connection = connector._pg_pool.getconn.return_value
+        connection.autocommit = True
+
+        connector.execute("SELECT 1")
+        connector.execute("SELECT 2")
+
+        first = cursor.execute.call_args_list[1].args[0].split()[1]
+        prepare = cursor.execute.call_args_list[2].args[0]
+        assert prepare.startswith(f"DEALLOCATE {first}; PREPARE ")
+        assert list(connector._prepared[connection]) == ["SELECT 2"]
+
+    def test_multiple_statements_not_prepared(self, connector, cursor):
+        """Test queries holding several statements run as they are."""
+        query = "UPDATE a SET x = 1; UPDATE b SET x = 1"
+
+        connector.execute(query)
+
+        assert [c.args for c in cursor.execute.call_args_list] == [(query,)]
+
+    def test_trailing_semicolon_prepared(self, connector, cursor):
+        """Test a single statement ending in ";" is still prepared."""
+        connector.execute("SELECT 1;\n")
+
+        prepare = cursor.execute.call_args_list[0].args[0]
+        assert prepare.endswith(" AS SELECT 1; RELEASE SAVEPOINT anonimize_prepare")
+
+    def test_opt_out_and_utility_statements(self, connector, cursor):
+        """Test prepare=False and non-preparable statements run directly."""
+        connector.execute("SELECT %s", (1,), prepare=False)
+        connector.execute("SET search_path TO app")
+
+        assert [c.args for c in cursor.execute.call_args_list] == [
+            ("SELECT %s", (1,)),
+            ("SET search_path TO app",),
+        ]
+
+    def test_stale_plan_prepared_again(self, connector, connection, cursor):
+        """Test a statement broken by DDL is replaced and the query retried."""
+        errors = pytest.importorskip("psycopg2.errors")
+        connection.get_transaction_status.return_value = (
+            postgresql.extensions.TRANSACTION_STATUS_IDLE
+        )
+        stale = errors.FeatureNotSupported("cached plan must not change result type")
+        duplicate = errors.DuplicatePreparedStatement("exists")
+        cursor.execute.side_effect = [None, None, stale, duplicate, None, None, None]
+
+        connector.execute("SELECT * FROM users")
+        connector.execute("SELECT * FROM users")
+
+        name = cursor.execute.call_args_list[1].args[0].split()[1]
+        prepare = f"PREPARE {name} AS SELECT * FROM users"
+        assert [c.args[0] for c in cursor.execute.call_args_list[2:]] == [
+            f"EXECUTE {name}",
+            f"SAVEPOINT anonimize_prepare; {prepare}; "
+            "RELEASE SAVEPOINT anonimize_prepare",
+            "ROLLBACK TO SAVEPOINT anonimize_prepare; "
+            "RELEASE SAVEPOINT anonimize_prepare",
+            f"SAVEPOINT anonimize_prepare; DEALLOCATE {name}; {prepare}; "
+            "RELEASE SAVEPOINT anonimize_prepare",
+            f"EXECUTE {name}",
+        ]
+        connection.rollback.assert_called_once_with()
+
+    def test_stale_plan_in_open_transaction_raises(self, connector, cursor):
+        """Test no retry happens when it would roll back the caller's work."""
+        errors = pytest.importorskip("psycopg2.errors")
+        stale = errors.FeatureNotSupported("cached plan must not change result type")
+        cursor.execute.side_effect = [None, stale]
+
+        with pytest.raises(errors.FeatureNotSupported):
+            connector.execute("SELECT * FROM users")
+
+        assert not any(connector._prepared.values())
+
+    def test_invalidate_cache_forgets_statements(self, connector, connection, cursor):
+        """Test invalidating the cache drops prepared statement names."""
+        connector.execute("SELECT 1")
+
+        connector.invalidate_cache()
+
+        assert connection not in connector._prepared
@@ -1,5 +1,7 @@
 """Tests for the core Anonymizer class."""
 
+import hashlib
+
 import pytest
 from unittest.mock import Mock, patch
 
@@ -233,6 +235,16 @@ class TestAnonymizerStrategies:
         result2 = anon.anonymize(data, config)
         assert result["value"] == result2["value"]
 
+    @pytest.mark.parametrize("algorithm", ["sha256", "md5", "SHA256", "blake2b"])
+    def test_hash_matches_hashlib(self, algorithm):
+        """Test hashes match hashlib for named and hashlib.new() algorithms."""
+        anon = Anonymizer()
+        config = {"value": {"strategy": "hash", "salt": "s", "algorithm": algorithm}}
+
+        result = anon.anonymize({"value": "test"}, config)
+
+        assert result["value"] == hashlib.new(algorithm, b"s:test").hexdigest()
+
     def test_mask_custom_char(self):
         """Test masking with custom character."""
         anon = Anonymizer()
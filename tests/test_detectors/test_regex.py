@@ -0,0 +1,63 @@
+"""Tests for the regex PII detector."""
+
+import re
+
+import pytest
+
+from anonimize.detectors.regex import RegexDetector
+
+
+class TestRegexDetector:
+    """Test cases for RegexDetector value matching."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("john@example.com", "email"),
+            ("555-123-4567", "phone"),
+            ("123-45-6789", "ssn"),
+            ("4111111111111111", "credit_card"),
+            ("192.168.0.1", "ipv4"),
+            ("550e8400-e29b-41d4-a716-446655440000", "uuid"),
+            ("https://example.com/a", "url"),
+        ],
+    )
+    def test_detects_value_type(self, value, expected):
+        """Test each default pattern is recognized through the combined scan."""
+        assert RegexDetector().detect(value)["value"]["type"] == expected
+
+    def test_combined_scan_matches_pattern_order(self):
+        """Test the combined scan picks the same type as trying each pattern."""
+        detector = RegexDetector()
+        values = ["", "John Doe", "12345", "1234567890", "::1", "000-12-3456"]
+
+        for value in values:
+            expected = None
+            for pii_type, config in detector.patterns.items():
+                if config["pattern"].match(value):
+                    expected = pii_type
+                    break
+            result = detector._detect_in_value(value)
+            assert (result and result["type"]) == expected
+
+    def test_add_pattern_rebuilds_scan(self):
+        """Test patterns added later are included in the scan."""
+        detector = RegexDetector()
+        detector.add_pattern("employee_id", r"EMP\d{4}", confidence=0.9)
+
+        assert detector.detect("EMP1234")["value"] == {
+            "type": "employee_id",
+            "confidence": 0.9,
+            "pattern": "employee_id",
+        }
+
+    def test_uncombinable_patterns_fall_back(self):
+        """Test flagged or backreferencing patterns still match."""
+        detector = RegexDetector(
+            custom_patterns={"code": {"pattern": re.compile("abc", re.IGNORECASE)}}
+        )
+        detector.add_pattern("repeat", r"(x)\1")
+
+        assert detector._scan is None
+        assert detector.detect("ABC")["value"]["type"] == "code"
+        assert detector.detect("xx")["value"]["type"] == "repeat"
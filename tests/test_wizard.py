@@ -0,0 +1,225 @@
+"""Tests for the interactive wizard."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from anonimize.cli import wizard
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty scan caches."""
+    wizard._DETECT_CACHE.clear()
+    wizard._PREVIEW_CACHE.clear()
+    yield
+    wizard._DETECT_CACHE.clear()
+    wizard._PREVIEW_CACHE.clear()
+
+
+@pytest.fixture
+def sample_csv():
+    """Create a sample CSV file for testing."""
+    with TemporaryDirectory() as tmpdir:
+        csv_path = Path(tmpdir) / "test.csv"
+        csv_path.write_text("name,email\nJohn Doe,john@example.com\n")
+        yield csv_path
+
+
+class TestDetectCache:
+    """Test cases for caching detection results between wizard steps."""
+
+    def test_unchanged_file_is_scanned_once(self, sample_csv, monkeypatch):
+        """Test re-entering the detect step reuses the previous scan."""
+        calls = []
+
+        def fake_detect(path):
+            calls.append(path)
+            return {"email": "email"}
+
+        monkeypatch.setattr(wizard, "detect_pii", fake_detect)
+
+        assert wizard.step_detect_pii(sample_csv) == {"email": "email"}
+        assert wizard.step_detect_pii(sample_csv) == {"email": "email"}
+        assert len(calls) == 1
+
+    def test_modified_file_is_rescanned(self, sample_csv, monkeypatch):
+        """Test a change to the file invalidates the cached scan."""
+        calls = []
+
+        def fake_detect(path):
+            calls.append(path)
+            return {"email": "email"}
+
+        monkeypatch.setattr(wizard, "detect_pii", fake_detect)
+
+        wizard.step_detect_pii(sample_csv)
+        with open(sample_csv, "a") as f:
+            f.write("Jane Doe,jane@example.com\n")
+        wizard.step_detect_pii(sample_csv)
+
+        assert len(calls) == 2
+
+    def test_failed_scan_is_not_cached(self, sample_csv, monkeypatch):
+        """Test errors are reported and retried rather than cached."""
+
+        def failing_detect(path):
+            raise ValueError("boom")
+
+        monkeypatch.setattr(wizard, "detect_pii", failing_detect)
+
+        assert wizard.step_detect_pii(sample_csv) == {}
+        assert not wizard._DETECT_CACHE
+
+
+class TestSelectSource:
+    """Test cases for choosing the input file."""
+
+    def test_missing_file_prompts_again(self, sample_csv, monkeypatch, capsys):
+        """Test a missing path is reported and the user can retry."""
+        answers = iter([str(sample_csv.parent / "missing.csv"), str(sample_csv)])
+        monkeypatch.setattr(wizard, "ask_select", lambda *a, **k: "CSV file")
+        monkeypatch.setattr(wizard, "ask_text", lambda *a, **k: next(answers))
+        monkeypatch.setattr(wizard, "ask_confirm", lambda *a, **k: True)
+
+        assert wizard.step_select_source() == sample_csv
+        assert "File not found" in capsys.readouterr().out
+
+    def test_symlink_is_resolved(self, sample_csv, monkeypatch):
+        """Test a symlinked path is followed to the real file."""
+        link = sample_csv.with_name("link.csv")
+        link.symlink_to(sample_csv)
+        monkeypatch.setattr(wizard, "ask_select", lambda *a, **k: "CSV file")
+        monkeypatch.setattr(wizard, "ask_text", lambda *a, **k: str(link))
+
+        assert wizard.step_select_source() == sample_csv.resolve()
+
+    def test_broken_symlink_is_missing(self, sample_csv, monkeypatch, capsys):
+        """Test a dangling symlink is reported as not found."""
+        link = sample_csv.with_name("dangling.csv")
+        link.symlink_to(sample_csv.with_name("gone.csv"))
+        monkeypatch.setattr(wizard, "ask_select", lambda *a, **k: "CSV file")
+        monkeypatch.setattr(wizard, "ask_text", lambda *a, **k: str(link))
+        monkeypatch.setattr(wizard, "ask_confirm", lambda *a, **k: False)
+
+        assert wizard.step_select_source() is None
+        assert "File not found" in capsys.readouterr().out
+
+    def test_jsonl_extension_accepted(self, sample_csv, monkeypatch, capsys):
+        """Test a .jsonl file matches the JSON Lines source type."""
+        jsonl = sample_csv.with_name("data.jsonl")
+        jsonl.write_text('{"email": "john@example.com"}\n')
+        monkeypatch.setattr(
+            wizard, "ask_select", lambda *a, **k: "JSON Lines file (.jsonl)"
+        )
+        monkeypatch.setattr(wizard, "ask_text", lambda *a, **k: str(jsonl))
+
+        assert wizard.step_select_source() == jsonl
+        assert "expected" not in capsys.readouterr().out
+
+
+class TestSelectOutput:
+    """Test cases for choosing the output file."""
+
+    def test_default_location(self, sample_csv, monkeypatch):
+        """Test accepting the default writes next to the input."""
+        monkeypatch.setattr(wizard, "ask_confirm", lambda *a, **k: True)
+
+        output = wizard.step_select_output(sample_csv)
+
+        assert output == sample_csv.with_name("test.anonymized.csv")
+
+    def test_custom_location(self, sample_csv, monkeypatch):
+        """Test declining the default asks for a path."""
+        monkeypatch.setattr(wizard, "ask_confirm", lambda *a, **k: False)
+        monkeypatch.setattr(wizard, "ask_text", lambda *a, **k: "out.csv")
+
+        assert wizard.step_select_output(sample_csv) == Path("out.csv")
+
+
+class TestSelectStrategy:
+    """Test cases for choosing the anonymization strategy."""
+
+    def test_label_maps_to_strategy(self, monkeypatch):
+        """Test the chosen menu label is translated to a strategy name."""
+        monkeypatch.setattr(
+            wizard, "ask_select", lambda *a, **k: "Hash (one-way, irreversible)"
+        )
+
+        assert wizard.step_select_strategy() == "hash"
+
+    def test_fallback_prompt_default(self, monkeypatch):
+        """Test the plain input() prompt defaults to replace."""
+        monkeypatch.setattr(wizard, "HAS_QUESTIONARY", False)
+        monkeypatch.setattr("builtins.input", lambda prompt="": "")
+
+        assert wizard.step_select_strategy() == "replace"
+
+
+class TestPreview:
+    """Test cases for the preview step."""
+
+    def test_preview_is_cached_per_columns(self, sample_csv, monkeypatch):
+        """Test previews are reused, and selected columns are passed through."""
+        calls = []
+
+        def fake_preview(path, num_rows, strategy, columns):
+            calls.append(columns)
+            return [{"name": "x", "email": "y"}]
+
+        monkeypatch.setattr(wizard, "preview", fake_preview)
+        monkeypatch.setattr(wizard, "ask_confirm", lambda *a, **k: True)
+
+        assert wizard.step_preview(sample_csv, ["email"], "mask")
+        assert wizard.step_preview(sample_csv, ["email"], "mask")
+        assert wizard.step_preview(sample_csv, ["name", "email"], "mask")
+
+        assert calls == [["email"], ["name", "email"]]
+
+
+class TestOutput:
+    """Test cases for wizard status output."""
+
+    def test_no_color_codes_when_piped(self):
+        """Test ANSI escapes are dropped when stdout is not a terminal."""
+        code = "from anonimize.cli import wizard; wizard.print_success('done')"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            encoding="utf-8",
+            env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+            check=True,
+        )
+
+        assert result.stdout == "✓ done\n"
+
+
+class TestExecute:
+    """Test cases for the execute step."""
+
+    def test_reports_output_size(self, sample_csv, monkeypatch, capsys):
+        """Test the output path and size are reported after a run."""
+        output = sample_csv.with_name("out.csv")
+
+        def fake_anonymize(path, output_path, **kwargs):
+            output_path.write_text("name\nx\n")
+            return str(output_path)
+
+        monkeypatch.setattr(wizard, "anonymize", fake_anonymize)
+
+        assert wizard.step_execute(sample_csv, [], "mask", output) == output
+        assert "Size:   7 bytes" in capsys.readouterr().out
+
+    def test_missing_output_still_succeeds(self, sample_csv, monkeypatch, capsys):
+        """Test an output that can't be stat'ed doesn't report a failure."""
+        output = sample_csv.with_name("never-written.csv")
+        monkeypatch.setattr(wizard, "anonymize", lambda *a, **k: str(output))
+
+        assert wizard.step_execute(sample_csv, [], "mask", output) == output
+        out = capsys.readouterr().out
+        assert "Size:" not in out
+        assert "failed" not in out